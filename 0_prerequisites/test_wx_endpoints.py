@@ -5,91 +5,273 @@ watsonx.ai Endpoint Connectivity Test
 This script tests basic network connectivity to watsonx.ai endpoints
 to ensure workshop participants can access the required services.
 No API keys required - just checks if endpoints are reachable.
+
+All endpoints are probed concurrently. Each probe sends N requests over one
+kept-alive connection and reports DNS, TCP connect, TLS handshake and
+time-to-first-byte (TTFB) separately, with p50/p95 per endpoint, so the
+script can also be used to compare regions (e.g. us-south vs eu-de).
+
+HTTPS_PROXY/NO_PROXY are honoured like in requests: behind a proxy the
+connection is tunnelled with CONNECT, and the connect phase then covers the
+proxy connection, the tunnel and the TLS handshake.
+
+Usage:
+    python test_wx_endpoints.py [--region us-south eu-de] [--count 5] [--fresh] [--json results.json]
 """
 
+import argparse
+import base64
+import http.client
+import json
+import socket
+import ssl
 import sys
-import requests
-
-def test_endpoint(url, description, timeout=10):
-    """Test if an endpoint is reachable (any response means it's accessible)"""
-    print(f"Testing {description}...")
-    print(f"  URL: {url}")
-    
-    try:
-        # Use GET request for better compatibility
-        response = requests.get(url, timeout=timeout, allow_redirects=True)
-        status_code = response.status_code
-        
-        # Any HTTP response means the endpoint is reachable
-        # 200: Success, 400: Bad request (reachable), 401/403: Auth required (reachable)
-        # 404: Not found (reachable), 405: Method not allowed (reachable)
-        if status_code in [200, 400, 401, 403, 404, 405]:
-            print(f"  ✅ REACHABLE - Status: {status_code}")
-            return True
+import time
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import unquote, urlsplit
+from urllib.request import getproxies, proxy_bypass
+
+IAM_ENDPOINT = ("https://iam.cloud.ibm.com/identity/token", "IBM Cloud IAM Token Endpoint")
+REGION_ENDPOINTS = [
+    ("/ml/v1/foundation_model_specs?version=2023-05-29", "watsonx.ai Foundation Models API"),
+    ("/ml/v1/text/generation?version=2023-05-29", "watsonx.ai Text Generation API"),
+    ("/ml/v1/deployments?version=2021-05-01", "watsonx.ai Deployments API"),
+]
+PHASES = ("dns", "connect", "tls", "ttfb", "total")
+
+# Any HTTP response means the endpoint is reachable
+# 200: Success, 3xx: Redirect (reachable), 400: Bad request (reachable),
+# 401/403: Auth required (reachable), 404: Not found (reachable), 405: Method not allowed (reachable)
+REACHABLE_STATUS = [200, 301, 302, 303, 307, 308, 400, 401, 403, 404, 405]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class EndpointProbe:
+    """
+    Sends repeated GET requests to one endpoint over a kept-alive connection.
+
+    The connection is set up by hand (getaddrinfo, connect, TLS handshake) so
+    every phase can be timed; requests then go through http.client on that
+    socket. Behind a proxy, http.client opens a CONNECT tunnel instead. With
+    fresh=True every request opens a new connection.
+    """
+
+    def __init__(self, url, description, timeout=10, fresh=False):
+        self.url = url
+        self.description = description
+        self.timeout = timeout
+        self.fresh = fresh
+        parts = urlsplit(url)
+        self.host = parts.hostname
+        self.port = parts.port or 443
+        self.path = parts.path + (f"?{parts.query}" if parts.query else "")
+        self.tls_context = ssl.create_default_context()
+        self.proxy = None if proxy_bypass(self.host) else getproxies().get("https")
+        self.conn = None
+
+    def _connect(self, sample):
+        if self.proxy:
+            self._connect_via_proxy(sample)
+            return
+        start = time.perf_counter()
+        addresses = socket.getaddrinfo(self.host, self.port, type=socket.SOCK_STREAM)
+        sample["dns"] = time.perf_counter() - start
+
+        # Try every address in turn like socket.create_connection, so a host
+        # with broken IPv6 is still reached over IPv4
+        error = None
+        for family, socktype, proto, _, address in addresses:
+            start = time.perf_counter()
+            sock = socket.socket(family, socktype, proto)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(address)
+            except OSError as e:
+                sock.close()
+                error = e
+                continue
+            sample["connect"] = time.perf_counter() - start
+            break
         else:
-            print(f"  ⚠️  UNEXPECTED - Status: {status_code}")
-            return False
-            
-    except requests.exceptions.Timeout:
-        print(f"  ❌ TIMEOUT - Request timed out after {timeout}s")
-        return False
-    except requests.exceptions.ConnectionError:
-        print(f"  ❌ CONNECTION ERROR - Cannot reach endpoint")
-        return False
-    except Exception as e:
-        print(f"  ❌ ERROR - {str(e)}")
-        return False
-
-def main():
+            raise error
+
+        try:
+            start = time.perf_counter()
+            sock = self.tls_context.wrap_socket(sock, server_hostname=self.host)
+            sample["tls"] = time.perf_counter() - start
+        except Exception:
+            sock.close()
+            raise
+
+        self.conn = http.client.HTTPSConnection(self.host, self.port, timeout=self.timeout)
+        self.conn.sock = sock
+        sample["address"] = address[0]
+
+    def _connect_via_proxy(self, sample):
+        proxy = urlsplit(self.proxy if "://" in self.proxy else f"http://{self.proxy}")
+        headers = {}
+        if proxy.username:
+            credentials = f"{unquote(proxy.username)}:{unquote(proxy.password or '')}"
+            headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode()).decode()
+        conn = http.client.HTTPSConnection(proxy.hostname, proxy.port or 80, timeout=self.timeout,
+                                           context=self.tls_context)
+        conn.set_tunnel(self.host, self.port, headers=headers)
+        start = time.perf_counter()
+        try:
+            conn.connect()
+        except Exception:
+            conn.close()
+            raise
+        sample["connect"] = time.perf_counter() - start
+        self.conn = conn
+        sample["address"] = f"via proxy {proxy.hostname}:{proxy.port or 80}"
+
+    def close(self):
+        if self.conn is not None:
+            self.conn.close()
+            self.conn = None
+
+    def request(self):
+        """Send one request and return its timings; raises on network errors."""
+        sample = {}
+        if self.conn is None or self.fresh:
+            self.close()
+            self._connect(sample)
+        start = time.perf_counter()
+        try:
+            self.conn.request("GET", self.path, headers={"Host": self.host, "Connection": "keep-alive"})
+            response = self.conn.getresponse()
+        except (http.client.RemoteDisconnected, BrokenPipeError, ConnectionResetError):
+            if sample:
+                raise
+            # The server closed the idle kept-alive connection; reconnect once
+            self.close()
+            self._connect(sample)
+            start = time.perf_counter()
+            self.conn.request("GET", self.path, headers={"Host": self.host, "Connection": "keep-alive"})
+            response = self.conn.getresponse()
+        sample["ttfb"] = time.perf_counter() - start
+        response.read()
+        sample["total"] = sum(sample.get(phase, 0.0) for phase in ("dns", "connect", "tls")) \
+            + time.perf_counter() - start
+        sample["status"] = response.status
+        if response.will_close:
+            self.close()
+        return sample
+
+    def run(self, count):
+        """Probe the endpoint `count` times and summarize the timings."""
+        samples, errors = [], []
+        try:
+            for _ in range(count):
+                try:
+                    samples.append(self.request())
+                except socket.timeout:
+                    errors.append(f"TIMEOUT - Request timed out after {self.timeout}s")
+                    self.close()
+                except (OSError, http.client.HTTPException) as e:
+                    errors.append(f"CONNECTION ERROR - {e}")
+                    self.close()
+        finally:
+            self.close()
+
+        statuses = sorted({sample["status"] for sample in samples})
+        result = {
+            "description": self.description,
+            "url": self.url,
+            "requests": count,
+            "errors": errors,
+            "statuses": statuses,
+            "address": samples[0]["address"] if samples else None,
+            "reachable": bool(samples) and all(status in REACHABLE_STATUS for status in statuses),
+        }
+        for phase in PHASES:
+            values = [sample[phase] for sample in samples if phase in sample]
+            result[phase] = {
+                "samples": len(values),
+                "p50_ms": _ms(percentile(values, 0.50)),
+                "p95_ms": _ms(percentile(values, 0.95)),
+            }
+        return result
+
+
+def _ms(seconds):
+    return None if seconds is None else round(seconds * 1000, 1)
+
+
+def build_endpoints(regions):
+    endpoints = [IAM_ENDPOINT]
+    for region in regions:
+        watsonx_url = f"https://{region}.ml.cloud.ibm.com"
+        endpoints.extend((watsonx_url + path, f"{description} ({region})") for path, description in REGION_ENDPOINTS)
+    return endpoints
+
+
+def print_result(result):
+    print(f"Testing {result['description']}...")
+    print(f"  URL: {result['url']}")
+    statuses = ", ".join(str(status) for status in result["statuses"])
+    if result["reachable"]:
+        print(f"  ✅ REACHABLE - Status: {statuses}")
+    elif result["statuses"]:
+        print(f"  ⚠️  UNEXPECTED - Status: {statuses}")
+    for error in sorted(set(result["errors"])):
+        print(f"  ❌ {error} ({result['errors'].count(error)}/{result['requests']})")
+    if result["statuses"]:
+        timings = "  ".join(
+            f"{phase} {result[phase]['p50_ms']}/{result[phase]['p95_ms']}"
+            for phase in PHASES if result[phase]["samples"]
+        )
+        print(f"  p50/p95 ms: {timings}")
+
+
+def main(argv=None):
     """Run all endpoint tests"""
+    parser = argparse.ArgumentParser(description="Test connectivity and latency to watsonx.ai endpoints.")
+    parser.add_argument("--region", nargs="+", default=["us-south"],
+                        help="watsonx.ai regions to probe, e.g. us-south eu-de jp-tok")
+    parser.add_argument("--count", type=int, default=5, help="Requests per endpoint")
+    parser.add_argument("--timeout", type=float, default=10, help="Timeout per network operation in seconds")
+    parser.add_argument("--fresh", action="store_true",
+                        help="Open a new connection for every request instead of reusing one")
+    parser.add_argument("--json", metavar="PATH", help="Write the results as JSON to this file")
+    args = parser.parse_args(argv)
+
     print("=" * 60)
     print("watsonx.ai Endpoint Connectivity Test")
     print("=" * 60)
     print()
     print("Testing basic connectivity to IBM Cloud and watsonx.ai...")
     print("(No API keys required - just checking if endpoints are reachable)")
+    print(f"({args.count} request(s) per endpoint, {'new' if args.fresh else 'one kept-alive'} connection"
+          f"{'s' if args.fresh else ''}, all endpoints in parallel)")
     print()
-    
-    # Test results
-    results = []
-    
-    # 1. Test IBM Cloud IAM endpoint
-    results.append(test_endpoint(
-        "https://iam.cloud.ibm.com/identity/token",
-        "IBM Cloud IAM Token Endpoint"
-    ))
-    print()
-    
-    # 2. Test watsonx.ai ML endpoint (default US South)
-    watsonx_url = "https://us-south.ml.cloud.ibm.com"
-    results.append(test_endpoint(
-        f"{watsonx_url}/ml/v1/foundation_model_specs?version=2023-05-29",
-        "watsonx.ai Foundation Models API"
-    ))
-    print()
-    
-    # 3. Test watsonx.ai text generation endpoint
-    results.append(test_endpoint(
-        f"{watsonx_url}/ml/v1/text/generation?version=2023-05-29",
-        "watsonx.ai Text Generation API"
-    ))
-    print()
-    
-    # 4. Test watsonx.ai deployments endpoint
-    results.append(test_endpoint(
-        f"{watsonx_url}/ml/v1/deployments?version=2021-05-01",
-        "watsonx.ai Deployments API"
-    ))
-    print()
-    
+
+    probes = [EndpointProbe(url, description, args.timeout, args.fresh)
+              for url, description in build_endpoints(args.region)]
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=len(probes)) as executor:
+        results = list(executor.map(lambda probe: probe.run(args.count), probes))
+    elapsed = time.perf_counter() - start
+
+    for result in results:
+        print_result(result)
+        print()
+
     # Summary
     print("=" * 60)
     print("SUMMARY")
     print("=" * 60)
-    
-    successful_tests = sum(results)
+
+    successful_tests = sum(result["reachable"] for result in results)
     total_tests = len(results)
-    
+
     if successful_tests == total_tests:
         print(f"🎉 ALL TESTS PASSED ({successful_tests}/{total_tests})")
         print("✅ Your network allows access to watsonx.ai endpoints")
@@ -101,7 +283,23 @@ def main():
     else:
         print(f"❌ ALL TESTS FAILED (0/{total_tests})")
         print("🚫 Your network may be blocking watsonx.ai endpoints")
-    
+    print(f"(completed in {elapsed:.1f}s)")
+
+    if len(args.region) > 1:
+        print()
+        print("Region comparison (median TTFB over all reachable endpoints):")
+        for region in args.region:
+            ttfbs = [result["ttfb"]["p50_ms"] for result in results
+                     if f"({region})" in result["description"] and result["ttfb"]["p50_ms"] is not None]
+            print(f"  {region:10} {percentile(ttfbs, 0.5) if ttfbs else 'unreachable'} ms")
+
+    if args.json:
+        report = {"regions": args.region, "count": args.count, "fresh": args.fresh,
+                  "elapsed_s": round(elapsed, 3), "endpoints": results}
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"Results written to {args.json}")
+
     print()
     print("Next steps:")
     if successful_tests < total_tests:
@@ -111,7 +309,7 @@ def main():
     else:
         print("- Proceed with the workshop setup")
         print("- Make sure to configure your .env file with API credentials")
-    
+
     return successful_tests == total_tests
 
 if __name__ == "__main__":
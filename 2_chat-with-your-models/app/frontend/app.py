@@ -1,15 +1,28 @@
 import streamlit as st
 import os
+import tempfile
+import time
 import uuid
-import requests
-from ibm_watsonx_ai.foundation_models import ModelInference
-from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
-from ibm_watsonx_ai import Credentials
 from dotenv import load_dotenv
+from token_provider import get_token_provider
+from generation_stream import TimedStream, generate_deployment_text, stream_deployment_text
+from deadline import METRICS as DEADLINE_METRICS, Deadline, DeadlineExceeded, call_with_deadline, \
+    iter_with_deadline, latency_tracker
+from model_registry import ModelClientRegistry, client_key
+from history_manager import ConversationHistory, HISTORY_POLICIES, token_budget
+from message_store import ChatRecord, MessageStore
+
+# The watsonx.ai SDK and the log analysis modules are imported where they are
+# first used, so RAG-only sessions never load them. Streamlit reruns the
+# script on every interaction; repeated imports are sys.modules lookups.
+# benchmarks/import_time.py measures the cold start and rerun times.
 
 # Import RAG service
 try:
     from rag_service import RAGService, RAGMessage, RAGDocument
+    from response_cache import ResponseCache, is_cached_log_id
+    from feedback_queue import FeedbackQueue
+    from health_monitor import HealthMonitor
     RAG_AVAILABLE = True
 except ImportError:
     RAG_AVAILABLE = False
@@ -86,37 +99,162 @@ st.markdown(f"""
 """, unsafe_allow_html=True)
 
 
+# Number of most recent messages rendered per rerun; older ones are behind a button
+CHAT_RENDER_WINDOW = int(os.getenv("CHAT_RENDER_WINDOW", "30"))
+
+# End-to-end time budget per question; every HTTP call gets the remaining time as timeout
+RAG_DEADLINE = float(os.getenv("RAG_DEADLINE_SECONDS", "60"))
+GENERATION_DEADLINE = float(os.getenv("GENERATION_DEADLINE_SECONDS", "120"))
+# Optionally send a duplicate non-streamed generation after the hedge quantile latency
+GENERATION_HEDGE = os.getenv("GENERATION_HEDGE", "False") == "True"
+GENERATION_HEDGE_QUANTILE = float(os.getenv("GENERATION_HEDGE_QUANTILE", "0.95"))
+
+
+def new_message_store() -> MessageStore:
+    """Bounded chat history; older messages are spilled to disk"""
+    return MessageStore(
+        max_in_memory=int(os.getenv("CHAT_HISTORY_MAX_IN_MEMORY", "200")),
+        spill_dir=os.getenv("CHAT_HISTORY_SPILL_DIR") or None
+    )
+
+
+def render_window(store: MessageStore) -> list:
+    """Messages to render this rerun, with a button to show earlier ones"""
+    window = st.session_state.get('render_window', CHAT_RENDER_WINDOW)
+    hidden = len(store) - window
+    if hidden > 0 and st.button(f"Show earlier messages ({hidden} hidden)", key="show_earlier_messages"):
+        st.session_state.render_window = window + CHAT_RENDER_WINDOW
+        st.rerun()
+    return store.recent(window)
+
+
+@st.cache_resource
+def get_rag_response_cache():
+    """Response cache shared by all sessions, or None when caching is disabled"""
+    if os.getenv('RAG_RESPONSE_CACHE', 'False') != 'True':
+        return None
+    
+    embed_fn = None
+    embedding_model = os.getenv('RAG_CACHE_EMBEDDING_MODEL', '')
+    api_key = os.getenv('WATSONX_API_KEY', '')
+    if embedding_model and api_key:
+        from ibm_watsonx_ai import APIClient, Credentials
+        from ibm_watsonx_ai.foundation_models import Embeddings
+        
+        token_provider = get_token_provider(api_key)
+        api_client = APIClient(
+            credentials=Credentials(
+                url=os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com"),
+                token=token_provider.get_token()
+            ),
+            project_id=os.getenv('WATSONX_PROJECT_ID', '')
+        )
+        embeddings = Embeddings(model_id=embedding_model, api_client=api_client)
+        
+        def embed_fn(text):
+            api_client.set_token(token_provider.get_token())
+            return embeddings.embed_query(text)
+    
+    return ResponseCache(
+        max_entries=int(os.getenv('RAG_CACHE_MAX_ENTRIES', '512')),
+        ttl=float(os.getenv('RAG_CACHE_TTL', '86400')),
+        similarity_threshold=float(os.getenv('RAG_CACHE_SIMILARITY', '0.92')),
+        embed_fn=embed_fn,
+        persist_path=os.getenv('RAG_CACHE_PATH') or None
+    )
+
+
+def rag_config() -> dict:
+    """RAG service configuration from environment"""
+    return {
+        'deployment_url': os.getenv('QNA_RAG_DEPLOYMENT_URL', ''),
+        'endpoints': os.getenv('QNA_RAG_ENDPOINTS', ''),
+        'balancing_policy': os.getenv('QNA_RAG_BALANCING_POLICY', 'ewma'),
+        'breaker_failures': int(os.getenv('QNA_RAG_BREAKER_FAILURES', '3')),
+        'breaker_cooldown': float(os.getenv('QNA_RAG_BREAKER_COOLDOWN', '30')),
+        'hedge': os.getenv('QNA_RAG_HEDGE', 'True') == 'True',
+        'hedge_quantile': float(os.getenv('QNA_RAG_HEDGE_QUANTILE', '0.95')),
+        'env_type': os.getenv('QNA_RAG_ENV_TYPE', 'saas'),
+        'iam_apikey': os.getenv('QNA_RAG_SAAS_IAM_APIKEY', ''),
+        'username': os.getenv('QNA_RAG_ONPREM_CPD_USERNAME', ''),
+        'cpd_apikey': os.getenv('QNA_RAG_ONPREM_CPD_APIKEY', ''),
+        'enable_expert': os.getenv('ENABLE_EXPERT_RECOMMENDATION', 'False') == 'True',
+        'is_expert_sample': os.getenv('IS_EXPERT_SAMPLE', 'False') == 'True',
+        'rating_options': int(os.getenv('FEEDBACK_RATING_OPTIONS', '5')),
+        'pool_maxsize': int(os.getenv('QNA_RAG_POOL_MAXSIZE', '10')),
+        'max_retries': int(os.getenv('QNA_RAG_MAX_RETRIES', '3')),
+        'connect_timeout': float(os.getenv('QNA_RAG_CONNECT_TIMEOUT', '5')),
+        'read_timeout': float(os.getenv('QNA_RAG_READ_TIMEOUT', '120'))
+    }
+
+
+@st.cache_resource
+def get_feedback_queue():
+    """Background feedback queue shared by all sessions, or None without a RAG deployment"""
+    config = rag_config()
+    if not RAG_AVAILABLE or not (config['deployment_url'] or config['endpoints']):
+        return None
+    
+    # Unsent feedback is journaled so it is submitted after a restart. The queue
+    # uses the shared service, so feedback reaches the replica that answered
+    return FeedbackQueue(
+        get_rag_service(),
+        journal_path=os.getenv('RAG_FEEDBACK_JOURNAL', '.rag_feedback_journal.jsonl') or None,
+        batch_size=int(os.getenv('RAG_FEEDBACK_BATCH_SIZE', '8')),
+        max_attempts=int(os.getenv('RAG_FEEDBACK_MAX_ATTEMPTS', '6'))
+    )
+
+
+@st.cache_resource
+def get_rag_service():
+    """RAG service shared by all sessions, or None without a RAG deployment"""
+    config = rag_config()
+    if not RAG_AVAILABLE or not (config['deployment_url'] or config['endpoints']):
+        return None
+    
+    # One service means one endpoint pool: replica load, latency and circuit
+    # breakers are tracked process-wide, and every log ID maps to the replica
+    # that answered it
+    service = RAGService(config, response_cache=get_rag_response_cache())
+    
+    # Pings run on a background thread through the same pool, so they also let
+    # ejected replicas rejoin it; sessions only read the cached status
+    service.attach_health_monitor(HealthMonitor(
+        service.ping,
+        interval=float(os.getenv('RAG_HEALTH_INTERVAL', '60')),
+        ttl=float(os.getenv('RAG_HEALTH_TTL', '180')),
+        latency_factor=float(os.getenv('RAG_HEALTH_LATENCY_FACTOR', '2.0')),
+        error_streak=int(os.getenv('RAG_HEALTH_ERROR_STREAK', '3'))
+    ))
+    return service
+
+
+def get_health_monitor():
+    """RAG endpoint health monitor shared by all sessions, or None without a RAG deployment"""
+    service = get_rag_service()
+    return service.health_monitor if service is not None else None
+
+
 def initialize_rag_service():
     """Initialize RAG service with configuration from environment"""
     if not RAG_AVAILABLE:
         return None
     
     try:
-        config = {
-            'deployment_url': os.getenv('QNA_RAG_DEPLOYMENT_URL', ''),
-            'env_type': os.getenv('QNA_RAG_ENV_TYPE', 'saas'),
-            'iam_apikey': os.getenv('QNA_RAG_SAAS_IAM_APIKEY', ''),
-            'username': os.getenv('QNA_RAG_ONPREM_CPD_USERNAME', ''),
-            'cpd_apikey': os.getenv('QNA_RAG_ONPREM_CPD_APIKEY', ''),
-            'enable_expert': os.getenv('ENABLE_EXPERT_RECOMMENDATION', 'False') == 'True',
-            'is_expert_sample': os.getenv('IS_EXPERT_SAMPLE', 'False') == 'True',
-            'rating_options': int(os.getenv('FEEDBACK_RATING_OPTIONS', '5'))
-        }
-        
-        if not config['deployment_url']:
-            return None
-            
-        return RAGService(config)
+        return get_rag_service()
     except Exception as e:
         st.error(f"Failed to initialize RAG service: {str(e)}")
         return None
 
 
-def display_rag_message(msg: RAGMessage):
+def display_rag_message(msg: ChatRecord):
     """Display a RAG message with documents and feedback options"""
     with st.chat_message(msg.role):
         st.markdown(msg.text)
         
+        if msg.role == 'assistant' and is_cached_log_id(msg.log_id):
+            st.caption("⚡ Answered from cache")
+        
         # Show source documents if toggled
         if msg.show_documents and msg.documents:
             st.markdown("### 📚 Source Documents")
@@ -139,7 +277,7 @@ def display_rag_message(msg: RAGMessage):
             render_feedback_buttons(msg)
 
 
-def render_feedback_buttons(msg: RAGMessage):
+def render_feedback_buttons(msg: ChatRecord):
     """Render feedback rating buttons"""
     st.markdown("**Rate this response:**")
     
@@ -185,44 +323,44 @@ def handle_feedback(msg_id: str, log_id: str, value: str):
 
 
 def submit_feedback(log_id: str, value: str, comment: str = None):
-    """Submit feedback to RAG service"""
-    if 'rag_service' not in st.session_state or not st.session_state.rag_service:
+    """Queue feedback for background submission and confirm it right away"""
+    feedback_queue = get_feedback_queue()
+    if feedback_queue is None or not st.session_state.get('rag_service'):
         st.error("RAG service not available")
         return
     
     try:
-        result = st.session_state.rag_service.send_feedback(log_id, value, comment)
+        # Sent, retried and journaled by the queue's worker thread
+        feedback_queue.submit(log_id, value, comment)
+        feedback_value = int(value)
         
-        if result['status'] == 'ok':
-            feedback_value = int(value)
+        if feedback_value < 100:
+            # Show expert recommendation button for negative feedback
+            response_text = "Thanks for your feedback! Feedback submitted successfully"
             
-            if feedback_value < 100:
-                # Show expert recommendation button for negative feedback
-                response_text = f"Thanks for your feedback! {result['message']}"
+            if st.session_state.rag_service.enable_expert:
+                # Fetch the recommendation now so the button answers instantly
+                feedback_queue.prefetch_expert(log_id)
+                response_text += "\n\nWould you like to see an expert recommendation for this question?"
                 
-                if st.session_state.rag_service.enable_expert:
-                    response_text += "\n\nWould you like to see an expert recommendation for this question?"
-                    
-                    new_msg = RAGMessage(
-                        id=str(uuid.uuid4()),
-                        role='assistant',
-                        text=response_text
-                    )
-                    st.session_state.rag_messages.append(new_msg)
-                    
-                    # Store log_id for expert recommendation
-                    st.session_state.expert_log_id = log_id
-                    st.session_state.show_expert_button = True
-            else:
-                # Positive feedback
                 new_msg = RAGMessage(
                     id=str(uuid.uuid4()),
                     role='assistant',
-                    text=f"Thanks for your positive feedback! {result['message']}\n\nFeel free to ask another question."
+                    text=response_text
                 )
                 st.session_state.rag_messages.append(new_msg)
+                
+                # Store log_id for expert recommendation
+                st.session_state.expert_log_id = log_id
+                st.session_state.show_expert_button = True
         else:
-            st.error(f"Feedback submission failed: {result.get('message', 'Unknown error')}")
+            # Positive feedback
+            new_msg = RAGMessage(
+                id=str(uuid.uuid4()),
+                role='assistant',
+                text="Thanks for your positive feedback! Feedback submitted successfully\n\nFeel free to ask another question."
+            )
+            st.session_state.rag_messages.append(new_msg)
     
     except Exception as e:
         st.error(f"Error submitting feedback: {str(e)}")
@@ -245,7 +383,12 @@ def get_expert_recommendation():
         return
     
     try:
-        result = st.session_state.rag_service.get_expert_recommendation(log_id)
+        # Usually prefetched when the negative feedback was given
+        feedback_queue = get_feedback_queue()
+        if feedback_queue is not None:
+            result = feedback_queue.expert_recommendation(log_id)
+        else:
+            result = st.session_state.rag_service.get_expert_recommendation(log_id)
         
         if result['status'] == 'ok':
             expert = result['expert']
@@ -285,6 +428,159 @@ def get_expert_recommendation():
     st.rerun()
 
 
+@st.cache_resource
+def get_model_registry() -> ModelClientRegistry:
+    """Model client registry shared by all Streamlit sessions"""
+    return ModelClientRegistry(
+        max_size=int(os.getenv("MODEL_CLIENT_CACHE_SIZE", "16")),
+        ttl=float(os.getenv("MODEL_CLIENT_CACHE_TTL", "1800"))
+    )
+
+
+def get_model_client(model_id: str, parameters: dict, api_key: str, project_id: str, watsonx_url: str):
+    """Return a cached ModelInference client that uses the shared IAM token"""
+    token = get_token_provider(api_key).get_token()
+    
+    def build_model_client():
+        from ibm_watsonx_ai import APIClient, Credentials
+        from ibm_watsonx_ai.foundation_models import ModelInference
+        
+        # setup wx credentials with the shared IAM token
+        credentials = Credentials(url=watsonx_url, token=token)
+        api_client = APIClient(credentials=credentials, project_id=project_id)
+        model = ModelInference(
+            model_id=model_id,
+            params=parameters,
+            api_client=api_client
+        )
+        return model, api_client
+    
+    (model, api_client), setup_time = get_model_registry().get(
+        client_key(model_id, parameters, project_id, watsonx_url, api_key),
+        build_model_client
+    )
+    if setup_time is None:
+        # cached client - hand it the current shared token
+        api_client.set_token(token)
+    
+    return model
+
+
+def run_log_analysis(uploaded_files, model_id: str, mode: str = "Map-reduce"):
+    """
+    Analyse uploaded log files and add the report to the chat
+    
+    In "Digest" mode the files are pre-processed locally into a compact
+    template digest that is analysed in a single request; in "Correlate"
+    mode the files are merged by timestamp and the model receives per-request
+    traces and cascading-failure chains; in "Map-reduce" mode they are
+    analysed chunk by chunk and the findings are combined.
+    """
+    from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
+    from log_analysis import LogAnalysisPipeline
+    from log_correlation import CORRELATION_PROMPT, CorrelationIndex
+    from log_preprocess import DIGEST_PROMPT, LogIndex
+    
+    api_key = os.getenv("WATSONX_API_KEY", "")
+    project_id = os.getenv("WATSONX_PROJECT_ID", "")
+    watsonx_url = os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com")
+    parameters = {
+        GenParams.MAX_NEW_TOKENS: 2000,
+        GenParams.TEMPERATURE: 0.2
+    }
+    model = get_model_client(model_id, parameters, api_key, project_id, watsonx_url)
+    
+    pipeline = LogAnalysisPipeline(
+        lambda text: model.generate_text(prompt=text),
+        max_workers=int(os.getenv("LOG_ANALYSIS_WORKERS", "4")),
+        max_chars=int(os.getenv("LOG_ANALYSIS_CHUNK_CHARS", "12000"))
+    )
+    
+    names = ', '.join(f.name for f in uploaded_files)
+    st.session_state.messages.append({"role": "user", "content": f"Analyse log files: {names}"})
+    with st.chat_message("user"):
+        st.markdown(f"Analyse log files: {names}")
+    
+    with st.chat_message("assistant"):
+        progress_bar = st.progress(0.0, text="Analysing log chunks...")
+        
+        def show_progress(done, total, result):
+            progress_bar.progress(
+                done / total,
+                text=f"Analysed chunk {done}/{total} ({result.chunk.source}, {result.latency:.1f}s)"
+            )
+        
+        try:
+            # Stream the uploads from disk instead of holding them in the prompt
+            with tempfile.TemporaryDirectory() as tmp_dir:
+                paths = []
+                for uploaded in uploaded_files:
+                    path = os.path.join(tmp_dir, os.path.basename(uploaded.name))
+                    with open(path, 'wb') as f:
+                        f.write(uploaded.getbuffer())
+                    paths.append(path)
+                
+                if mode == "Digest":
+                    progress_bar.progress(0.5, text="Pre-processing logs locally...")
+                    started = time.perf_counter()
+                    index = LogIndex()
+                    for path in paths:
+                        index.add_file(path)
+                    digest = index.digest()
+                    prep_time = time.perf_counter() - started
+                    report = model.generate_text(prompt=DIGEST_PROMPT.format(digest=digest))
+                    caption = (
+                        f"🗜️ {index.lines} lines → {len(index.templates)} templates · "
+                        f"{index.raw_chars / max(len(digest), 1):.1f}x smaller · "
+                        f"pre-processing {prep_time * 1000:.0f} ms · total {time.perf_counter() - started:.1f}s"
+                    )
+                elif mode == "Correlate":
+                    progress_bar.progress(0.5, text="Correlating requests across services...")
+                    started = time.perf_counter()
+                    correlation = CorrelationIndex().add_files(paths)
+                    traces = correlation.summary()
+                    prep_time = time.perf_counter() - started
+                    report = model.generate_text(prompt=CORRELATION_PROMPT.format(traces=traces))
+                    caption = (
+                        f"🔗 {correlation.records} records · {len(correlation.traces)} requests · "
+                        f"{len(correlation.cascades())} failure chains · "
+                        f"correlation {prep_time * 1000:.0f} ms · total {time.perf_counter() - started:.1f}s"
+                    )
+                else:
+                    analysis = pipeline.run(paths, progress=show_progress)
+                    stats = analysis.stats()
+                    report = analysis.report
+                    caption = (
+                        f"🧩 {stats['chunks']} chunks ({stats['failed_chunks']} failed) · "
+                        f"avg {stats['chunk_latency_avg']:.1f}s / max {stats['chunk_latency_max']:.1f}s per chunk · "
+                        f"reduce {stats['reduce_latency']:.1f}s · total {stats['total_time']:.1f}s"
+                    )
+            
+            progress_bar.empty()
+            st.markdown(report)
+            st.caption(caption)
+            st.session_state.messages.append({"role": "assistant", "content": f"{report}\n\n_{caption}_"})
+        except Exception as e:
+            error_msg = f"❌ Error: {str(e)}"
+            st.error(error_msg)
+            st.session_state.messages.append({"role": "assistant", "content": error_msg, "error": True})
+
+
+def format_stream_metrics(metrics: dict) -> str:
+    """Format per-message latency and prompt size metrics for display below a message"""
+    parts = []
+    if 'tokens' in metrics:
+        ttft = metrics.get('ttft')
+        ttft_text = f"{ttft:.2f}s" if ttft is not None else "n/a"
+        parts.append(
+            f"⏱️ First token {ttft_text} · {metrics.get('tokens', 0)} tokens "
+            f"in {metrics.get('total', 0):.2f}s · {metrics.get('tokens_per_sec', 0):.1f} tokens/s"
+        )
+    if metrics.get('prompt_tokens'):
+        parts.append(f"📨 {metrics['prompt_tokens']} prompt tokens")
+    return " · ".join(parts)
+
+
 # sidebar
 with st.sidebar:
     # Deutsche Telekom Logo Header
@@ -337,23 +633,54 @@ with st.sidebar:
         if 'rag_service' not in st.session_state or st.session_state.rag_service is None:
             with st.spinner("Initializing RAG service..."):
                 st.session_state.rag_service = initialize_rag_service()
-                
-                # Check connection only once during initialization
-                if st.session_state.rag_service:
-                    with st.spinner("Checking RAG connection..."):
-                        ok, status_code = st.session_state.rag_service.ping()
-                        st.session_state.rag_connection_ok = ok
-                        st.session_state.rag_connection_status = status_code
-                else:
-                    st.session_state.rag_connection_ok = False
-                    st.session_state.rag_connection_status = 0
         
-        # Display connection status from cached result
-        if st.session_state.rag_service:
-            if st.session_state.get('rag_connection_ok', False):
-                st.success(f"✓ RAG endpoint connected (v{st.session_state.rag_service.version})")
+        # Display the shared health status; only the first session after start-up waits for a check
+        health_monitor = get_health_monitor()
+        health = health_monitor.wait() if st.session_state.rag_service and health_monitor else None
+        if health:
+            latency = (
+                f" · p50 {health['latency_p50'] * 1000:.0f} ms / p95 {health['latency_p95'] * 1000:.0f} ms"
+                if health.get('latency_p50') is not None else ''
+            )
+            if health['state'] == 'down':
+                st.error(f"✗ RAG connection failed (status: {health['status_code']})")
+                st.caption(health['reason'])
             else:
-                st.error(f"✗ RAG connection failed (status: {st.session_state.get('rag_connection_status', 0)})")
+                if health['state'] == 'healthy':
+                    st.success(f"✓ RAG endpoint connected (v{st.session_state.rag_service.version})")
+                elif health['state'] == 'degraded':
+                    st.warning(f"⚠️ RAG endpoint degraded: {health['reason']}")
+                else:
+                    st.info("RAG endpoint status not checked yet")
+                if health['samples']:
+                    st.caption(
+                        f"Health: {health['success_rate']:.0%} of last {health['samples']} checks ok{latency} · "
+                        f"checked {health['age']:.0f}s ago"
+                    )
+                
+                stats = st.session_state.rag_service.pool_stats()
+                st.caption(
+                    f"Connection pool: {stats['connections_opened']} connections / "
+                    f"{stats['http_requests']} requests (reuse {stats['reuse_rate']:.0%})"
+                )
+                
+                endpoint_stats = st.session_state.rag_service.endpoint_stats()
+                if len(endpoint_stats['endpoints']) > 1:
+                    st.caption(
+                        f"Replicas: {len(endpoint_stats['endpoints']) - endpoint_stats['ejected']}/"
+                        f"{len(endpoint_stats['endpoints'])} active · {endpoint_stats['hedges']} hedged "
+                        f"({endpoint_stats['hedge_wins']} won)"
+                    )
+                
+                feedback_queue = get_feedback_queue()
+                if feedback_queue is not None:
+                    queue_stats = feedback_queue.stats()
+                    st.caption(
+                        f"Feedback: {queue_stats['sent']} sent · {queue_stats['pending']} pending · "
+                        f"{queue_stats['retries']} retries"
+                    )
+                    if queue_stats['failed']:
+                        st.warning(f"{queue_stats['failed']} feedback submission(s) failed after retries")
         else:
             st.error("✗ RAG service initialization failed")
             st.info("Check your RAG configuration in .env file")
@@ -437,18 +764,74 @@ with st.sidebar:
             )
             
             model_id = model_options[selected_model_name]
+        
+        compact_logs = False
+        if selected_template == "Log Analysis Assistant":
+            compact_logs = st.toggle(
+                "Compact pasted logs",
+                value=True,
+                help="Replace long runs of pasted log lines with a template digest before sending"
+            )
+            
+            if not current_deployment_id:
+                uploaded_logs = st.file_uploader(
+                    "Large log files",
+                    accept_multiple_files=True,
+                    help="Analyse log files that are too large to paste"
+                )
+                log_analysis_mode = st.radio(
+                    "Log analysis mode",
+                    options=["Digest", "Correlate", "Map-reduce"],
+                    horizontal=True,
+                    help="Digest: group repeated lines into templates locally and send one compact prompt. "
+                         "Correlate: merge several service logs by timestamp and send per-request traces "
+                         "and cascading-failure chains. "
+                         "Map-reduce: analyse the raw logs chunk by chunk."
+                )
+                if uploaded_logs and st.button("Analyse log files"):
+                    st.session_state.pending_log_analysis = True
+        
+        history_policy = st.selectbox(
+            "History policy",
+            options=list(HISTORY_POLICIES.keys()),
+            help="How older turns are handled when the conversation exceeds the model's token budget"
+        )
+        
+        stream_responses = st.toggle(
+            "Stream responses",
+            value=os.getenv("STREAM_RESPONSES", "True") == "True",
+            help="Show tokens as they are generated and report time-to-first-token"
+        )
+        
+        registry_stats = get_model_registry().stats()
+        if registry_stats['hits'] or registry_stats['misses']:
+            st.caption(
+                f"Model clients: {registry_stats['hits']} reused / {registry_stats['misses']} created · "
+                f"~{registry_stats['saved_per_request'] * 1000:.0f} ms setup saved per request"
+            )
     else:
         # RAG mode - no template/model selection needed
         st.info("📚 RAG Mode Active\n\nQuestions will be answered using your document knowledge base.")
     
+    deadline_stats = DEADLINE_METRICS.snapshot().get('rag' if use_rag else 'generation')
+    if deadline_stats:
+        st.caption(
+            f"Deadline: {deadline_stats['misses']}/{deadline_stats['requests']} missed "
+            f"({deadline_stats['miss_rate']:.0%}) · p99 {deadline_stats['p99']:.1f}s"
+            + (f" · {deadline_stats['hedges']} hedged ({deadline_stats['hedge_wins']} won)"
+               if deadline_stats['hedges'] else '')
+        )
+    
     if st.button("Clear Chat"):
         if use_rag:
-            st.session_state.rag_messages = []
+            st.session_state.rag_messages.clear()
             st.session_state.awaiting_feedback_comment = {}
             st.session_state.pending_feedback = {}
             st.session_state.show_expert_button = False
         else:
-            st.session_state.messages = []
+            st.session_state.messages.clear()
+            st.session_state.history = None
+        st.session_state.render_window = CHAT_RENDER_WINDOW
         st.rerun()
 
 # main Title
@@ -468,10 +851,10 @@ else:
 
 # Initialize session states
 if "messages" not in st.session_state:
-    st.session_state.messages = []
+    st.session_state.messages = new_message_store()
 
 if "rag_messages" not in st.session_state:
-    st.session_state.rag_messages = []
+    st.session_state.rag_messages = new_message_store()
 
 if "current_template" not in st.session_state:
     st.session_state.current_template = None
@@ -491,12 +874,6 @@ if "show_expert_button" not in st.session_state:
 if "expert_log_id" not in st.session_state:
     st.session_state.expert_log_id = ''
 
-if "rag_connection_ok" not in st.session_state:
-    st.session_state.rag_connection_ok = False
-
-if "rag_connection_status" not in st.session_state:
-    st.session_state.rag_connection_status = 0
-
 # Handle mode switching
 current_mode = "rag" if use_rag else "normal"
 if st.session_state.current_mode != current_mode:
@@ -509,14 +886,13 @@ if st.session_state.current_mode != current_mode:
     # If switching away from RAG, clear the service (will reinitialize if switched back)
     if not use_rag and 'rag_service' in st.session_state:
         st.session_state.rag_service = None
-        st.session_state.rag_connection_ok = False
-        st.session_state.rag_connection_status = 0
 
 # Check if template changed in normal mode
 if not use_rag:
     if st.session_state.current_template != selected_template:
         st.session_state.current_template = selected_template
-        st.session_state.messages = []
+        st.session_state.messages.clear()
+        st.session_state.render_window = CHAT_RENDER_WINDOW
         if initial_greeting:
             st.session_state.messages.append({"role": "assistant", "content": initial_greeting})
 
@@ -531,8 +907,8 @@ if use_rag and not st.session_state.rag_messages:
 
 # Display messages based on mode
 if use_rag:
-    # Display RAG messages
-    for msg in st.session_state.rag_messages:
+    # Display the most recent RAG messages
+    for msg in render_window(st.session_state.rag_messages):
         display_rag_message(msg)
     
     # Show expert recommendation button if needed
@@ -540,10 +916,16 @@ if use_rag:
         if st.button("🎓 Get Expert Recommendation", key="expert_rec_button"):
             get_expert_recommendation()
 else:
-    # Display normal messages
-    for message in st.session_state.messages:
+    # Display the most recent normal messages
+    for message in render_window(st.session_state.messages):
         with st.chat_message(message["role"]):
             st.markdown(message["content"])
+            if message.get("metrics"):
+                st.caption(format_stream_metrics(message["metrics"]))
+
+# Run a chunked log analysis requested from the sidebar
+if not use_rag and st.session_state.pop('pending_log_analysis', False):
+    run_log_analysis(uploaded_logs, model_id, log_analysis_mode)
 
 # Handle chat input
 if prompt := st.chat_input("Type your message here..."):
@@ -573,7 +955,13 @@ if prompt := st.chat_input("Type your message here..."):
             with st.chat_message("assistant"):
                 with st.spinner("Searching knowledge base..."):
                     try:
-                        text, documents, log_id = st.session_state.rag_service.get_response(prompt)
+                        # Retries and failover run on a worker thread, so the
+                        # answer is awaited no longer than the deadline
+                        rag_service = st.session_state.rag_service
+                        with Deadline(RAG_DEADLINE, 'rag') as deadline:
+                            text, documents, log_id = call_with_deadline(
+                                lambda: rag_service.get_response(prompt), deadline
+                            )
                         
                         # Convert documents to RAGDocument objects
                         rag_docs = [
@@ -616,19 +1004,25 @@ if prompt := st.chat_input("Type your message here..."):
             st.error("❌ Please configure WATSONX_PROJECT_ID and WATSONX_API_KEY in your .env file")
         else:
             # add user message
-            st.session_state.messages.append({"role": "user", "content": prompt})
+            user_message = {"role": "user", "content": prompt}
+            model_prompt = prompt
+            if compact_logs:
+                from log_preprocess import compact_pasted_logs
+                
+                # Send a template digest instead of thousands of repeated log lines
+                model_prompt = compact_pasted_logs(prompt)
+                if model_prompt != prompt:
+                    user_message["model_content"] = model_prompt
+            st.session_state.messages.append(user_message)
             with st.chat_message("user"):
                 st.markdown(prompt)
             
             # generate response
             with st.chat_message("assistant"):
                 with st.spinner("Thinking..."):
+                    deadline = Deadline(GENERATION_DEADLINE, 'generation')
                     try:
-                        # setup wx credentials
-                        credentials = Credentials(
-                            url=os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com"),
-                            api_key=api_key
-                        )
+                        watsonx_url = os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com")
                         
                         # Check if current template has a deployment
                         template_deployments = {
@@ -639,52 +1033,40 @@ if prompt := st.chat_input("Type your message here..."):
                         
                         current_template = st.session_state.get('current_template', '')
                         deployment_id = template_deployments.get(current_template, "")
+                        stream = None
+                        prompt_tokens = 0
                         
                         if deployment_id:
                             # Deployment mode - use deployed prompt template via direct API call
                             # The deployed template only expects 'input' variable
                             prompt_variables = {
-                                "input": prompt
+                                "input": model_prompt
                             }
                             
-                            # Get IAM token
-                            token_response = requests.post(
-                                'https://iam.cloud.ibm.com/identity/token',
-                                headers={'Content-Type': 'application/x-www-form-urlencoded'},
-                                data={
-                                    'grant_type': 'urn:ibm:params:oauth:grant-type:apikey',
-                                    'apikey': api_key
-                                }
-                            )
-                            
-                            if token_response.status_code != 200:
-                                raise Exception(f"Failed to get IAM token: {token_response.text}")
-                            
-                            iam_token = token_response.json()['access_token']
-                            
-                            # Call the v1 text generation endpoint directly
-                            deployment_url = f"{credentials.url}/ml/v1/deployments/{deployment_id}/text/generation?version=2021-05-01"
-                            
-                            generation_response = requests.post(
-                                deployment_url,
-                                headers={
-                                    'Content-Type': 'application/json',
-                                    'Accept': 'application/json',
-                                    'Authorization': f'Bearer {iam_token}'
-                                },
-                                json={
-                                    "parameters": {
-                                        "prompt_variables": prompt_variables
-                                    }
-                                }
-                            )
-                            
-                            if generation_response.status_code != 200:
-                                raise Exception(f"Deployment request failed: {generation_response.text}")
+                            # Get IAM token from the process-wide cache
+                            iam_token = get_token_provider(api_key).get_token()
                             
-                            response = generation_response.json()['results'][0]['generated_text']
+                            if stream_responses:
+                                # Stream from the generation_stream endpoint; a stalled stream ends at the deadline
+                                stream = TimedStream(iter_with_deadline(stream_deployment_text(
+                                    watsonx_url, deployment_id, iam_token, prompt_variables,
+                                    timeout=deadline.timeout((5, 300))
+                                ), deadline))
+                            else:
+                                # Call the v1 text generation endpoint directly
+                                response = call_with_deadline(
+                                    lambda: generate_deployment_text(
+                                        watsonx_url, deployment_id, iam_token, prompt_variables,
+                                        timeout=deadline.timeout((5, 300))
+                                    ),
+                                    deadline,
+                                    tracker=latency_tracker(f"deployment:{deployment_id}", GENERATION_HEDGE_QUANTILE),
+                                    hedge=GENERATION_HEDGE
+                                )
                         else:
                             # Direct model inference mode
+                            from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
+                            
                             # model parameters with stop sequences to prevent continuing conversation
                             parameters = {
                                 GenParams.MAX_NEW_TOKENS: 4000,
@@ -694,43 +1076,64 @@ if prompt := st.chat_input("Type your message here..."):
                                 GenParams.STOP_SEQUENCES: ["<|user|>", "<|system|>", "\n\nUser:", "\nUser:", "\n\nHuman:", "\nHuman:"]
                             }
                             
-                            # Build conversation with proper structure to prevent model from continuing user's message
-                            conversation_parts = []
-                            
-                            # Add system instruction if template is selected
-                            if 'prompt_prefix' in locals() and prompt_prefix:
-                                conversation_parts.append(f"<|system|>\n{prompt_prefix.strip()}")
-                            
-                            # Add conversation history with clear role separation
-                            for msg in st.session_state.messages[:-1]:  # Exclude current message
-                                if msg['role'] == 'user':
-                                    conversation_parts.append(f"<|user|>\n{msg['content']}")
-                                else:
-                                    conversation_parts.append(f"<|assistant|>\n{msg['content']}")
-                            
-                            # Add current user message and prompt for assistant response
-                            conversation_parts.append(f"<|user|>\n{prompt}")
-                            conversation_parts.append("<|assistant|>")
+                            # Build conversation with proper structure to prevent model from continuing user's message.
+                            # The history keeps a running prompt and only appends turns added since the last message.
+                            system_prompt = prompt_prefix if 'prompt_prefix' in locals() and prompt_prefix else ''
+                            history_model = model_id if 'model_id' in locals() and model_id else 'ibm/granite-3-3-8b-instruct'
+                            history_key = (current_template, system_prompt, history_model, history_policy)
+                            if st.session_state.get('history_key') != history_key or not st.session_state.get('history'):
+                                st.session_state.history_key = history_key
+                                st.session_state.history = ConversationHistory(
+                                    system_prompt=system_prompt,
+                                    budget=token_budget(
+                                        history_model,
+                                        parameters[GenParams.MAX_NEW_TOKENS],
+                                        int(os.getenv("HISTORY_TOKEN_LIMIT", "0")) or None
+                                    ),
+                                    policy=HISTORY_POLICIES[history_policy]()
+                                )
                             
-                            # Build the full prompt with clear structure
-                            full_prompt = "\n\n".join(conversation_parts)
+                            history = st.session_state.history
+                            history.sync(st.session_state.messages, len(st.session_state.messages) - 1)  # Exclude current message
+                            full_prompt, prompt_tokens = history.build_prompt(model_prompt)
                             
-                            # initialize model
-                            model = ModelInference(
-                                model_id=model_id if 'model_id' in locals() else 'ibm/granite-3-3-8b-instruct',
-                                params=parameters,
-                                credentials=credentials,
-                                project_id=project_id
-                            )
+                            # reuse a cached model client, only build one on first use
+                            model_id = model_id if 'model_id' in locals() else 'ibm/granite-3-3-8b-instruct'
+                            model = get_model_client(model_id, parameters, api_key, project_id, watsonx_url)
                             
-                            # generate response
-                            response = model.generate_text(prompt=full_prompt)
+                            # generate response; the SDK calls take no timeout, so they are bounded by the deadline here
+                            if stream_responses:
+                                stream = TimedStream(iter_with_deadline(
+                                    model.generate_text_stream(prompt=full_prompt), deadline
+                                ))
+                            else:
+                                response = call_with_deadline(
+                                    lambda: model.generate_text(prompt=full_prompt),
+                                    deadline,
+                                    tracker=latency_tracker(f"model:{model_id}", GENERATION_HEDGE_QUANTILE),
+                                    hedge=GENERATION_HEDGE
+                                )
+                        
+                        if stream is not None:
+                            # render tokens incrementally into the chat bubble
+                            response = st.write_stream(stream)
+                            metrics = stream.metrics()
+                        else:
+                            st.markdown(response)
+                            metrics = {}
                         
-                        st.markdown(response)
-                        st.session_state.messages.append({"role": "assistant", "content": response})
+                        if prompt_tokens:
+                            metrics['prompt_tokens'] = prompt_tokens
+                        if metrics:
+                            st.caption(format_stream_metrics(metrics))
+                        st.session_state.messages.append(
+                            {"role": "assistant", "content": response, "metrics": metrics}
+                        )
+                        deadline.finish()
                         
                     except Exception as e:
+                        deadline.finish(missed=isinstance(e, DeadlineExceeded))
                         error_msg = f"❌ Error: {str(e)}"
                         st.error(error_msg)
-                        st.session_state.messages.append({"role": "assistant", "content": error_msg})
+                        st.session_state.messages.append({"role": "assistant", "content": error_msg, "error": True})
 
@@ -0,0 +1,324 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Deadline Module
+End-to-end deadlines, hedged calls and deadline-miss metrics for generation requests
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Dict, Iterable, Iterator, Optional, Tuple
+
+
+class DeadlineExceeded(TimeoutError):
+    """Raised when a request cannot finish before its deadline"""
+
+
+def _quantile(ordered: list, q: float) -> Optional[float]:
+    if not ordered:
+        return None
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+class DeadlineMetrics:
+    """Thread-safe per-operation counters of deadline misses, hedges and latency"""
+
+    def __init__(self, window: int = 1000):
+        self.window = window
+        self._lock = threading.Lock()
+        self._operations: Dict[str, dict] = {}
+
+    def _operation(self, operation: str) -> dict:
+        if operation not in self._operations:
+            self._operations[operation] = {
+                'requests': 0, 'misses': 0, 'hedges': 0, 'hedge_wins': 0,
+                'latencies': deque(maxlen=self.window)
+            }
+        return self._operations[operation]
+
+    def record(self, operation: str, latency: float, missed: bool):
+        with self._lock:
+            stats = self._operation(operation)
+            stats['requests'] += 1
+            stats['misses'] += int(missed)
+            stats['latencies'].append(latency)
+
+    def record_hedge(self, operation: str, won: bool):
+        with self._lock:
+            stats = self._operation(operation)
+            stats['hedges'] += 1
+            stats['hedge_wins'] += int(won)
+
+    def snapshot(self) -> dict:
+        """
+        Metrics per operation
+
+        Returns:
+            Dictionary of operation -> requests, misses, miss_rate, hedges,
+            hedge_wins and p50/p95/p99 latency in seconds
+        """
+        with self._lock:
+            result = {}
+            for operation, stats in self._operations.items():
+                ordered = sorted(stats['latencies'])
+                result[operation] = {
+                    'requests': stats['requests'],
+                    'misses': stats['misses'],
+                    'miss_rate': stats['misses'] / stats['requests'] if stats['requests'] else 0.0,
+                    'hedges': stats['hedges'],
+                    'hedge_wins': stats['hedge_wins'],
+                    'p50': _quantile(ordered, 0.50),
+                    'p95': _quantile(ordered, 0.95),
+                    'p99': _quantile(ordered, 0.99)
+                }
+            return result
+
+
+# Process-wide metrics shown in the sidebar
+METRICS = DeadlineMetrics()
+
+_current_deadline: "contextvars.ContextVar[Optional[Deadline]]" = contextvars.ContextVar('deadline', default=None)
+
+
+def current_deadline() -> Optional["Deadline"]:
+    """Deadline of the request being handled in this context, if any"""
+    return _current_deadline.get()
+
+
+class Deadline:
+    """
+    End-to-end time budget of one user request
+
+    Used as a context manager, the deadline becomes current_deadline() for
+    the code inside, so HTTP calls further down (e.g. RAGService) derive
+    their timeouts from the remaining time. finish() records the request in
+    the metrics; leaving the context does so automatically.
+    """
+
+    def __init__(self, seconds: float, operation: str = 'request', metrics: DeadlineMetrics = METRICS):
+        """
+        Initialize deadline
+
+        Args:
+            seconds: Time budget from now
+            operation: Name under which the request is counted in the metrics
+            metrics: Metrics that record latency and misses
+        """
+        self.budget = seconds
+        self.operation = operation
+        self.metrics = metrics
+        self.started = time.monotonic()
+        self.expires_at = self.started + seconds
+        self._token = None
+        self._finished = False
+
+    def remaining(self) -> float:
+        return max(self.expires_at - time.monotonic(), 0.0)
+
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def exceeded(self) -> DeadlineExceeded:
+        """Exception describing a miss of this deadline"""
+        return DeadlineExceeded(f"{self.operation} exceeded its {self.budget:g}s deadline")
+
+    def check(self):
+        """Raise DeadlineExceeded if no time is left"""
+        if self.expired():
+            raise self.exceeded()
+
+    def timeout(self, default: Tuple[float, float] = (5, 120)) -> Tuple[float, float]:
+        """
+        (connect, read) timeout for an HTTP call, capped by the remaining time
+
+        Raises:
+            DeadlineExceeded: If the deadline has already passed
+        """
+        self.check()
+        remaining = self.remaining()
+        return min(default[0], remaining), min(default[1], remaining)
+
+    def finish(self, missed: bool = False):
+        """Record the request once; it counts as missed if it failed on or ran past its deadline"""
+        if self._finished:
+            return
+        self._finished = True
+        self.metrics.record(self.operation, time.monotonic() - self.started, missed or self.expired())
+
+    def __enter__(self) -> "Deadline":
+        self._token = _current_deadline.set(self)
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        _current_deadline.reset(self._token)
+        self.finish(missed=isinstance(exc, DeadlineExceeded))
+        return False
+
+
+class LatencyTracker:
+    """Recent latencies of one target, used to derive the hedge delay"""
+
+    def __init__(self, quantile: float = 0.95, window: int = 200, min_samples: int = 20):
+        self.quantile = quantile
+        self.min_samples = min_samples
+        self._latencies = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    def record(self, latency: float):
+        with self._lock:
+            self._latencies.append(latency)
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency quantile after which a duplicate is sent, or None without enough samples"""
+        with self._lock:
+            if len(self._latencies) < self.min_samples:
+                return None
+            return _quantile(sorted(self._latencies), self.quantile)
+
+
+_trackers: Dict[str, LatencyTracker] = {}
+_trackers_lock = threading.Lock()
+
+
+def latency_tracker(key: str, quantile: float = 0.95) -> LatencyTracker:
+    """Shared LatencyTracker of a target, e.g. a model or deployment ID"""
+    with _trackers_lock:
+        if key not in _trackers:
+            _trackers[key] = LatencyTracker(quantile)
+        return _trackers[key]
+
+
+_executor = ThreadPoolExecutor(max_workers=32, thread_name_prefix='deadline')
+
+
+def call_with_deadline(fn: Callable[[], object], deadline: Deadline,
+                       tracker: Optional[LatencyTracker] = None, hedge: bool = False):
+    """
+    Run a blocking call on a worker thread, bounded by a deadline
+
+    With hedge=True and enough latency samples in the tracker, a duplicate
+    call is started once the first has taken longer than the tracker's
+    quantile; the first successful result wins. The other attempt is
+    cancelled if it has not started yet; a running one cannot be interrupted,
+    so it ends at its own (deadline-capped) timeout and its result is
+    discarded.
+
+    Args:
+        fn: Blocking call, e.g. an HTTP request with deadline.timeout() as timeout
+        deadline: Deadline of the request
+        tracker: Optional LatencyTracker that receives the winning latency
+        hedge: Allow a duplicate call
+
+    Returns:
+        Result of the first successful attempt
+
+    Raises:
+        DeadlineExceeded: If no attempt finished before the deadline
+    """
+    deadline.check()
+    started = time.monotonic()
+    attempts = []
+
+    def start_attempt():
+        future = _executor.submit(contextvars.copy_context().run, fn)
+        attempts.append(future)
+        return future
+
+    first = start_attempt()
+    pending = {first}
+    hedge_after = tracker.hedge_delay() if tracker is not None and hedge else None
+    if hedge_after is not None and hedge_after < deadline.remaining():
+        done, pending = wait(pending, timeout=hedge_after)
+        if not done:
+            pending.add(start_attempt())
+    else:
+        done = set()
+
+    error = None
+    try:
+        while True:
+            for future in done:
+                try:
+                    result = future.result()
+                except Exception as e:
+                    error = e
+                    continue
+                if tracker is not None:
+                    tracker.record(time.monotonic() - started)
+                if len(attempts) > 1:
+                    deadline.metrics.record_hedge(deadline.operation, won=future is not first)
+                return result
+            if not pending:
+                raise error
+            done, pending = wait(pending, timeout=deadline.remaining(), return_when=FIRST_COMPLETED)
+            if not done:
+                raise deadline.exceeded()
+    finally:
+        for future in attempts:
+            future.cancel()
+
+
+class _Failure:
+    def __init__(self, error: Exception):
+        self.error = error
+
+
+_END = object()
+
+
+def iter_with_deadline(chunks: Iterable, deadline: Deadline) -> Iterator:
+    """
+    Yield the items of a blocking iterator until the deadline passes
+
+    A worker thread pulls the items, so a stalled stream cannot block the
+    caller beyond the deadline. The worker stops and closes the source
+    when the consumer stops early.
+
+    Raises:
+        DeadlineExceeded: If the next item does not arrive before the deadline
+    """
+    items = queue.Queue(maxsize=256)
+    stop = threading.Event()
+
+    def produce():
+        source = iter(chunks)
+        try:
+            for item in source:
+                if stop.is_set():
+                    break
+                items.put(item)
+        except Exception as e:
+            items.put(_Failure(e))
+        finally:
+            close = getattr(source, 'close', None)
+            if close is not None:
+                close()
+            items.put(_END)
+
+    threading.Thread(target=produce, name='deadline-stream', daemon=True).start()
+    try:
+        while True:
+            try:
+                item = items.get(timeout=deadline.remaining())
+            except queue.Empty:
+                raise deadline.exceeded()
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            yield item
+    finally:
+        stop.set()
+        # Unblock the producer if the queue is full
+        while not items.empty():
+            try:
+                items.get_nowait()
+            except queue.Empty:
+                break
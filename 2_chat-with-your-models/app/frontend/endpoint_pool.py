@@ -0,0 +1,237 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Endpoint Pool Module
+Load balancing, circuit breaking and hedge delays across RAG deployment replicas
+"""
+
+import threading
+import time
+from collections import deque
+from typing import Iterable, List, Optional, Union
+
+
+def rag_version(url: str) -> str:
+    """RAG version of a deployment URL ('2.0' for AI service deployments)"""
+    return "2.0" if "/ai_service?" in url else "1.x"
+
+
+class RAGEndpoint:
+    """One deployment replica with its load, latency and circuit breaker state"""
+
+    def __init__(self, url: str, weight: float = 1.0):
+        self.url = url
+        self.weight = max(float(weight), 0.01)
+        self.version = rag_version(url)
+        self.outstanding = 0
+        self.ewma_latency = None
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.opened_at = None  # circuit breaker opened; None while closed
+        self.trial_in_flight = False
+
+    def to_dict(self) -> dict:
+        return {
+            'url': self.url,
+            'weight': self.weight,
+            'version': self.version,
+            'outstanding': self.outstanding,
+            'ewma_latency': self.ewma_latency,
+            'requests': self.requests,
+            'failures': self.failures,
+            'state': 'open' if self.opened_at is not None else 'closed'
+        }
+
+
+class LeastOutstandingPolicy:
+    """Pick the replica with the fewest requests in flight per unit of weight"""
+
+    def score(self, endpoint: RAGEndpoint) -> float:
+        return (endpoint.outstanding + 1) / endpoint.weight
+
+
+class EWMALatencyPolicy:
+    """
+    Pick the replica with the lowest expected latency
+
+    The exponentially weighted moving average latency is scaled by the
+    requests in flight, so a fast replica is not flooded. Replicas without
+    samples are tried first.
+    """
+
+    def score(self, endpoint: RAGEndpoint) -> float:
+        if endpoint.ewma_latency is None:
+            return 0.0
+        return endpoint.ewma_latency * (endpoint.outstanding + 1) / endpoint.weight
+
+
+BALANCING_POLICIES = {
+    'least_outstanding': LeastOutstandingPolicy,
+    'ewma': EWMALatencyPolicy
+}
+
+
+def parse_endpoints(value: Union[str, Iterable]) -> List[RAGEndpoint]:
+    """
+    Build endpoints from a list of URLs, (url, weight) pairs or dicts, or a string
+
+    The string form is a comma-separated list of URLs with an optional
+    weight after a '|', e.g. "https://a/...|2,https://b/...".
+    """
+    if isinstance(value, str):
+        value = [item.strip() for item in value.split(',') if item.strip()]
+    endpoints = []
+    for item in value or []:
+        if isinstance(item, RAGEndpoint):
+            endpoints.append(item)
+        elif isinstance(item, dict):
+            endpoints.append(RAGEndpoint(item['url'], item.get('weight', 1.0)))
+        elif isinstance(item, (tuple, list)):
+            endpoints.append(RAGEndpoint(*item))
+        else:
+            url, _, weight = item.partition('|')
+            endpoints.append(RAGEndpoint(url.strip(), float(weight) if weight.strip() else 1.0))
+    return endpoints
+
+
+class EndpointPool:
+    """
+    Thread-safe set of deployment replicas
+
+    choose() returns the best available replica by the balancing policy.
+    A replica whose last `failure_threshold` requests failed is ejected for
+    `cooldown` seconds; afterwards a single trial request decides whether it
+    rejoins (half-open circuit breaker). hedge_delay() is the pool-wide
+    latency quantile after which a second request is worth sending.
+    """
+
+    def __init__(self, endpoints: List[RAGEndpoint], policy: str = 'ewma', failure_threshold: int = 3,
+                 cooldown: float = 30.0, ewma_alpha: float = 0.3, hedge_quantile: float = 0.95,
+                 hedge_min_samples: int = 20):
+        """
+        Initialize endpoint pool
+
+        Args:
+            endpoints: Deployment replicas
+            policy: Name of a BALANCING_POLICIES entry
+            failure_threshold: Consecutive failures that open a replica's circuit breaker
+            cooldown: Seconds an ejected replica is skipped before a trial request
+            ewma_alpha: Weight of the newest latency sample in the moving average
+            hedge_quantile: Latency quantile used as hedge delay
+            hedge_min_samples: Latency samples needed before hedging starts
+        """
+        if not endpoints:
+            raise ValueError("At least one RAG endpoint is required")
+        self.endpoints = endpoints
+        self.policy = BALANCING_POLICIES[policy]()
+        self.failure_threshold = failure_threshold
+        self.cooldown = cooldown
+        self.ewma_alpha = ewma_alpha
+        self.hedge_quantile = hedge_quantile
+        self.hedge_min_samples = hedge_min_samples
+        self._latencies = deque(maxlen=200)
+        self._lock = threading.Lock()
+        self.hedges = 0
+        self.hedge_wins = 0
+
+    @property
+    def size(self) -> int:
+        return len(self.endpoints)
+
+    def _available(self, endpoint: RAGEndpoint, now: float) -> bool:
+        if endpoint.opened_at is None:
+            return True
+        # Half-open: after the cooldown let one trial request through
+        return now - endpoint.opened_at >= self.cooldown and not endpoint.trial_in_flight
+
+    def choose(self, exclude: Iterable[RAGEndpoint] = ()) -> Optional[RAGEndpoint]:
+        """
+        Pick a replica and count the request as outstanding
+
+        Returns None if every replica is excluded. If all remaining replicas
+        are ejected, the one ejected longest ago is used anyway.
+        """
+        exclude = set(id(endpoint) for endpoint in exclude)
+        now = time.monotonic()
+        with self._lock:
+            candidates = [endpoint for endpoint in self.endpoints if id(endpoint) not in exclude]
+            if not candidates:
+                return None
+            available = [endpoint for endpoint in candidates if self._available(endpoint, now)]
+            if available:
+                endpoint = min(available, key=self.policy.score)
+            else:
+                endpoint = min(candidates, key=lambda e: e.opened_at)
+            if endpoint.opened_at is not None:
+                endpoint.trial_in_flight = True
+            endpoint.outstanding += 1
+            return endpoint
+
+    def pin(self, endpoint: RAGEndpoint) -> RAGEndpoint:
+        """Count a request to a specific replica as outstanding"""
+        with self._lock:
+            endpoint.outstanding += 1
+        return endpoint
+
+    def release(self, endpoint: RAGEndpoint):
+        """Stop counting a request as outstanding without recording an outcome"""
+        with self._lock:
+            endpoint.outstanding = max(endpoint.outstanding - 1, 0)
+            endpoint.trial_in_flight = False
+
+    def finish(self, endpoint: RAGEndpoint, ok: bool, latency: float):
+        """
+        Record the outcome of a request
+
+        Args:
+            endpoint: Replica the request was sent to
+            ok: False for connection errors, 429 and 5xx responses
+            latency: Seconds the request took
+        """
+        with self._lock:
+            endpoint.outstanding = max(endpoint.outstanding - 1, 0)
+            endpoint.requests += 1
+            endpoint.trial_in_flight = False
+            if ok:
+                endpoint.consecutive_failures = 0
+                endpoint.opened_at = None
+                if endpoint.ewma_latency is None:
+                    endpoint.ewma_latency = latency
+                else:
+                    endpoint.ewma_latency += self.ewma_alpha * (latency - endpoint.ewma_latency)
+                self._latencies.append(latency)
+            else:
+                endpoint.failures += 1
+                endpoint.consecutive_failures += 1
+                if endpoint.opened_at is not None or endpoint.consecutive_failures >= self.failure_threshold:
+                    # (Re-)open the breaker; a failed trial restarts the cooldown
+                    endpoint.opened_at = time.monotonic()
+
+    def record_hedge(self, won: bool = False):
+        """Count a hedged request, or a hedged request that answered first"""
+        with self._lock:
+            if won:
+                self.hedge_wins += 1
+            else:
+                self.hedges += 1
+
+    def hedge_delay(self) -> Optional[float]:
+        """Latency quantile after which a hedged request is sent, or None without enough samples"""
+        with self._lock:
+            if self.size < 2 or len(self._latencies) < self.hedge_min_samples:
+                return None
+            ordered = sorted(self._latencies)
+        return ordered[min(len(ordered) - 1, int(round(self.hedge_quantile * (len(ordered) - 1))))]
+
+    def stats(self) -> dict:
+        with self._lock:
+            return {
+                'endpoints': [endpoint.to_dict() for endpoint in self.endpoints],
+                'ejected': sum(1 for endpoint in self.endpoints if endpoint.opened_at is not None),
+                'hedges': self.hedges,
+                'hedge_wins': self.hedge_wins
+            }
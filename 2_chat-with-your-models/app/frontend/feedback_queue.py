@@ -0,0 +1,291 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Feedback Queue Module
+Background submission of RAG feedback and prefetching of expert recommendations
+"""
+
+import json
+import os
+import random
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Optional
+
+
+class FeedbackQueue:
+    """
+    Thread-safe background queue for feedback posts
+
+    submit() returns at once; a worker thread sends the queued items in
+    batches, retries failures with exponential backoff and drops an item
+    after max_attempts. With a journal file, every queued item is appended
+    to a JSON-lines journal and marked done once it is sent or given up, so
+    unsent feedback survives restarts. Expert recommendations for negatively
+    rated answers can be fetched in the background with prefetch_expert().
+    """
+
+    def __init__(self, service, journal_path: Optional[str] = None, batch_size: int = 8,
+                 max_attempts: int = 6, backoff: float = 1.0, max_backoff: float = 60.0,
+                 workers: int = 4, max_prefetched: int = 256):
+        """
+        Initialize feedback queue
+
+        Args:
+            service: RAGService used to send feedback and fetch expert recommendations
+            journal_path: Optional JSON-lines file used to persist unsent feedback
+            batch_size: Maximum number of items sent per worker cycle
+            max_attempts: Attempts per item before it is given up
+            backoff: Seconds before the first retry, doubled for every further retry
+            max_backoff: Upper bound of the retry delay in seconds
+            workers: Threads sending the items of a batch and prefetching experts
+            max_prefetched: Number of expert recommendations kept
+        """
+        self.service = service
+        self.journal_path = journal_path
+        self.batch_size = batch_size
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.max_prefetched = max_prefetched
+
+        self._items: "OrderedDict[str, dict]" = OrderedDict()
+        self._status = {}
+        self._experts: "OrderedDict[str, Future]" = OrderedDict()
+        self._condition = threading.Condition()
+        self._journal_lock = threading.Lock()
+        self._journal_records = 0
+        self._executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix='rag-feedback')
+        self._closed = False
+        self.sent = 0
+        self.failed = 0
+        self.retries = 0
+
+        if self.journal_path:
+            self._replay_journal()
+
+        self._worker = threading.Thread(target=self._run, name='rag-feedback-queue', daemon=True)
+        self._worker.start()
+
+    def submit(self, log_id: str, value: str, comment: Optional[str] = None) -> str:
+        """
+        Queue feedback for a response
+
+        Args:
+            log_id: Log ID from the response
+            value: Feedback value (0-100)
+            comment: Optional feedback comment
+
+        Returns:
+            ID of the queued item, for status()
+        """
+        item = {
+            'id': uuid.uuid4().hex,
+            'log_id': log_id,
+            'value': value,
+            'comment': comment or '',
+            'attempts': 0,
+            'next_attempt': 0.0,
+            'created': time.time()
+        }
+        # Queue and journal the item in one step, so a compaction in between
+        # cannot rewrite the journal without it
+        with self._journal_lock:
+            with self._condition:
+                self._items[item['id']] = item
+                self._status[item['id']] = 'pending'
+                self._condition.notify()
+            self._write_journal([{'op': 'add', 'item': item}])
+        self._compact_if_mostly_done()
+        return item['id']
+
+    def status(self, item_id: str) -> str:
+        """Return 'pending', 'sent', 'failed' or 'unknown' for a queued item"""
+        with self._condition:
+            return self._status.get(item_id, 'unknown')
+
+    def stats(self) -> dict:
+        with self._condition:
+            return {
+                'pending': len(self._items),
+                'sent': self.sent,
+                'failed': self.failed,
+                'retries': self.retries,
+                'prefetched_experts': len(self._experts)
+            }
+
+    def prefetch_expert(self, log_id: str):
+        """Start fetching the expert recommendation for a log ID in the background"""
+        with self._condition:
+            if log_id in self._experts or self._closed:
+                return
+            self._experts[log_id] = self._executor.submit(self.service.get_expert_recommendation, log_id)
+            while len(self._experts) > self.max_prefetched:
+                self._experts.popitem(last=False)
+
+    def expert_recommendation(self, log_id: str, timeout: Optional[float] = None) -> dict:
+        """
+        Return the expert recommendation for a log ID
+
+        Waits for a prefetch that is still running and fetches it directly if
+        there was none or it failed.
+        """
+        with self._condition:
+            future = self._experts.pop(log_id, None)
+        if future is not None:
+            try:
+                return future.result(timeout=timeout)
+            except Exception:
+                pass
+        return self.service.get_expert_recommendation(log_id)
+
+    def flush(self, timeout: float = 30.0) -> bool:
+        """Wait until every queued item is sent or given up; returns False on timeout"""
+        deadline = time.monotonic() + timeout
+        with self._condition:
+            self._condition.notify()
+            while self._items:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    return False
+                self._condition.wait(min(remaining, 0.1))
+        return True
+
+    def close(self):
+        """Stop the worker; unsent items stay in the journal"""
+        with self._condition:
+            self._closed = True
+            self._condition.notify_all()
+        self._worker.join(timeout=5)
+        self._executor.shutdown(wait=False)
+
+    def _next_batch(self) -> list:
+        """Wait for due items and take up to batch_size of them (called with the condition held)"""
+        while not self._closed:
+            now = time.time()
+            due = [item for item in self._items.values() if item['next_attempt'] <= now]
+            if due:
+                return due[:self.batch_size]
+            waits = [item['next_attempt'] - now for item in self._items.values()
+                     if item['next_attempt'] != float('inf')]
+            self._condition.wait(min(waits) if waits else None)
+        return []
+
+    def _run(self):
+        while True:
+            with self._condition:
+                batch = self._next_batch()
+                if not batch:
+                    return
+                for item in batch:
+                    item['next_attempt'] = float('inf')  # in flight
+
+            results = list(self._executor.map(self._send, batch))
+
+            records = []
+            with self._condition:
+                for item, ok in zip(batch, results):
+                    item['attempts'] += 1
+                    if ok:
+                        self._finish(item, 'sent')
+                        self.sent += 1
+                    elif item['attempts'] >= self.max_attempts:
+                        self._finish(item, 'failed')
+                        self.failed += 1
+                    else:
+                        delay = min(self.max_backoff, self.backoff * 2 ** (item['attempts'] - 1))
+                        item['next_attempt'] = time.time() + delay * random.uniform(0.8, 1.2)
+                        self.retries += 1
+                        continue
+                    records.append({'op': 'done', 'id': item['id']})
+                self._condition.notify_all()
+            self._append_journal(records)
+
+    def _finish(self, item: dict, status: str):
+        self._items.pop(item['id'], None)
+        self._status[item['id']] = status
+        while len(self._status) > 4 * self.max_prefetched:
+            self._status.pop(next(iter(self._status)))
+
+    def _send(self, item: dict) -> bool:
+        try:
+            result = self.service.send_feedback(item['log_id'], item['value'], item['comment'] or None)
+        except Exception:
+            return False
+        if result.get('message') == 'No log_id provided':
+            # Cannot succeed on a retry
+            return True
+        return result.get('status') == 'ok'
+
+    def _replay_journal(self):
+        """Queue the items of the journal that were never marked done, then compact it"""
+        if not os.path.exists(self.journal_path):
+            return
+        pending: "OrderedDict[str, dict]" = OrderedDict()
+        try:
+            with open(self.journal_path, encoding='utf-8') as f:
+                for line in f:
+                    try:
+                        record = json.loads(line)
+                    except ValueError:
+                        continue  # torn write at the end of the file
+                    if record.get('op') == 'add':
+                        pending[record['item']['id']] = record['item']
+                    elif record.get('op') == 'done':
+                        pending.pop(record.get('id'), None)
+        except OSError as e:
+            print(f"Warning: could not read feedback journal: {e}")
+            return
+
+        for item in pending.values():
+            item['attempts'] = 0
+            item['next_attempt'] = 0.0
+            self._items[item['id']] = item
+            self._status[item['id']] = 'pending'
+        self._compact_journal()
+
+    def _append_journal(self, records: list):
+        with self._journal_lock:
+            self._write_journal(records)
+        self._compact_if_mostly_done()
+
+    def _write_journal(self, records: list):
+        """Append records to the journal (called with the journal lock held)"""
+        if not (self.journal_path and records):
+            return
+        try:
+            with open(self.journal_path, 'a', encoding='utf-8') as f:
+                for record in records:
+                    f.write(json.dumps(record) + '\n')
+            self._journal_records += len(records)
+        except OSError as e:
+            print(f"Warning: could not write feedback journal: {e}")
+
+    def _compact_if_mostly_done(self):
+        """Rewrite the journal once it is mostly done records"""
+        if not self.journal_path:
+            return
+        with self._condition:
+            pending = len(self._items)
+        if self._journal_records > 100 and self._journal_records > 4 * pending:
+            self._compact_journal()
+
+    def _compact_journal(self):
+        with self._journal_lock:
+            with self._condition:
+                items = [dict(item, next_attempt=0.0) for item in self._items.values()]
+            tmp_path = f"{self.journal_path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    for item in items:
+                        f.write(json.dumps({'op': 'add', 'item': item}) + '\n')
+                os.replace(tmp_path, self.journal_path)
+                self._journal_records = len(items)
+            except OSError as e:
+                print(f"Warning: could not compact feedback journal: {e}")
@@ -0,0 +1,164 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Generation Stream Module
+Streaming text generation helpers with time-to-first-token measurement
+"""
+
+import json
+import time
+from typing import Iterable, Iterator, Optional
+
+import requests
+
+
+class TimedStream:
+    """
+    Iterator wrapper that measures a streamed generation
+
+    The clock starts when the wrapper is created, so time-to-first-token
+    includes the request round-trip. Every non-empty chunk is counted as one
+    token, which matches the per-token events sent by watsonx.ai.
+    """
+
+    def __init__(self, chunks: Iterable[str]):
+        self._chunks = iter(chunks)
+        self.started = time.perf_counter()
+        self.first_token_at: Optional[float] = None
+        self.finished_at: Optional[float] = None
+        self.token_count = 0
+
+    def __iter__(self) -> Iterator[str]:
+        return self
+
+    def __next__(self) -> str:
+        try:
+            chunk = next(self._chunks)
+        except StopIteration:
+            if self.finished_at is None:
+                self.finished_at = time.perf_counter()
+            raise
+
+        if chunk:
+            if self.first_token_at is None:
+                self.first_token_at = time.perf_counter()
+            self.token_count += 1
+        return chunk
+
+    def metrics(self) -> dict:
+        """
+        Latency metrics of the stream
+
+        Returns:
+            Dictionary with ttft (s), total (s), tokens and tokens_per_sec
+        """
+        finished = self.finished_at or time.perf_counter()
+        ttft = (self.first_token_at - self.started) if self.first_token_at else None
+        generation_time = (finished - self.first_token_at) if self.first_token_at else 0.0
+
+        return {
+            'ttft': ttft,
+            'total': finished - self.started,
+            'tokens': self.token_count,
+            'tokens_per_sec': (self.token_count / generation_time) if generation_time > 0 else 0.0
+        }
+
+
+def stream_deployment_text(base_url: str, deployment_id: str, token: str,
+                           prompt_variables: dict, session: Optional[requests.Session] = None,
+                           timeout: tuple = (5, 300)) -> Iterator[str]:
+    """
+    Stream generated text from a deployed prompt template
+
+    Args:
+        base_url: watsonx.ai URL, e.g. https://us-south.ml.cloud.ibm.com
+        deployment_id: Deployment ID of the prompt template
+        token: IAM access token
+        prompt_variables: Values for the template's prompt variables
+        session: Optional requests session to reuse connections
+        timeout: (connect, read) timeout in seconds
+
+    Yields:
+        Generated text chunks as they arrive
+    """
+    url = f"{base_url}/ml/v1/deployments/{deployment_id}/text/generation_stream?version=2021-05-01"
+    http = session or requests
+
+    response = http.post(
+        url,
+        headers={
+            'Content-Type': 'application/json',
+            'Accept': 'text/event-stream',
+            'Authorization': f'Bearer {token}'
+        },
+        json={
+            "parameters": {
+                "prompt_variables": prompt_variables
+            }
+        },
+        stream=True,
+        timeout=timeout
+    )
+
+    if response.status_code != 200:
+        raise Exception(f"Deployment request failed: {response.text}")
+
+    try:
+        for line in response.iter_lines(decode_unicode=True):
+            # Server-sent events: only 'data:' lines carry generation results
+            if not line or not line.startswith('data:'):
+                continue
+            data = line[len('data:'):].strip()
+            if not data:
+                continue
+            event = json.loads(data)
+            for result in event.get('results', []):
+                text = result.get('generated_text', '')
+                if text:
+                    yield text
+    finally:
+        response.close()
+
+
+def generate_deployment_text(base_url: str, deployment_id: str, token: str,
+                             prompt_variables: dict, session: Optional[requests.Session] = None,
+                             timeout: tuple = (5, 300)) -> str:
+    """
+    Generate text from a deployed prompt template in one request
+
+    Args:
+        base_url: watsonx.ai URL, e.g. https://us-south.ml.cloud.ibm.com
+        deployment_id: Deployment ID of the prompt template
+        token: IAM access token
+        prompt_variables: Values for the template's prompt variables
+        session: Optional requests session to reuse connections
+        timeout: (connect, read) timeout in seconds
+
+    Returns:
+        Generated text
+    """
+    url = f"{base_url}/ml/v1/deployments/{deployment_id}/text/generation?version=2021-05-01"
+    http = session or requests
+
+    response = http.post(
+        url,
+        headers={
+            'Content-Type': 'application/json',
+            'Accept': 'application/json',
+            'Authorization': f'Bearer {token}'
+        },
+        json={
+            "parameters": {
+                "prompt_variables": prompt_variables
+            }
+        },
+        timeout=timeout
+    )
+
+    if response.status_code != 200:
+        raise Exception(f"Deployment request failed: {response.text}")
+
+    return response.json()['results'][0]['generated_text']
@@ -0,0 +1,165 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Health Monitor Module
+Shared, periodically refreshed health status of the RAG endpoint
+"""
+
+import random
+import statistics
+import threading
+import time
+from collections import deque
+from typing import Callable, Tuple
+
+
+class HealthMonitor:
+    """
+    Thread-safe health monitor for one endpoint
+
+    A background thread pings the endpoint every `interval` seconds and keeps
+    the last `window` samples. Real requests can be reported with record();
+    a ping is skipped while such passive samples are recent, so a busy
+    endpoint is not pinged at all. status() never calls the endpoint; it
+    only asks the thread for an early refresh when the last sample is older
+    than `ttl`.
+
+    Latency is kept per sample source, and only ping latency is used to
+    detect degradation, because real requests take as long as their answer.
+    A real request only counts as failed on a connection error or a 5xx
+    status; a 4xx is the caller's fault, not the endpoint's.
+
+    States:
+        unknown  - no sample yet
+        healthy  - last sample succeeded and latency is normal
+        degraded - recent ping latency is `latency_factor` times the window median,
+                   or the last samples failed but fewer than `error_streak` times
+        down     - the last `error_streak` samples failed
+    """
+
+    def __init__(self, probe: Callable[[], Tuple[bool, int]], interval: float = 60.0, ttl: float = 120.0,
+                 window: int = 20, latency_factor: float = 2.0, error_streak: int = 3):
+        """
+        Initialize health monitor
+
+        Args:
+            probe: Callable returning (ok, status_code), e.g. RAGService.ping
+            interval: Seconds between background pings
+            ttl: Seconds after which the status counts as stale
+            window: Number of samples kept for success rate, and per source for latency
+            latency_factor: Recent/median latency ratio that counts as degraded
+            error_streak: Consecutive failures that count as down
+        """
+        self.probe = probe
+        self.interval = interval
+        self.ttl = ttl
+        self.latency_factor = latency_factor
+        self.error_streak = error_streak
+
+        self.window = window
+        self._samples = deque(maxlen=window)
+        self._latencies = {}
+        self._lock = threading.Lock()
+        self._wakeup = threading.Event()
+        self._first_sample = threading.Event()
+        self._closed = False
+        self.pings = 0
+        self._thread = threading.Thread(target=self._run, name='rag-health-monitor', daemon=True)
+        self._thread.start()
+
+    def record(self, ok: bool, latency: float, status_code: int = 0, source: str = 'request'):
+        """Add a sample, e.g. from a real request to the endpoint"""
+        if source != 'ping':
+            ok = ok or 0 < status_code < 500
+        with self._lock:
+            self._samples.append((time.time(), ok, status_code, latency, source))
+            if ok:
+                self._latencies.setdefault(source, deque(maxlen=self.window)).append(latency)
+        self._first_sample.set()
+
+    def wait(self, timeout: float = 10.0) -> dict:
+        """Status, waiting up to `timeout` seconds for the first sample after start-up"""
+        self._first_sample.wait(timeout)
+        return self.status()
+
+    def check_now(self) -> dict:
+        """Ping the endpoint in the calling thread and return the new status"""
+        self._ping()
+        return self.status()
+
+    def _ping(self):
+        start = time.perf_counter()
+        try:
+            ok, status_code = self.probe()
+        except Exception:
+            ok, status_code = False, 0
+        self.pings += 1
+        self.record(ok, time.perf_counter() - start, status_code, source='ping')
+
+    def _run(self):
+        while not self._closed:
+            with self._lock:
+                last = self._samples[-1][0] if self._samples else 0.0
+            if time.time() - last >= self.interval:
+                self._ping()
+            # Jitter keeps several app processes from pinging in lockstep
+            self._wakeup.wait(self.interval * random.uniform(0.9, 1.1))
+            self._wakeup.clear()
+
+    def close(self):
+        self._closed = True
+        self._wakeup.set()
+
+    def status(self) -> dict:
+        """Current health status; never blocks on the endpoint"""
+        with self._lock:
+            samples = list(self._samples)
+            latencies = list(self._latencies.get('ping', ()))
+            request_latencies = sorted(self._latencies.get('request', ()))
+
+        if not samples:
+            return {'state': 'unknown', 'reason': 'No health check yet', 'samples': 0}
+
+        checked, ok, status_code, _, _ = samples[-1]
+        age = time.time() - checked
+        if age > self.ttl:
+            self._wakeup.set()
+
+        streak = 0
+        for sample in reversed(samples):
+            if sample[1]:
+                break
+            streak += 1
+
+        median = statistics.median(latencies) if latencies else None
+        recent = statistics.median(latencies[-3:]) if latencies else None
+        p95 = sorted(latencies)[min(len(latencies) - 1, int(round(0.95 * (len(latencies) - 1))))] if latencies else None
+
+        if streak >= self.error_streak:
+            state, reason = 'down', f"{streak} failed checks in a row (status {status_code})"
+        elif streak:
+            state, reason = 'degraded', f"Last {streak} check(s) failed (status {status_code})"
+        elif len(latencies) >= 6 and recent > self.latency_factor * median:
+            state, reason = 'degraded', f"Latency rising: {recent * 1000:.0f} ms vs median {median * 1000:.0f} ms"
+        else:
+            state, reason = 'healthy', ''
+
+        return {
+            'state': state,
+            'reason': reason,
+            'ok': ok,
+            'status_code': status_code,
+            'age': age,
+            'stale': age > self.ttl,
+            'samples': len(samples),
+            'success_rate': sum(1 for sample in samples if sample[1]) / len(samples),
+            'error_streak': streak,
+            'latency_p50': median,
+            'latency_p95': p95,
+            'request_latency_p50': statistics.median(request_latencies) if request_latencies else None,
+            'pings': self.pings
+        }
+
@@ -0,0 +1,231 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Conversation History Module
+Incremental prompt building with a per-model token budget
+"""
+
+from typing import Callable, List, Optional, Sequence, Tuple
+
+
+# Context window sizes of the models offered in the app
+MODEL_CONTEXT_TOKENS = {
+    'ibm/granite-3-3-8b-instruct': 131072,
+    'ibm/granite-8b-code-instruct': 128000,
+    'meta-llama/llama-3-2-90b-vision-instruct': 131072,
+    'meta-llama/llama-3-3-70b-instruct': 131072,
+    'meta-llama/llama-3-405b-instruct': 16384,
+    'meta-llama/llama-4-maverick-17b-128e-instruct-fp8': 131072,
+    'mistralai/mistral-medium-2505': 131072,
+    'mistralai/mistral-small-3-1-24b-instruct-2503': 131072,
+    'openai/gpt-oss-120b': 131072,
+}
+
+DEFAULT_CONTEXT_TOKENS = 8192
+
+TURN_SEPARATOR = "\n\n"
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count (about four characters per token)"""
+    return max(1, (len(text) + 3) // 4)
+
+
+def token_budget(model_id: str, max_new_tokens: int, limit: Optional[int] = None) -> int:
+    """
+    Prompt token budget for a model
+
+    Args:
+        model_id: Foundation model ID
+        max_new_tokens: Tokens reserved for the generated answer
+        limit: Optional upper bound, e.g. to keep prompts small for latency
+
+    Returns:
+        Maximum number of prompt tokens
+    """
+    budget = MODEL_CONTEXT_TOKENS.get(model_id, DEFAULT_CONTEXT_TOKENS) - max_new_tokens
+    if limit:
+        budget = min(budget, limit)
+    return max(budget, 256)
+
+
+class Turn:
+    """A rendered conversation turn with its cached token count"""
+    __slots__ = ('role', 'content', 'text', 'tokens')
+
+    def __init__(self, role: str, content: str, token_counter: Callable[[str], int]):
+        self.role = role
+        self.content = content
+        self.text = f"<|{role}|>\n{content}"
+        self.tokens = token_counter(self.text)
+
+
+class SlidingWindowPolicy:
+    """Drop the oldest turns until the prompt fits the budget"""
+
+    name = 'Sliding window'
+
+    def apply(self, history: 'ConversationHistory', budget: int) -> List[Turn]:
+        turns = list(history.turns)
+        total = history.fixed_tokens + sum(t.tokens for t in turns)
+        while turns and total > budget:
+            total -= turns.pop(0).tokens
+        return turns
+
+
+def truncate_summary(turns: List[Turn], max_chars: int = 200) -> str:
+    """Default summariser: keep the start of every older turn"""
+    lines = []
+    for turn in turns:
+        content = ' '.join(turn.content.split())
+        if len(content) > max_chars:
+            content = content[:max_chars].rstrip() + '…'
+        lines.append(f"- {turn.role}: {content}")
+    return "Summary of the earlier conversation:\n" + "\n".join(lines)
+
+
+class SummarizeOlderTurnsPolicy:
+    """
+    Replace older turns with one summary turn and keep the recent ones verbatim
+
+    The summariser is pluggable; by default the beginning of each older turn
+    is kept. If the summary plus recent turns still exceed the budget, recent
+    turns are dropped oldest first and the summary goes last.
+    """
+
+    name = 'Summarise older turns'
+
+    def __init__(self, keep_recent: int = 4, summarize_fn: Optional[Callable[[List[Turn]], str]] = None):
+        self.keep_recent = keep_recent
+        self.summarize_fn = summarize_fn or truncate_summary
+
+    def apply(self, history: 'ConversationHistory', budget: int) -> List[Turn]:
+        turns = list(history.turns)
+        summary = None
+        if len(turns) > self.keep_recent:
+            older, turns = turns[:-self.keep_recent], turns[-self.keep_recent:]
+            summary = Turn('system', self.summarize_fn(older), history.token_counter)
+
+        # Drop recent turns before the summary, and the summary only as a last resort
+        total = history.fixed_tokens + sum(t.tokens for t in turns) + (summary.tokens if summary else 0)
+        while len(turns) > 1 and total > budget:
+            total -= turns.pop(0).tokens
+        if summary is not None and total > budget:
+            total -= summary.tokens
+            summary = None
+        while turns and total > budget:
+            total -= turns.pop(0).tokens
+
+        return ([summary] if summary else []) + turns
+
+
+HISTORY_POLICIES = {
+    SlidingWindowPolicy.name: SlidingWindowPolicy,
+    SummarizeOlderTurnsPolicy.name: SummarizeOlderTurnsPolicy,
+}
+
+
+class ConversationHistory:
+    """
+    Running prompt for a chat session
+
+    Turns are rendered and token-counted once when they are added, and the
+    prompt text grows by appending only the new turn. The system prompt is
+    pinned and never dropped. When a new message would exceed the budget,
+    the policy rewrites the turn list once and the prompt is rebuilt.
+    """
+
+    def __init__(self, system_prompt: str = '', budget: int = DEFAULT_CONTEXT_TOKENS,
+                 policy=None, token_counter: Callable[[str], int] = estimate_tokens):
+        """
+        Initialize conversation history
+
+        Args:
+            system_prompt: Pinned system instruction
+            budget: Maximum number of prompt tokens
+            policy: Policy applied when the budget is exceeded (default sliding window)
+            token_counter: Callable returning the token count of a text
+        """
+        self.system_prompt = system_prompt.strip()
+        self.budget = budget
+        self.policy = policy or SlidingWindowPolicy()
+        self.token_counter = token_counter
+
+        self.turns: List[Turn] = []
+        self.synced_messages = 0
+        self.last_prompt_tokens = 0
+        self.trimmed_turns = 0
+
+        self._system_part = f"<|system|>\n{self.system_prompt}" if self.system_prompt else ''
+        self._system_tokens = token_counter(self._system_part) if self._system_part else 0
+        self._assistant_tag = "<|assistant|>"
+        self._assistant_tokens = token_counter(self._assistant_tag)
+        self._pending_tokens = 0
+        self._rebuild()
+
+    @property
+    def fixed_tokens(self) -> int:
+        """Tokens that are always sent: system prompt, new message and answer tag"""
+        return self._system_tokens + self._pending_tokens + self._assistant_tokens
+
+    def _rebuild(self):
+        parts = [self._system_part] if self._system_part else []
+        parts.extend(turn.text for turn in self.turns)
+        self._prompt = TURN_SEPARATOR.join(parts)
+        self._tokens = self._system_tokens + sum(turn.tokens for turn in self.turns)
+
+    def add_turn(self, role: str, content: str):
+        """Append a completed turn to the running prompt"""
+        turn = Turn(role, content, self.token_counter)
+        self.turns.append(turn)
+        self._prompt = f"{self._prompt}{TURN_SEPARATOR}{turn.text}" if self._prompt else turn.text
+        self._tokens += turn.tokens
+
+    def sync(self, messages: Sequence, until: Optional[int] = None):
+        """
+        Append chat messages that are not part of the history yet
+
+        Args:
+            messages: Chat messages with 'role' and 'content' keys; an optional
+                'model_content' key replaces 'content' in the prompt
+            until: Only sync messages before this index (default: all); only
+                the new messages are sliced, so older ones are never read again
+        """
+        end = len(messages) if until is None else until
+        if end < self.synced_messages:
+            # The chat was cleared; start over
+            self.turns = []
+            self.synced_messages = 0
+            self._rebuild()
+
+        for message in messages[self.synced_messages:end]:
+            if not message.get('error'):
+                self.add_turn(message['role'], message.get('model_content', message['content']))
+        self.synced_messages = end
+
+    def build_prompt(self, user_message: str) -> Tuple[str, int]:
+        """
+        Build the prompt for a new user message within the token budget
+
+        Args:
+            user_message: Current user message
+
+        Returns:
+            Tuple of (prompt, prompt_tokens)
+        """
+        user_turn = Turn('user', user_message, self.token_counter)
+        self._pending_tokens = user_turn.tokens + 2 * self.token_counter(TURN_SEPARATOR)
+
+        if self._tokens + self.fixed_tokens - self._system_tokens > self.budget:
+            kept = self.policy.apply(self, self.budget)
+            self.trimmed_turns += len(self.turns) - len(kept)
+            self.turns = kept
+            self._rebuild()
+
+        prefix = f"{self._prompt}{TURN_SEPARATOR}" if self._prompt else ''
+        prompt = f"{prefix}{user_turn.text}{TURN_SEPARATOR}{self._assistant_tag}"
+        self.last_prompt_tokens = self._tokens + self._pending_tokens + self._assistant_tokens
+        return prompt, self.last_prompt_tokens
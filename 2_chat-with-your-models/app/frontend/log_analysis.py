@@ -0,0 +1,386 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Log Analysis Module
+Chunked map-reduce analysis of log files that exceed the model's context window
+
+Usage:
+    python log_analysis.py customer-portal.log [more.log ...] [--chunk-chars 12000] [--workers 4]
+"""
+
+import json
+import os
+import re
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime
+from typing import Callable, Iterator, List, Optional
+
+
+# Timestamps found at the start of syslog style lines, e.g.
+# "[2024-01-15 10:15:23] ERROR ..." or "2024-01-15T10:15:23.123Z INFO ..."
+TIMESTAMP_PATTERN = re.compile(
+    r'^\[?(\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?)(?:Z|[+-]\d{2}:?\d{2})?\]?'
+)
+JSON_TIMESTAMP_KEYS = ('timestamp', 'time', '@timestamp', 'ts')
+
+MAP_PROMPT = """You are analysing part {index} of {total} of a larger log file ({source}, lines {start_line}-{end_line}, {time_range}).
+List the notable errors and warnings with their timestamps, the affected components and request IDs, and the likely cause.
+Only report what is in this excerpt. Be concise and use bullet points.
+
+Log excerpt:
+{text}"""
+
+REDUCE_PROMPT = """You are given partial findings from analysing consecutive parts of system logs.
+Combine them into one incident report with these sections:
+1. Executive summary
+2. Timeline of events (chronological table with time, service and event)
+3. Root cause
+4. Impact assessment
+5. Recommended fixes and debugging steps
+
+Partial findings:
+{findings}"""
+
+
+def parse_timestamp(line: str) -> Optional[datetime]:
+    """
+    Extract the timestamp of a syslog or JSON log line
+
+    Args:
+        line: Raw log line
+
+    Returns:
+        Parsed datetime or None if the line has no recognisable timestamp
+    """
+    line = line.strip()
+    if line.startswith('{'):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return None
+        for key in JSON_TIMESTAMP_KEYS:
+            if isinstance(record.get(key), str):
+                return _parse_iso(record[key])
+        return None
+
+    match = TIMESTAMP_PATTERN.match(line)
+    return _parse_iso(match.group(1)) if match else None
+
+
+def _parse_iso(value: str) -> Optional[datetime]:
+    value = value.strip().replace(',', '.').rstrip('Z')
+    value = re.sub(r'[+-]\d{2}:?\d{2}$', '', value)
+    try:
+        return datetime.fromisoformat(value.replace(' ', 'T'))
+    except ValueError:
+        return None
+
+
+class LogChunk:
+    """A contiguous slice of a log file"""
+    __slots__ = ('index', 'source', 'start_line', 'end_line', 'first_ts', 'last_ts', 'text')
+
+    def __init__(self, index: int, source: str, start_line: int, end_line: int,
+                 first_ts: Optional[datetime], last_ts: Optional[datetime], text: str):
+        self.index = index
+        self.source = source
+        self.start_line = start_line
+        self.end_line = end_line
+        self.first_ts = first_ts
+        self.last_ts = last_ts
+        self.text = text
+
+    @property
+    def time_range(self) -> str:
+        if not self.first_ts:
+            return 'time range unknown'
+        return f"{self.first_ts:%Y-%m-%d %H:%M:%S} to {(self.last_ts or self.first_ts):%Y-%m-%d %H:%M:%S}"
+
+
+def iter_log_chunks(path: str, max_chars: int = 12000, max_seconds: Optional[float] = None,
+                    start_index: int = 0) -> Iterator[LogChunk]:
+    """
+    Stream a log file from disk as size- or time-bounded chunks
+
+    A chunk is closed when adding the next line would exceed max_chars, or,
+    if max_seconds is set, when the next line's timestamp is more than
+    max_seconds after the chunk's first timestamp. Only one chunk is held in
+    memory at a time.
+
+    Args:
+        path: Log file path
+        max_chars: Maximum characters per chunk
+        max_seconds: Optional maximum time span per chunk
+        start_index: Index assigned to the first chunk
+
+    Yields:
+        LogChunk objects in file order
+    """
+    source = os.path.basename(path)
+    index = start_index
+    lines: List[str] = []
+    size = 0
+    start_line = 1
+    first_ts = last_ts = None
+
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line_no, line in enumerate(f, 1):
+            ts = parse_timestamp(line)
+            too_big = lines and size + len(line) > max_chars
+            too_long = (
+                lines and max_seconds is not None and ts and first_ts
+                and (ts - first_ts).total_seconds() > max_seconds
+            )
+            if too_big or too_long:
+                yield LogChunk(index, source, start_line, line_no - 1, first_ts, last_ts, ''.join(lines))
+                index += 1
+                lines, size, start_line = [], 0, line_no
+                first_ts = last_ts = None
+
+            lines.append(line)
+            size += len(line)
+            if ts:
+                first_ts = first_ts or ts
+                last_ts = ts
+
+        if lines:
+            yield LogChunk(index, source, start_line, line_no, first_ts, last_ts, ''.join(lines))
+
+
+class ChunkResult:
+    """Findings and latency of one analysed chunk"""
+    __slots__ = ('chunk', 'findings', 'latency', 'error')
+
+    def __init__(self, chunk: LogChunk, findings: str = '', latency: float = 0.0, error: Optional[str] = None):
+        self.chunk = chunk
+        self.findings = findings
+        self.latency = latency
+        self.error = error
+
+
+class LogAnalysisReport:
+    """Result of a map-reduce log analysis"""
+
+    def __init__(self, report: str, chunk_results: List[ChunkResult], reduce_latency: float, total_time: float):
+        self.report = report
+        self.chunk_results = chunk_results
+        self.reduce_latency = reduce_latency
+        self.total_time = total_time
+
+    def stats(self) -> dict:
+        """Chunk count, failures and latency summary"""
+        latencies = sorted(r.latency for r in self.chunk_results if r.error is None)
+        return {
+            'chunks': len(self.chunk_results),
+            'failed_chunks': sum(1 for r in self.chunk_results if r.error),
+            'chunk_latency_avg': sum(latencies) / len(latencies) if latencies else 0.0,
+            'chunk_latency_max': latencies[-1] if latencies else 0.0,
+            'reduce_latency': self.reduce_latency,
+            'total_time': self.total_time
+        }
+
+
+def _truncate(text: str, limit: int) -> str:
+    marker = "\n[...]"
+    if len(text) <= limit:
+        return text
+    return text[:max(limit - len(marker), 0)] + marker
+
+
+class LogAnalysisPipeline:
+    """
+    Map-reduce log analysis against a text generation function
+
+    Chunks are analysed concurrently (map); the partial findings are then
+    combined into one report (reduce). If the findings themselves are too
+    large for one prompt they are reduced in groups first; every round
+    merges at least two findings per group, and after `max_reduce_rounds`
+    rounds the remaining findings are truncated into one final prompt.
+    """
+
+    def __init__(self, generate_fn: Callable[[str], str], max_workers: int = 4,
+                 max_chars: int = 12000, max_seconds: Optional[float] = None,
+                 reduce_max_chars: int = 24000, max_reduce_rounds: int = 8):
+        """
+        Initialize pipeline
+
+        Args:
+            generate_fn: Callable that returns the model's answer for a prompt
+            max_workers: Number of chunks analysed concurrently
+            max_chars: Maximum characters per log chunk
+            max_seconds: Optional maximum time span per log chunk
+            reduce_max_chars: Maximum characters of findings per reduce prompt
+            max_reduce_rounds: Maximum number of intermediate reduce rounds
+        """
+        self.generate_fn = generate_fn
+        self.max_workers = max_workers
+        self.max_chars = max_chars
+        self.max_seconds = max_seconds
+        self.reduce_max_chars = reduce_max_chars
+        self.max_reduce_rounds = max_reduce_rounds
+
+    def _map(self, chunk: LogChunk, total: int) -> ChunkResult:
+        prompt = MAP_PROMPT.format(
+            index=chunk.index + 1,
+            total=total,
+            source=chunk.source,
+            start_line=chunk.start_line,
+            end_line=chunk.end_line,
+            time_range=chunk.time_range,
+            text=chunk.text
+        )
+        start = time.perf_counter()
+        try:
+            findings = self.generate_fn(prompt)
+            return ChunkResult(chunk, findings, time.perf_counter() - start)
+        except Exception as e:
+            return ChunkResult(chunk, '', time.perf_counter() - start, str(e))
+
+    def _reduce(self, findings: List[str]) -> str:
+        # Reduce in groups until everything fits into a single prompt. Findings are
+        # truncated so two always fit into one prompt, and every group holds at least
+        # two of them, so each round at least halves the number of findings.
+        limit = max(self.reduce_max_chars // 2, 1)
+        for _ in range(self.max_reduce_rounds):
+            findings = [_truncate(item, limit) for item in findings]
+            groups, current, size = [], [], 0
+            for item in findings:
+                if len(current) >= 2 and size + len(item) > self.reduce_max_chars:
+                    groups.append(current)
+                    current, size = [], 0
+                current.append(item)
+                size += len(item)
+            if current:
+                groups.append(current)
+
+            if len(groups) <= 1:
+                return self.generate_fn(REDUCE_PROMPT.format(findings="\n\n".join(findings)))
+
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                findings = list(executor.map(
+                    lambda group: self.generate_fn(REDUCE_PROMPT.format(findings="\n\n".join(group))),
+                    groups
+                ))
+
+        # Round limit reached: share one prompt between the remaining findings
+        limit = max(self.reduce_max_chars // len(findings), 1)
+        return self.generate_fn(REDUCE_PROMPT.format(
+            findings="\n\n".join(_truncate(item, limit) for item in findings)
+        ))
+
+    def run(self, paths: List[str], progress: Optional[Callable[[int, int, ChunkResult], None]] = None) -> LogAnalysisReport:
+        """
+        Analyse one or more log files
+
+        Args:
+            paths: Log file paths
+            progress: Optional callback(done, total, chunk_result) called per finished chunk
+
+        Returns:
+            LogAnalysisReport with the combined report and per-chunk results
+        """
+        started = time.perf_counter()
+
+        # First pass only counts chunks so progress can be reported as done/total;
+        # the second pass streams chunks with a bounded number in flight
+        total = sum(1 for path in paths for _ in iter_log_chunks(path, self.max_chars, self.max_seconds))
+        max_in_flight = self.max_workers * 2
+
+        def chunk_stream():
+            index = 0
+            for path in paths:
+                for chunk in iter_log_chunks(path, self.max_chars, self.max_seconds, start_index=index):
+                    index = chunk.index + 1
+                    yield chunk
+
+        results: List[Optional[ChunkResult]] = [None] * total
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+            pending = set()
+            chunks = chunk_stream()
+            while True:
+                while len(pending) < max_in_flight:
+                    chunk = next(chunks, None)
+                    if chunk is None:
+                        break
+                    pending.add(executor.submit(self._map, chunk, total))
+                if not pending:
+                    break
+
+                finished, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    result = future.result()
+                    results[result.chunk.index] = result
+                    # Drop the chunk text once analysed to keep memory bounded
+                    result.chunk.text = ''
+                    done += 1
+                    if progress:
+                        progress(done, total, result)
+
+        findings = [
+            f"[Part {r.chunk.index + 1}/{total} - {r.chunk.source} lines {r.chunk.start_line}-{r.chunk.end_line}, "
+            f"{r.chunk.time_range}]\n{r.findings}"
+            for r in results if r.error is None
+        ]
+        if not findings:
+            raise ValueError("All log chunks failed to analyse")
+
+        reduce_start = time.perf_counter()
+        report = self._reduce(findings)
+        now = time.perf_counter()
+
+        return LogAnalysisReport(report, results, now - reduce_start, now - started)
+
+
+def main():
+    import argparse
+
+    from dotenv import load_dotenv
+    from ibm_watsonx_ai import Credentials
+    from ibm_watsonx_ai.foundation_models import ModelInference
+    from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
+
+    parser = argparse.ArgumentParser(description="Map-reduce analysis of large log files with watsonx.ai")
+    parser.add_argument('paths', nargs='+', help="Log files to analyse")
+    parser.add_argument('--model', default='mistralai/mistral-small-3-1-24b-instruct-2503')
+    parser.add_argument('--chunk-chars', type=int, default=12000)
+    parser.add_argument('--chunk-seconds', type=float, default=None)
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    load_dotenv()
+    model = ModelInference(
+        model_id=args.model,
+        params={GenParams.MAX_NEW_TOKENS: 2000, GenParams.TEMPERATURE: 0.2},
+        credentials=Credentials(
+            url=os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com"),
+            api_key=os.getenv("WATSONX_API_KEY")
+        ),
+        project_id=os.getenv("WATSONX_PROJECT_ID")
+    )
+
+    def show_progress(done, total, result):
+        status = 'failed: ' + result.error if result.error else 'ok'
+        print(f"[{done}/{total}] {result.chunk.source} lines {result.chunk.start_line}-{result.chunk.end_line} "
+              f"{result.latency:.1f}s {status}")
+
+    pipeline = LogAnalysisPipeline(
+        lambda prompt: model.generate_text(prompt=prompt),
+        max_workers=args.workers,
+        max_chars=args.chunk_chars,
+        max_seconds=args.chunk_seconds
+    )
+    analysis = pipeline.run(args.paths, progress=show_progress)
+
+    print()
+    print(analysis.report)
+    print()
+    print(json.dumps(analysis.stats(), indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,317 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Log Correlation Module
+Merges several service logs by timestamp, reconstructs per-request traces
+across services and extracts cascading-failure chains, so the model gets
+the correlation pre-computed instead of doing it itself
+
+Usage:
+    python log_correlation.py api-gateway.log billing-service.log database.log
+"""
+
+import heapq
+import os
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional
+
+from log_preprocess import LEVEL_RANK, LogRecord, mask_message, parse_line
+
+
+CORRELATION_PROMPT = """The following request traces were reconstructed from several service logs: lines were merged
+by timestamp and grouped by request ID. Cascading-failure chains list, per failing request, the services in the order
+in which they reported warnings or errors; the first service in a chain is where the failure surfaced first.
+Analyse them and write an incident report with these sections:
+1. Executive summary
+2. Timeline of events (chronological table with time, service and event)
+3. Root cause (which service failed first and how the failure propagated)
+4. Impact assessment (affected requests and services)
+5. Recommended fixes and debugging steps
+
+{traces}"""
+
+WARN_RANK = LEVEL_RANK['WARN']
+
+
+def iter_records(path: str, service: Optional[str] = None) -> Iterator[LogRecord]:
+    """
+    Stream parsed records from a log file
+
+    Lines without a timestamp (stack traces, continuation lines) inherit the
+    timestamp of the previous line so the stream stays ordered for merging.
+
+    Args:
+        path: Log file path
+        service: Service name for lines without one (default: file name without extension)
+
+    Yields:
+        LogRecord per non-blank line
+    """
+    name = os.path.basename(path)
+    if service is None:
+        service = os.path.splitext(name)[0]
+
+    last_timestamp = None
+    with open(path, encoding='utf-8', errors='replace') as f:
+        for line_no, line in enumerate(f, 1):
+            record = parse_line(line, default_service=service, source=name, line_no=line_no)
+            if record is None:
+                continue
+            if record.timestamp is None:
+                record.timestamp = last_timestamp
+            else:
+                last_timestamp = record.timestamp
+            yield record
+
+
+def merge_log_files(paths: List[str]) -> Iterator[LogRecord]:
+    """
+    K-way merge of several log files by timestamp
+
+    Each file is read lazily, so only one pending record per file is held in
+    memory. Files are assumed to be in time order individually; records with
+    equal timestamps keep the order of the files and lines.
+
+    Args:
+        paths: Log file paths
+
+    Yields:
+        LogRecord in global timestamp order
+    """
+    def keyed(file_index: int, path: str):
+        for record in iter_records(path):
+            yield (record.timestamp or datetime.min, file_index, record.line_no), record
+
+    streams = [keyed(i, path) for i, path in enumerate(paths)]
+    for _, record in heapq.merge(*streams, key=lambda item: item[0]):
+        yield record
+
+
+class RequestTrace:
+    """Events of one request across all services, in timestamp order"""
+    __slots__ = ('request_id', 'events', 'services', 'dropped_events', 'first_seen', 'last_seen')
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.events: List[LogRecord] = []
+        self.services: List[str] = []
+        self.dropped_events = 0
+        self.first_seen: Optional[datetime] = None
+        self.last_seen: Optional[datetime] = None
+
+    def add(self, record: LogRecord, max_events: int):
+        if record.service not in self.services:
+            self.services.append(record.service)
+        if record.timestamp:
+            if self.first_seen is None:
+                self.first_seen = record.timestamp
+            self.last_seen = record.timestamp
+
+        if len(self.events) < max_events or LEVEL_RANK.get(record.level, 2) >= WARN_RANK:
+            self.events.append(record)
+        else:
+            # Keep warnings and errors of very long traces, drop routine lines
+            self.dropped_events += 1
+
+    @property
+    def failed(self) -> bool:
+        return any(LEVEL_RANK.get(e.level, 2) >= WARN_RANK for e in self.events)
+
+    def failure_chain(self) -> List[LogRecord]:
+        """First warning or error of each service, in the order the services reported them"""
+        chain, seen = [], set()
+        for event in self.events:
+            if LEVEL_RANK.get(event.level, 2) >= WARN_RANK and event.service not in seen:
+                seen.add(event.service)
+                chain.append(event)
+        return chain
+
+    @property
+    def duration(self) -> Optional[float]:
+        if self.first_seen and self.last_seen:
+            return (self.last_seen - self.first_seen).total_seconds()
+        return None
+
+
+class CascadeChain:
+    """Failing requests that share the same propagation path"""
+    __slots__ = ('services', 'origin_template', 'origin_example', 'request_ids', 'first_seen', 'last_seen')
+
+    def __init__(self, services: tuple, origin_template: str, origin_example: str):
+        self.services = services
+        self.origin_template = origin_template
+        self.origin_example = origin_example
+        self.request_ids: List[str] = []
+        self.first_seen: Optional[datetime] = None
+        self.last_seen: Optional[datetime] = None
+
+    @property
+    def origin(self) -> str:
+        return self.services[0] if self.services else '-'
+
+
+class CorrelationIndex:
+    """
+    Request-ID index over a merged stream of log records
+
+    Records without a request ID are counted per service; only their
+    warnings and errors are kept, grouped by template. Traces keep at most
+    `max_events_per_trace` routine events plus all warnings and errors.
+    """
+
+    def __init__(self, max_events_per_trace: int = 50):
+        """
+        Initialize correlation index
+
+        Args:
+            max_events_per_trace: Maximum number of routine events kept per request
+        """
+        self.max_events_per_trace = max_events_per_trace
+        self.traces: Dict[str, RequestTrace] = {}
+        self.uncorrelated: Dict[str, int] = {}
+        self.uncorrelated_alerts: Dict[tuple, list] = {}
+        self.records = 0
+
+    def add(self, record: LogRecord):
+        """Add a record from the merged stream"""
+        self.records += 1
+        if not record.request_id:
+            self.uncorrelated[record.service] = self.uncorrelated.get(record.service, 0) + 1
+            if LEVEL_RANK.get(record.level, 2) >= WARN_RANK:
+                # Service-wide alerts (e.g. pool exhaustion) are often the real root cause
+                key = (record.service, record.level, mask_message(record.message))
+                alert = self.uncorrelated_alerts.get(key)
+                if alert is None:
+                    self.uncorrelated_alerts[key] = [1, record.timestamp, record]
+                else:
+                    alert[0] += 1
+            return
+        trace = self.traces.get(record.request_id)
+        if trace is None:
+            trace = self.traces[record.request_id] = RequestTrace(record.request_id)
+        trace.add(record, self.max_events_per_trace)
+
+    def add_files(self, paths: List[str]) -> 'CorrelationIndex':
+        """Merge log files by timestamp and index them"""
+        for record in merge_log_files(paths):
+            self.add(record)
+        return self
+
+    def failed_traces(self) -> List[RequestTrace]:
+        """Failing requests, those spanning the most services first"""
+        failed = [t for t in self.traces.values() if t.failed]
+        failed.sort(key=lambda t: (-len(t.services), t.first_seen or datetime.max))
+        return failed
+
+    def cascades(self) -> List[CascadeChain]:
+        """
+        Group failing requests by their cascading-failure chain
+
+        Returns:
+            Chains ordered by the number of affected requests, then by the
+            number of services involved
+        """
+        chains: Dict[tuple, CascadeChain] = {}
+        for trace in self.traces.values():
+            events = trace.failure_chain()
+            if not events:
+                continue
+            origin = events[0]
+            key = (tuple(e.service for e in events), mask_message(origin.message))
+            chain = chains.get(key)
+            if chain is None:
+                chain = chains[key] = CascadeChain(key[0], key[1], origin.message)
+            chain.request_ids.append(trace.request_id)
+            if origin.timestamp:
+                if chain.first_seen is None or origin.timestamp < chain.first_seen:
+                    chain.first_seen = origin.timestamp
+                if chain.last_seen is None or origin.timestamp > chain.last_seen:
+                    chain.last_seen = origin.timestamp
+
+        return sorted(chains.values(), key=lambda c: (-len(c.request_ids), -len(c.services)))
+
+    def summary(self, max_chains: int = 10, max_traces: int = 5, max_events: int = 15) -> str:
+        """
+        Text summary of cascades and example traces for the model
+
+        Args:
+            max_chains: Maximum number of cascade chains listed
+            max_traces: Maximum number of full request traces listed
+            max_events: Maximum number of events shown per trace
+
+        Returns:
+            Summary text
+        """
+        failed = self.failed_traces()
+        lines = [
+            "CORRELATED REQUEST TRACES (pre-processed: log files merged by timestamp and grouped by request ID)",
+            f"{self.records} records, {len(self.traces)} requests, {len(failed)} with warnings or errors"
+        ]
+        if self.uncorrelated:
+            counts = ', '.join(f"{service or '-'}={count}" for service, count in sorted(self.uncorrelated.items()))
+            lines.append(f"Lines without request ID: {counts}")
+
+        if self.uncorrelated_alerts:
+            lines.append("")
+            lines.append("Warnings and errors without request ID (count, first seen, service, level, example):")
+            alerts = sorted(self.uncorrelated_alerts.values(), key=lambda a: a[1] or datetime.max)
+            for count, first_seen, record in alerts[:max_chains]:
+                time_text = f"{first_seen:%H:%M:%S}" if first_seen else '--:--:--'
+                lines.append(f"- x{count} {time_text} {record.service or '-'} {record.level}: {record.message}")
+            if len(alerts) > max_chains:
+                lines.append(f"(+{len(alerts) - max_chains} more)")
+
+        chains = self.cascades()
+        if chains:
+            lines.append("")
+            lines.append("Cascading-failure chains (services in the order they reported warnings or errors):")
+            for chain in chains[:max_chains]:
+                window = ''
+                if chain.first_seen:
+                    window = f" [{chain.first_seen:%H:%M:%S} - {chain.last_seen:%H:%M:%S}]"
+                examples = ', '.join(chain.request_ids[:3])
+                lines.append(
+                    f"- {' -> '.join(s or '-' for s in chain.services)}: {len(chain.request_ids)} requests{window}, "
+                    f"origin: {chain.origin_example} (e.g. {examples})"
+                )
+            if len(chains) > max_chains:
+                lines.append(f"(+{len(chains) - max_chains} more chains)")
+
+        for trace in failed[:max_traces]:
+            lines.append("")
+            duration = f", {trace.duration:.1f}s" if trace.duration is not None else ''
+            lines.append(f"Trace {trace.request_id} ({' -> '.join(s or '-' for s in trace.services)}{duration}):")
+            for event in trace.events[:max_events]:
+                time_text = f"{event.timestamp:%H:%M:%S}" if event.timestamp else '--:--:--'
+                lines.append(f"  {time_text} {event.service or '-'} {event.level}: {event.message}")
+            hidden = len(trace.events) - min(len(trace.events), max_events) + trace.dropped_events
+            if hidden:
+                lines.append(f"  (+{hidden} more events)")
+        if len(failed) > max_traces:
+            lines.append("")
+            lines.append(f"(+{len(failed) - max_traces} more failing requests)")
+
+        return "\n".join(lines)
+
+
+def correlate_files(paths: List[str]) -> CorrelationIndex:
+    """Merge and index log files"""
+    return CorrelationIndex().add_files(paths)
+
+
+def main():
+    import sys
+
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python log_correlation.py <log file> [more log files ...]")
+        sys.exit(1)
+
+    print(correlate_files(paths).summary())
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,390 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Log Pre-processing Module
+Parses syslog and JSON log lines, mines message templates and builds a compact
+digest so the model receives counts and examples instead of thousands of
+repeated lines
+
+Usage:
+    python log_preprocess.py customer-portal.log [more.log ...]
+"""
+
+import json
+import os
+import re
+from datetime import datetime
+from typing import Dict, Iterable, List, Optional
+
+from log_analysis import parse_timestamp
+
+
+LEVELS = ('TRACE', 'DEBUG', 'INFO', 'NOTICE', 'WARN', 'WARNING', 'ERROR', 'CRITICAL', 'FATAL')
+LEVEL_RANK = {
+    'TRACE': 0, 'DEBUG': 1, 'INFO': 2, 'NOTICE': 2, 'WARN': 3, 'WARNING': 3,
+    'ERROR': 4, 'CRITICAL': 5, 'FATAL': 5
+}
+
+LEVEL_PATTERN = re.compile(r'\b(' + '|'.join(LEVELS) + r')\b:?')
+SERVICE_PATTERN = re.compile(r'^\s*\[([\w.\-]+)\]|^\s*([\w.\-]+)(?:\[\d+\])?:')
+# Standalone IDs like "req-12345"; key names such as "request_id" are not IDs themselves
+REQUEST_ID_PATTERN = re.compile(r'\b(?!(?:request|req|trace)_?id\b)((?:req|request|trace|txn)[-_][0-9A-Za-z\-]+)\b')
+# The value after a key: request_id=abc-1, "request_id": "abc-1", trace_id: abc-1
+REQUEST_ID_KV_PATTERN = re.compile(
+    r'"?\b(request_id|requestId|req_id|trace_id|correlation_id)"?\s*([=:])\s*"?([\w\-]+)"?'
+)
+
+# Classic syslog prefix: "Jan 15 10:15:23 host service[123]: message"
+SYSLOG_PATTERN = re.compile(
+    r'^(?P<ts>[A-Z][a-z]{2}\s+\d{1,2}\s\d{2}:\d{2}:\d{2})\s+(?P<host>\S+)\s+(?P<service>[\w.\-/]+)(?:\[\d+\])?:\s*(?P<msg>.*)$'
+)
+# ISO prefix: "[2024-01-15 10:15:23] ..." or "2024-01-15T10:15:23.123Z ..."
+ISO_PREFIX_PATTERN = re.compile(
+    r'^\[?\d{4}-\d{2}-\d{2}[ T]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?\]?\s*'
+)
+
+# Variable parts replaced by placeholders when mining templates, most specific first
+MASKS = (
+    (re.compile(r'\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b'), '<uuid>'),
+    (REQUEST_ID_KV_PATTERN, r'\1\2<req>'),
+    (REQUEST_ID_PATTERN, '<req>'),
+    (re.compile(r'\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b'), '<ip>'),
+    (re.compile(r'"[^"]*"|\'[^\']*\''), '<str>'),
+    (re.compile(r'\b0x[0-9a-fA-F]+\b|\b[0-9a-fA-F]{12,}\b'), '<hex>'),
+    (re.compile(r'\b\d+(?:\.\d+)?(?:ms|s|m|h|%|MB|KB|GB)?\b'), '<num>'),
+)
+
+DIGEST_PROMPT = """The following digest was pre-processed from system logs: repeated lines are grouped into
+message templates with occurrence counts and first/last timestamps, followed by the requests that hit warnings or errors.
+Analyse it and write an incident report with these sections:
+1. Executive summary
+2. Timeline of events (chronological table with time, service and event)
+3. Root cause
+4. Impact assessment
+5. Recommended fixes and debugging steps
+
+{digest}"""
+
+JSON_LEVEL_KEYS = ('level', 'severity', 'lvl', 'log_level')
+JSON_SERVICE_KEYS = ('service', 'service_name', 'logger', 'component', 'app')
+JSON_REQUEST_KEYS = ('request_id', 'requestId', 'req_id', 'trace_id', 'correlation_id')
+JSON_MESSAGE_KEYS = ('message', 'msg', 'event', 'error')
+
+
+class LogRecord:
+    """A parsed log line"""
+    __slots__ = ('timestamp', 'level', 'service', 'request_id', 'message', 'source', 'line_no')
+
+    def __init__(self, timestamp: Optional[datetime], level: str, service: str,
+                 request_id: str, message: str, source: str = '', line_no: int = 0):
+        self.timestamp = timestamp
+        self.level = level
+        self.service = service
+        self.request_id = request_id
+        self.message = message
+        self.source = source
+        self.line_no = line_no
+
+
+def _first(record: dict, keys: Iterable[str]) -> str:
+    for key in keys:
+        value = record.get(key)
+        if value not in (None, ''):
+            return str(value)
+    return ''
+
+
+def parse_line(line: str, default_service: str = '', source: str = '', line_no: int = 0) -> Optional[LogRecord]:
+    """
+    Parse a syslog or JSON log line
+
+    Args:
+        line: Raw log line
+        default_service: Service name used when the line does not carry one
+        source: File name the line came from
+        line_no: Line number in the file
+
+    Returns:
+        LogRecord, or None for blank lines
+    """
+    line = line.rstrip('\n')
+    if not line.strip():
+        return None
+
+    stripped = line.strip()
+    if stripped.startswith('{'):
+        try:
+            record = json.loads(stripped)
+        except ValueError:
+            record = None
+        if isinstance(record, dict):
+            message = _first(record, JSON_MESSAGE_KEYS) or stripped
+            return LogRecord(
+                timestamp=parse_timestamp(stripped),
+                level=_first(record, JSON_LEVEL_KEYS).upper() or 'INFO',
+                service=_first(record, JSON_SERVICE_KEYS) or default_service,
+                request_id=_first(record, JSON_REQUEST_KEYS) or _find_request_id(message),
+                message=message,
+                source=source,
+                line_no=line_no
+            )
+
+    service = default_service
+    timestamp = None
+    match = SYSLOG_PATTERN.match(stripped)
+    if match:
+        try:
+            timestamp = datetime.strptime(f"{datetime.now().year} {match.group('ts')}", '%Y %b %d %H:%M:%S')
+        except ValueError:
+            timestamp = None
+        service = match.group('service')
+        rest = match.group('msg')
+    else:
+        timestamp = parse_timestamp(stripped)
+        rest = ISO_PREFIX_PATTERN.sub('', stripped, count=1)
+
+    level = 'INFO'
+    level_match = LEVEL_PATTERN.search(rest[:40])
+    if level_match:
+        level = level_match.group(1)
+        rest = (rest[:level_match.start()] + rest[level_match.end():]).strip()
+
+    service_match = SERVICE_PATTERN.match(rest)
+    if service_match and not match:
+        service = service_match.group(1) or service_match.group(2)
+        rest = rest[service_match.end():].strip()
+
+    return LogRecord(timestamp, level, service, _find_request_id(rest), rest.strip(' -:'), source, line_no)
+
+
+def _find_request_id(message: str) -> str:
+    match = REQUEST_ID_KV_PATTERN.search(message) or REQUEST_ID_PATTERN.search(message)
+    if match is None:
+        return ''
+    return match.group(3) if match.re is REQUEST_ID_KV_PATTERN else match.group(1)
+
+
+def mask_message(message: str) -> str:
+    """Replace variable parts of a message with placeholders"""
+    for pattern, placeholder in MASKS:
+        message = pattern.sub(placeholder, message)
+    return ' '.join(message.split())
+
+
+class LogTemplate:
+    """A message template with occurrence statistics"""
+    __slots__ = ('template_id', 'level', 'service', 'pattern', 'count', 'first_seen', 'last_seen', 'example')
+
+    def __init__(self, template_id: int, level: str, service: str, pattern: str, example: str):
+        self.template_id = template_id
+        self.level = level
+        self.service = service
+        self.pattern = pattern
+        self.count = 0
+        self.first_seen: Optional[datetime] = None
+        self.last_seen: Optional[datetime] = None
+        self.example = example
+
+    def add(self, timestamp: Optional[datetime]):
+        self.count += 1
+        if timestamp:
+            if self.first_seen is None or timestamp < self.first_seen:
+                self.first_seen = timestamp
+            if self.last_seen is None or timestamp > self.last_seen:
+                self.last_seen = timestamp
+
+
+class LogIndex:
+    """
+    Template and request index built from one or more log files
+
+    Each line is parsed once; only templates, counters and per-request
+    template references are kept, not the raw lines.
+    """
+
+    def __init__(self):
+        self.templates: Dict[tuple, LogTemplate] = {}
+        self.by_request: Dict[str, List[tuple]] = {}
+        self.by_service: Dict[str, Dict[str, int]] = {}
+        self.lines = 0
+        self.raw_chars = 0
+        self.first_seen: Optional[datetime] = None
+        self.last_seen: Optional[datetime] = None
+
+    def add_record(self, record: LogRecord):
+        """Add a parsed record to the index"""
+        key = (record.level, record.service, mask_message(record.message))
+        template = self.templates.get(key)
+        if template is None:
+            template = LogTemplate(len(self.templates) + 1, record.level, record.service, key[2], record.message)
+            self.templates[key] = template
+        template.add(record.timestamp)
+
+        counts = self.by_service.setdefault(record.service or '-', {})
+        counts[record.level] = counts.get(record.level, 0) + 1
+
+        if record.request_id:
+            self.by_request.setdefault(record.request_id, []).append(
+                (record.timestamp, record.service, record.level, template.template_id)
+            )
+
+        if record.timestamp:
+            if self.first_seen is None or record.timestamp < self.first_seen:
+                self.first_seen = record.timestamp
+            if self.last_seen is None or record.timestamp > self.last_seen:
+                self.last_seen = record.timestamp
+
+    def add_lines(self, lines: Iterable[str], service: str = '', source: str = ''):
+        """Parse and index raw log lines"""
+        for line_no, line in enumerate(lines, 1):
+            self.lines += 1
+            self.raw_chars += len(line)
+            record = parse_line(line, default_service=service, source=source, line_no=line_no)
+            if record is not None:
+                self.add_record(record)
+
+    def add_file(self, path: str, service: Optional[str] = None):
+        """
+        Stream a log file into the index
+
+        Args:
+            path: Log file path
+            service: Service name for lines without one (default: file name without extension)
+        """
+        name = os.path.basename(path)
+        with open(path, encoding='utf-8', errors='replace') as f:
+            self.add_lines(f, service=service if service is not None else os.path.splitext(name)[0], source=name)
+
+    def digest(self, min_level: str = 'INFO', max_templates: int = 60, max_requests: int = 20) -> str:
+        """
+        Compact text digest for the model
+
+        Args:
+            min_level: Templates below this level are only summarised as counts
+            max_templates: Maximum number of templates listed
+            max_requests: Maximum number of failing request IDs listed
+
+        Returns:
+            Digest text
+        """
+        threshold = LEVEL_RANK.get(min_level.upper(), 2)
+        templates = sorted(
+            self.templates.values(),
+            key=lambda t: (-LEVEL_RANK.get(t.level, 2), t.first_seen or datetime.max, -t.count)
+        )
+        shown = [t for t in templates if LEVEL_RANK.get(t.level, 2) >= threshold][:max_templates]
+        hidden = sum(t.count for t in templates if t not in shown)
+
+        lines = ["LOG DIGEST (pre-processed: repeated lines are grouped into templates with counts)"]
+        time_range = ''
+        if self.first_seen:
+            time_range = f", {self.first_seen:%Y-%m-%d %H:%M:%S} to {self.last_seen:%Y-%m-%d %H:%M:%S}"
+        lines.append(f"{self.lines} lines, {len(self.templates)} distinct templates{time_range}")
+
+        lines.append("")
+        lines.append("Per service level counts:")
+        for service, counts in sorted(self.by_service.items()):
+            summary = ', '.join(f"{level}={count}" for level, count in sorted(counts.items(), key=lambda i: -LEVEL_RANK.get(i[0], 2)))
+            lines.append(f"- {service}: {summary}")
+
+        lines.append("")
+        lines.append("Templates (count, first - last seen, level, service, example):")
+        for t in shown:
+            seen = ''
+            if t.first_seen:
+                seen = f"{t.first_seen:%H:%M:%S}" if t.first_seen == t.last_seen else f"{t.first_seen:%H:%M:%S} - {t.last_seen:%H:%M:%S}"
+            lines.append(f"#{t.template_id} x{t.count} [{seen}] {t.level} {t.service or '-'}: {t.example}")
+        if hidden:
+            lines.append(f"(+{hidden} lines in {len(templates) - len(shown)} lower-priority templates omitted)")
+
+        failing = [
+            (request_id, events) for request_id, events in self.by_request.items()
+            if any(LEVEL_RANK.get(level, 2) >= LEVEL_RANK['WARN'] for _, _, level, _ in events)
+        ]
+        # Requests that cross several services tell the most about cascading failures
+        failing.sort(key=lambda item: (-len({service for _, service, _, _ in item[1]}), -len(item[1])))
+        if failing:
+            lines.append("")
+            lines.append("Requests with warnings or errors (request ID: service/level/template in order):")
+            for request_id, events in failing[:max_requests]:
+                path = ' -> '.join(f"{service or '-'}/{level}/#{template_id}" for _, service, level, template_id in events)
+                lines.append(f"- {request_id}: {path}")
+            if len(failing) > max_requests:
+                lines.append(f"(+{len(failing) - max_requests} more failing requests)")
+
+        return "\n".join(lines)
+
+
+def build_digest(paths: List[str], min_level: str = 'INFO') -> str:
+    """Index log files and return their digest"""
+    index = LogIndex()
+    for path in paths:
+        index.add_file(path)
+    return index.digest(min_level=min_level)
+
+
+def compact_pasted_logs(text: str, min_lines: int = 20, min_level: str = 'INFO') -> str:
+    """
+    Replace long runs of pasted log lines in a prompt with their digest
+
+    Lines that carry a timestamp or are JSON objects count as log lines; runs
+    shorter than min_lines are left untouched, as is all other prompt text.
+
+    Args:
+        text: Prompt text
+        min_lines: Minimum run length that is compacted
+        min_level: Minimum level of templates listed in the digest
+
+    Returns:
+        Prompt text with log runs replaced by digests
+    """
+    output: List[str] = []
+    run: List[str] = []
+
+    def flush():
+        if len(run) >= min_lines:
+            index = LogIndex()
+            index.add_lines(run)
+            output.append(index.digest(min_level=min_level))
+        else:
+            output.extend(run)
+        run.clear()
+
+    for line in text.split('\n'):
+        stripped = line.strip()
+        if stripped and (stripped.startswith('{') or parse_timestamp(stripped) or SYSLOG_PATTERN.match(stripped)):
+            run.append(line)
+        elif run and stripped and line[:1].isspace():
+            # Continuation lines such as stack traces belong to the previous entry
+            run.append(line)
+        else:
+            flush()
+            output.append(line)
+    flush()
+
+    return '\n'.join(output)
+
+
+def main():
+    import sys
+
+    paths = sys.argv[1:]
+    if not paths:
+        print("Usage: python log_preprocess.py <log file> [more log files ...]")
+        sys.exit(1)
+
+    index = LogIndex()
+    for path in paths:
+        index.add_file(path)
+    digest = index.digest()
+    print(digest)
+    print()
+    print(f"Compression: {index.raw_chars} -> {len(digest)} chars "
+          f"({index.raw_chars / max(len(digest), 1):.1f}x)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,249 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Message Store Module
+Bounded, compact chat history for Streamlit sessions
+"""
+
+import hashlib
+import json
+import os
+import tempfile
+import threading
+import uuid
+import weakref
+from typing import Iterator, List, Optional, Union
+
+
+class StoredDocument:
+    """Source document shared by all messages that cite it"""
+
+    __slots__ = ('key', 'page_content', 'metadata', '__weakref__')
+
+    def __init__(self, key: str, page_content: str, metadata: dict):
+        self.key = key
+        self.page_content = page_content
+        self.metadata = metadata
+
+    def to_dict(self) -> dict:
+        return {'page_content': self.page_content, 'metadata': self.metadata}
+
+
+# Process-wide intern table; a document disappears once no message refers to it
+_documents: "weakref.WeakValueDictionary[str, StoredDocument]" = weakref.WeakValueDictionary()
+_documents_lock = threading.Lock()
+
+
+def intern_document(page_content: str, metadata: Optional[dict] = None) -> StoredDocument:
+    """
+    Return the shared StoredDocument for a document's content
+
+    Identical documents returned for different questions or sessions are
+    stored once.
+    """
+    metadata = metadata or {}
+    key = hashlib.sha256(
+        json.dumps([page_content, metadata], sort_keys=True, default=str).encode()
+    ).hexdigest()
+    with _documents_lock:
+        document = _documents.get(key)
+        if document is None:
+            document = StoredDocument(key, page_content, metadata)
+            _documents[key] = document
+        return document
+
+
+def interned_documents() -> int:
+    """Number of distinct source documents currently held in memory"""
+    with _documents_lock:
+        return len(_documents)
+
+
+class ChatRecord:
+    """
+    Compact chat message
+
+    Supports attribute access like RAGMessage (msg.text, msg.documents) and
+    the dict access of plain chat messages (message['content'],
+    message.get('metrics')), so it can be used by both display paths and by
+    ConversationHistory.sync.
+    """
+
+    __slots__ = ('id', 'role', 'content', 'model_content', 'documents', 'show_documents',
+                 'log_id', 'rating_options', 'metrics', 'error')
+
+    def __init__(self, role: str, content: str, id: Optional[str] = None, model_content: Optional[str] = None,
+                 documents: Optional[List[StoredDocument]] = None, show_documents: bool = False,
+                 log_id: str = '', rating_options: int = 5, metrics: Optional[dict] = None,
+                 error: bool = False):
+        self.id = id or str(uuid.uuid4())
+        self.role = role
+        self.content = content
+        self.model_content = model_content
+        self.documents = tuple(documents or ())
+        self.show_documents = show_documents
+        self.log_id = log_id
+        self.rating_options = rating_options
+        self.metrics = metrics or None
+        self.error = error
+
+    @property
+    def text(self) -> str:
+        return self.content
+
+    def __getitem__(self, key: str):
+        if key not in self.__slots__:
+            raise KeyError(key)
+        value = getattr(self, key)
+        if value is None:
+            raise KeyError(key)
+        return value
+
+    def get(self, key: str, default=None):
+        try:
+            return self[key]
+        except KeyError:
+            return default
+
+    @classmethod
+    def from_message(cls, message) -> "ChatRecord":
+        """Convert a chat message dict or a RAGMessage into a ChatRecord"""
+        if isinstance(message, ChatRecord):
+            return message
+        if not isinstance(message, dict):
+            # pydantic RAGMessage
+            message = message.model_dump()
+            message['content'] = message.pop('text')
+        documents = [
+            doc if isinstance(doc, StoredDocument)
+            else intern_document(doc.get('page_content', ''), doc.get('metadata', {}))
+            for doc in message.get('documents') or []
+        ]
+        return cls(
+            role=message['role'],
+            content=message['content'],
+            id=message.get('id'),
+            model_content=message.get('model_content'),
+            documents=documents,
+            show_documents=message.get('show_documents', False),
+            log_id=message.get('log_id', ''),
+            rating_options=message.get('rating_options', 5),
+            metrics=message.get('metrics'),
+            error=message.get('error', False)
+        )
+
+    def to_dict(self) -> dict:
+        data = {slot: getattr(self, slot) for slot in self.__slots__ if slot != 'documents'}
+        data['documents'] = [doc.to_dict() for doc in self.documents]
+        return data
+
+
+class MessageStore:
+    """
+    Chat history of one session with a bounded number of messages in memory
+
+    Messages beyond max_in_memory are appended to a JSON-lines spill file
+    and dropped from memory. len() and indexing cover the whole history;
+    reading spilled messages loads them from disk. The spill file is
+    deleted when the store is cleared or garbage collected.
+    """
+
+    def __init__(self, max_in_memory: int = 200, spill_dir: Optional[str] = None):
+        """
+        Initialize message store
+
+        Args:
+            max_in_memory: Maximum number of messages kept in memory
+            spill_dir: Directory for spill files (default: system temp directory)
+        """
+        self.max_in_memory = max(1, max_in_memory)
+        self.spill_dir = spill_dir or tempfile.gettempdir()
+        self._messages: List[ChatRecord] = []
+        self._spilled = 0
+        self._spill_path = None
+        self._finalizer = None
+
+    def append(self, message: Union[dict, ChatRecord, object]) -> ChatRecord:
+        """Add a message (dict, RAGMessage or ChatRecord) and return its record"""
+        record = ChatRecord.from_message(message)
+        self._messages.append(record)
+        if len(self._messages) > self.max_in_memory:
+            self._spill(len(self._messages) - self.max_in_memory)
+        return record
+
+    def _spill(self, count: int):
+        if self._spill_path is None:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            self._spill_path = os.path.join(self.spill_dir, f"chat-{uuid.uuid4().hex}.jsonl")
+            self._finalizer = weakref.finalize(self, _remove_file, self._spill_path)
+        with open(self._spill_path, 'a', encoding='utf-8') as f:
+            for record in self._messages[:count]:
+                f.write(json.dumps(record.to_dict(), default=str) + '\n')
+        del self._messages[:count]
+        self._spilled += count
+
+    def _read_spilled(self, start: int, stop: int) -> List[ChatRecord]:
+        records = []
+        if self._spill_path is None or start >= stop:
+            return records
+        with open(self._spill_path, encoding='utf-8') as f:
+            for index, line in enumerate(f):
+                if index >= stop:
+                    break
+                if index >= start:
+                    records.append(ChatRecord.from_message(json.loads(line)))
+        return records
+
+    def __len__(self) -> int:
+        return self._spilled + len(self._messages)
+
+    def __iter__(self) -> Iterator[ChatRecord]:
+        """Iterate over the whole history, spilled messages included"""
+        yield from self._read_spilled(0, self._spilled)
+        yield from self._messages
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            start, stop, step = index.indices(len(self))
+            if step != 1:
+                return list(self)[index]
+            records = self._read_spilled(start, min(stop, self._spilled))
+            records.extend(self._messages[max(start - self._spilled, 0):max(stop - self._spilled, 0)])
+            return records
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('message index out of range')
+        if index >= self._spilled:
+            return self._messages[index - self._spilled]
+        return self._read_spilled(index, index + 1)[0]
+
+    def recent(self, count: int) -> List[ChatRecord]:
+        """The last `count` messages, for windowed rendering"""
+        return self[max(len(self) - count, 0):]
+
+    def clear(self):
+        self._messages = []
+        self._spilled = 0
+        if self._finalizer is not None:
+            self._finalizer()
+        self._spill_path = None
+        self._finalizer = None
+
+    def stats(self) -> dict:
+        return {
+            'messages': len(self),
+            'in_memory': len(self._messages),
+            'spilled': self._spilled,
+            'interned_documents': interned_documents()
+        }
+
+
+def _remove_file(path: str):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
@@ -0,0 +1,133 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Model Client Registry Module
+LRU/TTL cache of initialised watsonx.ai inference clients
+"""
+
+import hashlib
+import json
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Optional, Tuple
+
+
+def client_key(model_id: str, params: dict, project_id: str, url: str, apikey: str = '') -> tuple:
+    """
+    Build the registry key for an inference client
+
+    Args:
+        model_id: Foundation model ID
+        params: Generation parameters
+        project_id: watsonx.ai project ID
+        url: watsonx.ai URL
+        apikey: API key the client authenticates with (only its hash is kept)
+
+    Returns:
+        Hashable key tuple
+    """
+    params_key = json.dumps(params or {}, sort_keys=True, default=str)
+    apikey_hash = hashlib.sha256(apikey.encode()).hexdigest()[:16] if apikey else ''
+    return (model_id, params_key, project_id, url, apikey_hash)
+
+
+class ModelClientRegistry:
+    """
+    Thread-safe registry of reusable inference clients
+
+    Clients are evicted when they have not been used for `ttl` seconds or when
+    more than `max_size` clients are cached (least recently used first). The
+    time spent constructing clients is tracked so the setup time saved by
+    cache hits can be reported.
+    """
+
+    def __init__(self, max_size: int = 16, ttl: float = 1800):
+        """
+        Initialize registry
+
+        Args:
+            max_size: Maximum number of cached clients
+            ttl: Seconds after which an unused client is evicted
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+        self._clients: "OrderedDict[tuple, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.setup_time_total = 0.0
+
+    def _evict_expired(self, now: float):
+        expired = [key for key, (_, last_used) in self._clients.items() if now - last_used > self.ttl]
+        for key in expired:
+            del self._clients[key]
+        self.evictions += len(expired)
+
+    def get(self, key: tuple, factory: Callable[[], Any]) -> Tuple[Any, Optional[float]]:
+        """
+        Return the cached client for a key, creating it on a miss
+
+        Args:
+            key: Key built with client_key()
+            factory: Callable that constructs the client
+
+        Returns:
+            Tuple of (client, setup_seconds); setup_seconds is None on a cache hit
+        """
+        now = time.time()
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._clients.get(key)
+            if entry is not None:
+                self._clients[key] = (entry[0], now)
+                self._clients.move_to_end(key)
+                self.hits += 1
+                return entry[0], None
+
+        # Construct outside the lock so slow client setup does not block other sessions
+        start = time.perf_counter()
+        client = factory()
+        setup_time = time.perf_counter() - start
+
+        with self._lock:
+            self.misses += 1
+            self.setup_time_total += setup_time
+            self._clients[key] = (client, time.time())
+            self._clients.move_to_end(key)
+            while len(self._clients) > self.max_size:
+                self._clients.popitem(last=False)
+                self.evictions += 1
+
+        return client, setup_time
+
+    def clear(self):
+        """Drop all cached clients"""
+        with self._lock:
+            self._clients.clear()
+
+    def stats(self) -> dict:
+        """
+        Registry statistics
+
+        Returns:
+            Dictionary with hits, misses, evictions, cached clients, average
+            setup time and the setup time saved per request
+        """
+        with self._lock:
+            requests_served = self.hits + self.misses
+            avg_setup = self.setup_time_total / self.misses if self.misses else 0.0
+            saved = avg_setup * self.hits
+            return {
+                'clients': len(self._clients),
+                'hits': self.hits,
+                'misses': self.misses,
+                'evictions': self.evictions,
+                'avg_setup_time': avg_setup,
+                'setup_time_saved': saved,
+                'saved_per_request': saved / requests_served if requests_served else 0.0
+            }
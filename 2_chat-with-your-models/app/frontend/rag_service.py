@@ -8,11 +8,65 @@ RAG Service Module
 Handles all interactions with watsonx.ai QnA RAG deployment endpoints
 """
 
+import asyncio
 import requests
+import threading
 import time
 import base64
-from typing import Tuple, List, Dict, Optional
+import contextvars
+from collections import OrderedDict
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from typing import Callable, Tuple, List, Dict, Optional
 from pydantic import BaseModel
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from deadline import current_deadline
+from endpoint_pool import EndpointPool, RAGEndpoint, parse_endpoints
+from token_provider import get_token_provider
+from response_cache import ResponseCache, resolve_log_id
+
+
+# Status codes worth retrying: rate limiting and transient server errors
+RETRY_STATUS_CODES = (429, 500, 502, 503, 504)
+
+
+class SafeRetry(Retry):
+    """
+    urllib3 retry policy that never resends a POST the server may have processed
+
+    A POST is only retried after a connect error (nothing was sent) or a
+    429/503 response with a Retry-After header (the server refused it).
+    Other failures are left to RAGService, which sees the deadline and can
+    fail over to another replica. Within a Deadline, retries stop once it has
+    passed and the wait before a retry is capped by the time left.
+    """
+
+    def is_exhausted(self) -> bool:
+        deadline = current_deadline()
+        if deadline is not None and deadline.expired():
+            return True
+        return super().is_exhausted()
+
+    def get_backoff_time(self) -> float:
+        return self._cap(super().get_backoff_time())
+
+    def get_retry_after(self, response):
+        retry_after = super().get_retry_after(response)
+        return None if retry_after is None else self._cap(retry_after)
+
+    @staticmethod
+    def _cap(seconds: float) -> float:
+        deadline = current_deadline()
+        return seconds if deadline is None else min(seconds, deadline.remaining())
+
+    def is_retry(self, method: str, status_code: int, has_retry_after: bool = False) -> bool:
+        if method.upper() == 'POST':
+            return bool(
+                self.total and self.respect_retry_after_header and has_retry_after
+                and status_code in (429, 503)
+            )
+        return super().is_retry(method, status_code, has_retry_after)
 
 
 class RAGDocument(BaseModel):
@@ -35,13 +89,21 @@ class RAGMessage(BaseModel):
 class RAGService:
     """Service class for interacting with watsonx.ai QnA RAG deployments"""
     
-    def __init__(self, config: dict):
+    def __init__(self, config: dict, response_cache: Optional[ResponseCache] = None, health_monitor=None):
         """
         Initialize RAG service with configuration
         
         Args:
             config: Dictionary containing:
                 - deployment_url: RAG deployment endpoint URL
+                - endpoints: Optional replicas of the deployment, as URLs, (url, weight)
+                  pairs, dicts or a "url|weight,url" string (default: deployment_url)
+                - balancing_policy: 'ewma' or 'least_outstanding' (default 'ewma')
+                - breaker_failures: Consecutive failures that eject a replica (default 3)
+                - breaker_cooldown: Seconds an ejected replica is skipped (default 30)
+                - hedge: Send a second question to another replica after the
+                  hedge_quantile latency (default True; needs two or more replicas)
+                - hedge_quantile: Latency quantile used as hedge delay (default 0.95)
                 - env_type: 'saas' or 'on-prem'
                 - iam_apikey: IAM API key (for SaaS)
                 - username: CPD username (for on-prem)
@@ -49,8 +111,30 @@ class RAGService:
                 - enable_expert: Enable expert recommendations
                 - is_expert_sample: Flag for sample expert profiles
                 - rating_options: Number of rating options (2-5)
+                - pool_connections: Number of per-host pools to keep (default 4)
+                - pool_maxsize: Max keep-alive connections per host (default 10)
+                - max_retries: Retries on connect errors, and on 429/503 with Retry-After
+                  when there is only one replica (default 3)
+                - backoff_factor: Exponential backoff factor in seconds (default 0.5)
+                - connect_timeout: TCP/TLS connect timeout in seconds (default 5)
+                - read_timeout: Response read timeout in seconds (default 120);
+                  both timeouts are capped by the remaining time of the current Deadline
+            response_cache: Optional shared ResponseCache for answers
+            health_monitor: Optional shared HealthMonitor that receives the outcome
+                and latency of every request as a passive health sample
         """
-        self.deployment_url = config.get('deployment_url', '')
+        self.endpoint_pool = EndpointPool(
+            parse_endpoints(config.get('endpoints') or [config.get('deployment_url', '')]),
+            policy=config.get('balancing_policy', 'ewma'),
+            failure_threshold=int(config.get('breaker_failures', 3)),
+            cooldown=float(config.get('breaker_cooldown', 30)),
+            hedge_quantile=float(config.get('hedge_quantile', 0.95))
+        )
+        self.hedge = bool(config.get('hedge', True))
+        # Feedback and expert lookups must reach the replica that logged the answer
+        self._log_endpoints: "OrderedDict[str, RAGEndpoint]" = OrderedDict()
+        self._log_endpoints_lock = threading.Lock()
+        self.deployment_url = config.get('deployment_url', '') or self.endpoint_pool.endpoints[0].url
         self.env_type = config.get('env_type', 'saas')
         self.iam_apikey = config.get('iam_apikey', '')
         self.username = config.get('username', '')
@@ -59,15 +143,103 @@ class RAGService:
         self.is_expert_sample = config.get('is_expert_sample', False)
         self.rating_options = config.get('rating_options', 5)
         
-        # Determine RAG version from URL
-        if "/ai_service?" in self.deployment_url:
-            self.version = "2.0"
-        else:
-            self.version = "1.x"
+        # RAG version of the primary deployment; each replica builds payloads for its own version
+        self.version = self.endpoint_pool.endpoints[0].version
         
-        # Token caching
+        # Token caching (SaaS tokens are shared process-wide via token_provider)
         self.access_token = ''
-        self.token_expires = 0
+        
+        # Connection pool shared by all requests of this service
+        self.pool_connections = int(config.get('pool_connections', 4))
+        self.pool_maxsize = int(config.get('pool_maxsize', 10))
+        self.max_retries = int(config.get('max_retries', 3))
+        self.backoff_factor = float(config.get('backoff_factor', 0.5))
+        self.timeout = (
+            float(config.get('connect_timeout', 5)),
+            float(config.get('read_timeout', 120))
+        )
+        self._stats_lock = threading.Lock()
+        self._request_count = 0
+        self._error_count = 0
+        self.session = self._build_session()
+        self._hedge_executor = None
+        self._hedge_executor_lock = threading.Lock()
+        
+        # Optional answer cache, invalidated when the set of deployments changes
+        self.response_cache = response_cache
+        if self.response_cache is not None:
+            urls = '|'.join(sorted(endpoint.url for endpoint in self.endpoint_pool.endpoints))
+            self.response_cache.bind(urls, self.version)
+        
+        self.health_monitor = health_monitor
+    
+    def _build_session(self) -> requests.Session:
+        """
+        Create a keep-alive session with a bounded connection pool and retry policy
+        
+        Returns:
+            Configured requests session
+        """
+        # Read errors are never retried: the question may already be generated.
+        # With replicas, a 429/503 fails over to another replica instead of
+        # being retried against the same one.
+        retry = SafeRetry(
+            total=self.max_retries,
+            connect=self.max_retries,
+            read=0,
+            status=self.max_retries if self.endpoint_pool.size < 2 else 0,
+            backoff_factor=self.backoff_factor,
+            status_forcelist=RETRY_STATUS_CODES,
+            respect_retry_after_header=True,
+            raise_on_status=False
+        )
+        adapter = HTTPAdapter(
+            pool_connections=self.pool_connections,
+            pool_maxsize=self.pool_maxsize,
+            max_retries=retry,
+            pool_block=True
+        )
+        session = requests.Session()
+        session.mount('https://', adapter)
+        session.mount('http://', adapter)
+        return session
+    
+    def pool_stats(self) -> dict:
+        """
+        Connection pool statistics for monitoring keep-alive reuse
+        
+        Returns:
+            Dictionary with request/connection counts and reuse rate
+        """
+        pools = []
+        for adapter in set(self.session.adapters.values()):
+            manager = adapter.poolmanager
+            for key in manager.pools.keys():
+                pool = manager.pools.get(key)
+                if pool is not None:
+                    pools.append(pool)
+        
+        connections = sum(pool.num_connections for pool in pools)
+        pool_requests = sum(pool.num_requests for pool in pools)
+        with self._stats_lock:
+            requests_sent = self._request_count
+            errors = self._error_count
+        
+        return {
+            'hosts': len(pools),
+            'requests': requests_sent,
+            'errors': errors,
+            'http_requests': pool_requests,
+            'connections_opened': connections,
+            'reuse_rate': (1 - connections / pool_requests) if pool_requests else 0.0,
+            'pool_maxsize': self.pool_maxsize
+        }
+    
+    def close(self):
+        """Close all pooled connections"""
+        if self._hedge_executor is not None:
+            self._hedge_executor.shutdown(wait=False)
+        self.session.close()
     
     def get_token(self, force: bool = False) -> str:
         """
@@ -79,34 +251,13 @@ class RAGService:
         Returns:
             Access token string
         """
-        now = time.time()
-        
-        if self.token_expires <= now or force:
+        if self.env_type == "saas" or not self.access_token or force:
             if self.env_type == "saas":
                 if not self.iam_apikey or not self.deployment_url:
                     raise ValueError("Missing RAG credentials for watsonx.ai SaaS")
                 
-                # Get access token for watsonx.ai SaaS
-                response = requests.post(
-                    'https://iam.cloud.ibm.com/identity/token',
-                    data={
-                        'apikey': self.iam_apikey,
-                        'grant_type': 'urn:ibm:params:oauth:grant-type:apikey'
-                    }
-                )
-                
-                if response.status_code == 200:
-                    resp = response.json()
-                    if 'access_token' not in resp:
-                        raise ValueError("Unexpected token format")
-                    
-                    self.access_token = resp['access_token']
-                    # Calculate expiration time (subtract 5 minutes as precaution)
-                    self.token_expires = (
-                        now + resp.get('expires_in', resp.get('expiration', now))
-                    ) - 300
-                else:
-                    raise ValueError(f"Token request failed with status {response.status_code}")
+                # Get access token for watsonx.ai SaaS from the process-wide cache
+                self.access_token = get_token_provider(self.iam_apikey).get_token(force=force)
             
             elif self.env_type == "on-prem":
                 if not self.username or not self.cpd_apikey or not self.deployment_url:
@@ -120,18 +271,32 @@ class RAGService:
         
         return self.access_token
     
-    def _exec_request(self, payload: dict, url: str, ignore_errors: bool = False) -> Optional[requests.Response]:
+    def _exec_request(self, payload: dict, url: str, ignore_errors: bool = False,
+                      endpoint: Optional[RAGEndpoint] = None,
+                      health_sample: bool = True) -> Optional[requests.Response]:
         """
         Execute HTTP request to RAG endpoint
         
+        Within a Deadline, the connect and read timeouts are capped by the
+        time left; a request cut short by the deadline is not counted
+        against the replica.
+        
         Args:
             payload: Request payload
             url: Endpoint URL
             ignore_errors: Don't raise exceptions on errors
+            endpoint: Replica the request counts against in the endpoint pool
+            health_sample: Report the outcome to the health monitor (False for its own pings)
             
         Returns:
             Response object or None on error
+            
+        Raises:
+            DeadlineExceeded: If the current deadline passed before or during the request
         """
+        deadline = current_deadline()
+        timeout = deadline.timeout(self.timeout) if deadline is not None else self.timeout
+        
         # Prepare headers based on environment type
         if self.env_type == "on-prem":
             headers = {
@@ -145,17 +310,173 @@ class RAGService:
                 'Authorization': f'Bearer {self.get_token()}'
             }
         
+        start = time.perf_counter()
         try:
-            response = requests.post(url, json=payload, headers=headers, verify=False)
+            response = self.session.post(
+                url, json=payload, headers=headers, verify=False, timeout=timeout
+            )
+            latency = time.perf_counter() - start
+            self._record_request(response.status_code == 200, latency, response.status_code, health_sample)
+            if endpoint is not None:
+                self.endpoint_pool.finish(endpoint, response.status_code not in RETRY_STATUS_CODES, latency)
             
             if response.status_code != 200 and not ignore_errors:
                 raise ValueError(f"Request failed with status code: {response.status_code}")
             
             return response
-        except Exception as e:
+        except requests.RequestException as e:
+            if deadline is not None and deadline.expired():
+                if endpoint is not None:
+                    self.endpoint_pool.release(endpoint)
+                raise deadline.exceeded() from e
+            self._record_request(False, time.perf_counter() - start, health_sample=health_sample)
+            if endpoint is not None:
+                self.endpoint_pool.finish(endpoint, False, time.perf_counter() - start)
             if not ignore_errors:
                 raise ValueError(f"Request failed: {str(e)}")
             return None
+
+    def _send(self, build: Callable[[RAGEndpoint], Tuple[str, dict]], endpoint: RAGEndpoint,
+              health_sample: bool = True) -> Tuple[Optional[requests.Response], RAGEndpoint]:
+        """Send a request built for one replica; the replica must already count it as outstanding"""
+        try:
+            url, payload = build(endpoint)
+            response = self._exec_request(payload, url, ignore_errors=True, endpoint=endpoint,
+                                          health_sample=health_sample)
+            return response, endpoint
+        except Exception:
+            # e.g. missing credentials; release the replica without blaming it
+            self.endpoint_pool.release(endpoint)
+            raise
+    
+    def _send_hedged(self, build, endpoint: RAGEndpoint,
+                     tried: List[RAGEndpoint]) -> Tuple[Optional[requests.Response], RAGEndpoint]:
+        """
+        Send a request and, if it is slower than the pool's hedge quantile
+        latency, the same request to a second replica; the first good
+        response wins and the other request is cancelled
+        """
+        deadline = current_deadline()
+        delay = self.endpoint_pool.hedge_delay()
+        if delay is None or deadline is not None and delay >= deadline.remaining():
+            return self._send(build, endpoint)
+        
+        with self._hedge_executor_lock:
+            if self._hedge_executor is None:
+                self._hedge_executor = ThreadPoolExecutor(
+                    max_workers=max(2, self.pool_maxsize), thread_name_prefix='rag-hedge'
+                )
+        
+        def submit(replica: RAGEndpoint):
+            # Each attempt runs in its own copy of the context, so it sees the current deadline
+            return self._hedge_executor.submit(contextvars.copy_context().run, self._send, build, replica)
+        
+        pending = {submit(endpoint)}
+        done, pending = wait(pending, timeout=delay)
+        if not done:
+            second = self.endpoint_pool.choose(exclude=tried)
+            if second is not None:
+                tried.append(second)
+                self.endpoint_pool.record_hedge()
+                pending.add(submit(second))
+        
+        result = None
+        try:
+            while done or pending:
+                for future in done:
+                    result = future.result()
+                    response, winner = result
+                    if response is not None and response.status_code == 200:
+                        if winner is not endpoint:
+                            self.endpoint_pool.record_hedge(won=True)
+                        return result
+                if not pending:
+                    break
+                done, pending = wait(
+                    pending, timeout=deadline.remaining() if deadline is not None else None,
+                    return_when=FIRST_COMPLETED
+                )
+                if not done:
+                    deadline.check()
+            return result
+        finally:
+            # Drop the slower request if it has not started; a running one
+            # ends at the deadline at the latest and only updates the pool
+            for future in pending:
+                future.cancel()
+    
+    def _request(self, build: Callable[[RAGEndpoint], Tuple[str, dict]], ignore_errors: bool = False,
+                 hedge: bool = False, endpoint: Optional[RAGEndpoint] = None
+                 ) -> Tuple[Optional[requests.Response], Optional[RAGEndpoint]]:
+        """
+        Send a request to the best replica, failing over to the others
+        
+        Args:
+            build: Callable returning (url, payload) for a replica
+            ignore_errors: Return the last failed response instead of raising
+            hedge: Allow a hedged second request (only for idempotent calls)
+            endpoint: Send to this replica only, without failover
+            
+        Returns:
+            Tuple of (response or None, replica that answered)
+        """
+        if endpoint is not None:
+            response, _ = self._send(build, self.endpoint_pool.pin(endpoint))
+            if response is not None and response.status_code == 200 or ignore_errors:
+                return response, endpoint
+            raise ValueError(f"Request failed with status code: {response.status_code if response else 0}")
+        
+        deadline = current_deadline()
+        tried: List[RAGEndpoint] = []
+        response, answered = None, None
+        while True:
+            # Every failover attempt needs time left, not just the first
+            if deadline is not None:
+                deadline.check()
+            chosen = self.endpoint_pool.choose(exclude=tried)
+            if chosen is None:
+                break
+            tried.append(chosen)
+            if hedge and self.hedge:
+                response, answered = self._send_hedged(build, chosen, tried)
+            else:
+                response, answered = self._send(build, chosen)
+            if response is not None and response.status_code not in RETRY_STATUS_CODES:
+                break
+        
+        if not ignore_errors and (response is None or response.status_code != 200):
+            status_code = response.status_code if response is not None else 0
+            raise ValueError(f"Request failed with status code: {status_code}")
+        return response, answered
+    
+    def _remember_log_endpoint(self, log_id: str, endpoint: Optional[RAGEndpoint]):
+        if not log_id or endpoint is None or self.endpoint_pool.size < 2:
+            return
+        with self._log_endpoints_lock:
+            self._log_endpoints[log_id] = endpoint
+            while len(self._log_endpoints) > 10000:
+                self._log_endpoints.popitem(last=False)
+    
+    def attach_health_monitor(self, health_monitor):
+        """Report every request to a HealthMonitor, e.g. one that pings through this service"""
+        self.health_monitor = health_monitor
+    
+    def _log_endpoint(self, log_id: str) -> Optional[RAGEndpoint]:
+        with self._log_endpoints_lock:
+            return self._log_endpoints.get(log_id)
+    
+    def endpoint_stats(self) -> dict:
+        """Load, latency and circuit breaker state of every replica"""
+        return self.endpoint_pool.stats()
+    
+    def _record_request(self, ok: bool, latency: float = 0.0, status_code: int = 0, health_sample: bool = True):
+        """Update request counters used by pool_stats and report to the health monitor"""
+        with self._stats_lock:
+            self._request_count += 1
+            if not ok:
+                self._error_count += 1
+        if self.health_monitor is not None and health_sample:
+            self.health_monitor.record(ok, latency, status_code)
     
     def ping(self) -> Tuple[bool, int]:
         """
@@ -164,57 +485,104 @@ class RAGService:
         Returns:
             Tuple of (success: bool, status_code: int)
         """
-        if self.version == "1.x":
-            payload = {"input_data": [{"fields": [""], "values": [[""]]}]}
-        else:
-            payload = {"": ""}
+        def build(endpoint: RAGEndpoint) -> Tuple[str, dict]:
+            if endpoint.version == "1.x":
+                return endpoint.url, {"input_data": [{"fields": [""], "values": [[""]]}]}
+            return endpoint.url, {"": ""}
         
-        response = self._exec_request(payload, self.deployment_url, ignore_errors=True)
-        status_code = response.status_code if response else 0
+        # Every replica is pinged, which also lets ejected replicas rejoin the
+        # pool; the health monitor records the ping itself, not as a request
+        best = 0
+        for endpoint in self.endpoint_pool.endpoints:
+            response, _ = self._send(build, self.endpoint_pool.pin(endpoint), health_sample=False)
+            status_code = response.status_code if response is not None else 0
+            if status_code == 200 or not best:
+                best = status_code
         
-        return status_code == 200, status_code
+        return best == 200, best
     
-    def get_response(self, prompt: str) -> Tuple[str, List[dict], str]:
+    def build_question_request(self, prompt: str, endpoint: Optional[RAGEndpoint] = None) -> Tuple[str, dict]:
         """
-        Generate response using RAG
+        Build the endpoint URL and payload for a question
         
         Args:
             prompt: User's question
+            endpoint: Replica to build the request for (default: primary deployment)
             
         Returns:
-            Tuple of (response_text, source_documents, log_id)
+            Tuple of (url, payload) for the deployment's RAG version
         """
-        url = self.deployment_url
+        url = endpoint.url if endpoint else self.deployment_url
+        version = endpoint.version if endpoint else self.version
         
-        if self.version == "1.x":
+        if version == "1.x":
             payload = {
                 "input_data": [{
                     "fields": ["Text"],
                     "values": [[prompt]]
                 }]
             }
-            response = self._exec_request(payload, url)
-            
-            if not response:
-                return 'I am not able to reply due to a technical issue.', [], ''
-            
-            data = response.json()
-            text = data['predictions'][0]['values'][0][0]['response']
-            documents = data['predictions'][0]['values'][0][0].get('source_documents', [])
-            log_id = data['predictions'][0]['values'][0][0].get('log_id', '')
-        
         else:  # version 2.0
             url = url.replace("/ai_service?", "/ai_service/qna?")
             payload = {"question": prompt}
-            response = self._exec_request(payload, url)
+        
+        return url, payload
+    
+    def parse_question_response(self, response: Optional[requests.Response],
+                                version: Optional[str] = None) -> Tuple[str, List[dict], str]:
+        """
+        Extract answer, source documents and log ID from a question response
+        
+        Args:
+            response: Response returned by the RAG endpoint
+            version: RAG version of the replica that answered (default: primary deployment)
             
-            if not response:
-                return 'I am not able to reply due to a technical issue.', [], ''
+        Returns:
+            Tuple of (response_text, source_documents, log_id)
+        """
+        if not response:
+            return 'I am not able to reply due to a technical issue.', [], ''
+        
+        data = response.json()
+        
+        if (version or self.version) == "1.x":
+            result = data['predictions'][0]['values'][0][0]
+        else:  # version 2.0
+            result = data['result']
+        
+        text = result['response']
+        documents = result.get('source_documents', [])
+        log_id = result.get('log_id', '')
+        
+        return text, documents, log_id
+    
+    def get_response(self, prompt: str) -> Tuple[str, List[dict], str]:
+        """
+        Generate response using RAG
+        
+        Args:
+            prompt: User's question
             
-            data = response.json()
-            text = data['result']['response']
-            documents = data['result'].get('source_documents', [])
-            log_id = data['result'].get('log_id', '')
+        Returns:
+            Tuple of (response_text, source_documents, log_id)
+            
+        Raises:
+            DeadlineExceeded: If the current Deadline passes before a replica answers
+        """
+        embedding = None
+        if self.response_cache is not None:
+            cached, embedding = self.response_cache.lookup(prompt)
+            if cached is not None:
+                return cached
+        
+        response, endpoint = self._request(
+            lambda endpoint: self.build_question_request(prompt, endpoint), hedge=True
+        )
+        text, documents, log_id = self.parse_question_response(response, endpoint.version if endpoint else None)
+        self._remember_log_endpoint(log_id, endpoint)
+        
+        if self.response_cache is not None and response:
+            self.response_cache.put(prompt, text, documents, log_id, embedding=embedding)
         
         return text, documents, log_id
     
@@ -233,39 +601,36 @@ class RAGService:
         if not log_id:
             return {'status': 'error', 'message': 'No log_id provided'}
         
-        url = self.deployment_url
+        # Answers served from the cache refer back to the original log entry
+        log_id = resolve_log_id(log_id)
         
-        if self.version == "1.x":
-            payload = {
-                "input_data": [{
-                    "fields": ["log_id", "value", "comment"],
-                    "values": [[log_id, value, comment or '']]
-                }]
-            }
-            response = self._exec_request(payload, url)
-            
-            if response and response.status_code == 200:
-                result = response.json()['predictions'][0]['values'][0][0]
-                return {
-                    'status': 'ok' if result == 'ok' else 'error',
-                    'message': 'Feedback submitted successfully' if result == 'ok' else 'Feedback submission failed'
+        def build(endpoint: RAGEndpoint) -> Tuple[str, dict]:
+            if endpoint.version == "1.x":
+                return endpoint.url, {
+                    "input_data": [{
+                        "fields": ["log_id", "value", "comment"],
+                        "values": [[log_id, value, comment or '']]
+                    }]
                 }
-        
-        else:  # version 2.0
-            url = url.replace("/ai_service?", "/ai_service/log_feedback?")
-            payload = {
+            url = endpoint.url.replace("/ai_service?", "/ai_service/log_feedback?")
+            return url, {
                 "log_id": log_id,
                 "value": value,
                 "comment": comment or ''
             }
-            response = self._exec_request(payload, url)
-            
-            if response and response.status_code == 200:
-                result = response.json()
-                return {
-                    'status': result.get('status', 'error'),
-                    'message': 'Feedback submitted successfully' if result.get('status') == 'ok' else 'Feedback submission failed'
-                }
+        
+        # Feedback goes to the replica that logged the answer
+        response, endpoint = self._request(build, endpoint=self._log_endpoint(log_id))
+        
+        if response and response.status_code == 200:
+            if endpoint.version == "1.x":
+                status = 'ok' if response.json()['predictions'][0]['values'][0][0] == 'ok' else 'error'
+            else:  # version 2.0
+                status = response.json().get('status', 'error')
+            return {
+                'status': status,
+                'message': 'Feedback submitted successfully' if status == 'ok' else 'Feedback submission failed'
+            }
         
         return {'status': 'error', 'message': 'Feedback submission failed'}
     
@@ -282,19 +647,26 @@ class RAGService:
         if not log_id:
             return {'status': 'error', 'message': 'No log_id provided'}
         
-        url = self.deployment_url
+        # Answers served from the cache refer back to the original log entry
+        log_id = resolve_log_id(log_id)
         
-        if self.version == "1.x":
-            payload = {
-                "input_data": [{
-                    "fields": ["_function", "log_id"],
-                    "values": [["recommend_top_experts", log_id]]
-                }]
-            }
-            response = self._exec_request(payload, url)
+        def build(endpoint: RAGEndpoint) -> Tuple[str, dict]:
+            if endpoint.version == "1.x":
+                return endpoint.url, {
+                    "input_data": [{
+                        "fields": ["_function", "log_id"],
+                        "values": [["recommend_top_experts", log_id]]
+                    }]
+                }
+            return endpoint.url.replace("/ai_service?", "/ai_service/recommended_experts?"), {"log_id": log_id}
+        
+        # The replica that logged the answer knows the question
+        response, endpoint = self._request(build, endpoint=self._log_endpoint(log_id))
+        
+        if response and response.status_code == 200:
+            data = response.json()
             
-            if response and response.status_code == 200:
-                data = response.json()
+            if endpoint.version == "1.x":
                 experts = data['predictions'][0]['values'][0][0]
                 status = data['predictions'][0]['values'][0][1]
                 
@@ -304,15 +676,8 @@ class RAGService:
                         'expert': experts[0],
                         'is_sample': self.is_expert_sample
                     }
-        
-        else:  # version 2.0
-            url = url.replace("/ai_service?", "/ai_service/recommended_experts?")
-            payload = {"log_id": log_id}
-            response = self._exec_request(payload, url)
             
-            if response and response.status_code == 200:
-                data = response.json()
-                
+            else:  # version 2.0
                 if 'expert_details' in data.get('expert_status', '') and len(data.get('recommended_top_experts', [])) > 0:
                     return {
                         'status': 'ok',
@@ -322,3 +687,137 @@ class RAGService:
         
         return {'status': 'error', 'message': 'No experts found for this topic'}
 
+
+class RAGBatchResult(BaseModel):
+    """Result of a single question within a batch"""
+    index: int
+    prompt: str
+    text: str = ''
+    documents: List[dict] = []
+    log_id: str = ''
+    error: Optional[str] = None
+    latency: float = 0.0
+    
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class AsyncRAGService:
+    """
+    Asyncio variant of RAGService for concurrent question answering
+    
+    Requests run on a dedicated thread pool over the pooled session of an
+    underlying RAGService, so payload handling for 1.x and 2.0 deployments is
+    identical to the synchronous class. A semaphore bounds the number of
+    requests in flight; the pool has one thread per allowed request, so the
+    event loop's default executor does not cap concurrency.
+    """
+    
+    def __init__(self, config: dict, max_concurrency: int = 8,
+                 response_cache: Optional[ResponseCache] = None):
+        """
+        Initialize async RAG service
+        
+        Args:
+            config: Same configuration dictionary as RAGService
+            max_concurrency: Maximum number of requests in flight
+            response_cache: Optional shared ResponseCache for answers
+        """
+        self.max_concurrency = max(1, int(max_concurrency))
+        config = dict(config)
+        # Keep enough pooled connections for every concurrent request
+        config['pool_maxsize'] = max(int(config.get('pool_maxsize', 10)), self.max_concurrency)
+        self.service = RAGService(config, response_cache=response_cache)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix='rag-async')
+        self._semaphore = None
+    
+    @property
+    def version(self) -> str:
+        return self.service.version
+    
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        # Created lazily so the semaphore binds to the running event loop
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+    
+    async def _run(self, func, *args):
+        # Copy the context like asyncio.to_thread, so a current Deadline reaches the worker
+        context = contextvars.copy_context()
+        return await asyncio.get_running_loop().run_in_executor(self._executor, context.run, func, *args)
+    
+    async def _call(self, func, *args):
+        async with self._get_semaphore():
+            return await self._run(func, *args)
+    
+    async def ping(self) -> Tuple[bool, int]:
+        """Health check for RAG endpoint"""
+        return await self._call(self.service.ping)
+    
+    async def get_response(self, prompt: str) -> Tuple[str, List[dict], str]:
+        """
+        Generate response using RAG
+        
+        Args:
+            prompt: User's question
+            
+        Returns:
+            Tuple of (response_text, source_documents, log_id)
+        """
+        return await self._call(self.service.get_response, prompt)
+    
+    async def send_feedback(self, log_id: str, value: str, comment: Optional[str] = None) -> dict:
+        """Submit user feedback for a response"""
+        return await self._call(self.service.send_feedback, log_id, value, comment)
+    
+    async def get_expert_recommendation(self, log_id: str) -> dict:
+        """Get expert recommendation for a question"""
+        return await self._call(self.service.get_expert_recommendation, log_id)
+    
+    async def _get_batch_item(self, index: int, prompt: str) -> RAGBatchResult:
+        start = time.perf_counter()
+        try:
+            text, documents, log_id = await self.get_response(prompt)
+            return RAGBatchResult(
+                index=index,
+                prompt=prompt,
+                text=text,
+                documents=documents,
+                log_id=log_id,
+                latency=time.perf_counter() - start
+            )
+        except Exception as e:
+            return RAGBatchResult(
+                index=index,
+                prompt=prompt,
+                error=str(e),
+                latency=time.perf_counter() - start
+            )
+    
+    async def get_responses(self, prompts: List[str]) -> List[RAGBatchResult]:
+        """
+        Answer a batch of questions concurrently
+        
+        Failures are reported per item instead of failing the whole batch.
+        
+        Args:
+            prompts: Questions to answer
+            
+        Returns:
+            List of RAGBatchResult in the same order as prompts
+        """
+        # Fetch the token once up front instead of racing for it in every worker;
+        # credential errors are still reported per item below
+        try:
+            await self._run(self.service.get_token)
+        except Exception:
+            pass
+        
+        tasks = [self._get_batch_item(i, prompt) for i, prompt in enumerate(prompts)]
+        return list(await asyncio.gather(*tasks))
+    
+    def close(self):
+        """Close all pooled connections"""
+        self._executor.shutdown(wait=False)
+        self.service.close()
@@ -0,0 +1,296 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Response Cache Module
+Exact-match and embedding-similarity cache for RAG answers
+"""
+
+import atexit
+import hashlib
+import json
+import math
+import os
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from typing import Callable, List, Optional, Tuple
+
+
+# Marker prepended to log IDs of answers served from the cache
+CACHED_LOG_PREFIX = 'cached:'
+
+
+def normalize_prompt(text: str) -> str:
+    """
+    Normalise a question for exact-match lookups
+
+    Lower-cases, drops punctuation and collapses whitespace so that
+    "How do I change my tariff?" and "how do i change my tariff" match.
+    """
+    text = re.sub(r'[^\w\s]', ' ', text.lower())
+    return ' '.join(text.split())
+
+
+def make_cached_log_id(log_id: str) -> str:
+    """Return a fresh log ID marker that still refers to the original log ID"""
+    if not log_id:
+        return ''
+    return f"{CACHED_LOG_PREFIX}{log_id}#{uuid.uuid4().hex[:8]}"
+
+
+def is_cached_log_id(log_id: str) -> bool:
+    return bool(log_id) and log_id.startswith(CACHED_LOG_PREFIX)
+
+
+def resolve_log_id(log_id: str) -> str:
+    """Return the original log ID behind a cached log ID marker"""
+    if not is_cached_log_id(log_id):
+        return log_id
+    return log_id[len(CACHED_LOG_PREFIX):].rsplit('#', 1)[0]
+
+
+def _unit_vector(vector: List[float]) -> List[float]:
+    norm = math.sqrt(sum(v * v for v in vector))
+    if not norm:
+        return list(vector)
+    return [v / norm for v in vector]
+
+
+class ResponseCache:
+    """
+    Thread-safe LRU/TTL cache of RAG answers
+
+    Lookups first try the normalised prompt text. If an embedding function
+    is configured, misses fall back to the most similar cached question
+    whose cosine similarity reaches the threshold. Entries are scoped to a
+    namespace (deployment URL and RAG version); binding the cache to a
+    different namespace drops all entries. With a persist path, changes are
+    written by a background thread every `save_interval` seconds and at
+    exit, so lookups never wait for disk I/O.
+    """
+
+    def __init__(self, max_entries: int = 512, ttl: float = 86400,
+                 similarity_threshold: float = 0.92,
+                 embed_fn: Optional[Callable[[str], List[float]]] = None,
+                 persist_path: Optional[str] = None, save_interval: float = 5.0):
+        """
+        Initialize response cache
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl: Seconds after which a cached answer expires
+            similarity_threshold: Minimum cosine similarity for a semantic hit
+            embed_fn: Optional callable returning an embedding for a text
+            persist_path: Optional JSON file used to persist the cache
+            save_interval: Seconds between background writes of a changed cache
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.similarity_threshold = similarity_threshold
+        self.embed_fn = embed_fn
+        self.persist_path = persist_path
+        self.save_interval = save_interval
+        self.namespace = ''
+
+        self._entries: "OrderedDict[str, dict]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.semantic_hits = 0
+        self.misses = 0
+        self._dirty = False
+        self._save_lock = threading.Lock()
+
+        if self.persist_path:
+            self._load()
+            self._saver = threading.Thread(target=self._run_saver, name='rag-cache-saver', daemon=True)
+            self._saver.start()
+            atexit.register(self.flush)
+
+    def bind(self, deployment_url: str, version: str):
+        """
+        Scope the cache to a deployment, invalidating it if the deployment changed
+
+        Args:
+            deployment_url: RAG deployment endpoint URL
+            version: RAG version ('1.x' or '2.0')
+        """
+        namespace = hashlib.sha256(f"{deployment_url}|{version}".encode()).hexdigest()
+        with self._lock:
+            if namespace != self.namespace:
+                self._entries.clear()
+                self.namespace = namespace
+                self._dirty = True
+
+    def invalidate(self):
+        """Drop all cached answers"""
+        with self._lock:
+            self._entries.clear()
+            self._dirty = True
+
+    def _embed(self, text: str) -> Optional[List[float]]:
+        if not self.embed_fn:
+            return None
+        try:
+            return _unit_vector(self.embed_fn(text))
+        except Exception:
+            # Embedding failures only disable the semantic layer for this call
+            return None
+
+    def _evict_expired(self, now: float):
+        expired = [key for key, entry in self._entries.items() if now - entry['created'] > self.ttl]
+        for key in expired:
+            del self._entries[key]
+
+    def get(self, prompt: str) -> Optional[Tuple[str, List[dict], str]]:
+        """
+        Look up a cached answer
+
+        Args:
+            prompt: User's question
+
+        Returns:
+            Tuple of (response_text, source_documents, log_id) or None on a miss.
+            The log ID is a fresh marker wrapping the original log ID.
+        """
+        return self.lookup(prompt)[0]
+
+    def lookup(self, prompt: str) -> Tuple[Optional[Tuple[str, List[dict], str]], Optional[List[float]]]:
+        """
+        Look up a cached answer and return the prompt embedding computed on the way
+
+        Pass the embedding to put() after a miss, so the prompt is embedded once.
+
+        Returns:
+            Tuple of (answer as returned by get() or None, embedding or None)
+        """
+        key = normalize_prompt(prompt)
+        now = time.time()
+
+        with self._lock:
+            self._evict_expired(now)
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return (entry['text'], entry['documents'], make_cached_log_id(entry['log_id'])), None
+            # The similarity scan runs on a snapshot, outside the lock
+            candidates = [(k, e['embedding']) for k, e in self._entries.items() if e.get('embedding')]
+
+        embedding = self._embed(prompt) if candidates else None
+        if embedding is None:
+            with self._lock:
+                self.misses += 1
+            return None, embedding
+
+        best_key, best_score = None, self.similarity_threshold
+        for candidate_key, candidate in candidates:
+            if len(candidate) != len(embedding):
+                continue
+            score = sum(a * b for a, b in zip(embedding, candidate))
+            if score >= best_score:
+                best_key, best_score = candidate_key, score
+
+        with self._lock:
+            entry = self._entries.get(best_key) if best_key is not None else None
+            if entry is None:
+                self.misses += 1
+                return None, embedding
+
+            self._entries.move_to_end(best_key)
+            self.hits += 1
+            self.semantic_hits += 1
+            return (entry['text'], entry['documents'], make_cached_log_id(entry['log_id'])), embedding
+
+    def put(self, prompt: str, text: str, documents: List[dict], log_id: str,
+            embedding: Optional[List[float]] = None):
+        """
+        Store an answer
+
+        Args:
+            prompt: User's question
+            text: Generated answer
+            documents: Source documents returned with the answer
+            log_id: Log ID returned with the answer
+            embedding: Prompt embedding returned by lookup(), computed here if missing
+        """
+        key = normalize_prompt(prompt)
+        if embedding is None:
+            embedding = self._embed(prompt)
+
+        with self._lock:
+            self._entries[key] = {
+                'text': text,
+                'documents': documents,
+                'log_id': resolve_log_id(log_id),
+                'embedding': embedding,
+                'created': time.time()
+            }
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+            self._dirty = True
+
+    def stats(self) -> dict:
+        """
+        Cache statistics
+
+        Returns:
+            Dictionary with entries, hits, semantic hits, misses and hit rate
+        """
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                'entries': len(self._entries),
+                'hits': self.hits,
+                'semantic_hits': self.semantic_hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / lookups if lookups else 0.0
+            }
+
+    def flush(self):
+        """Write the cache to disk now if it changed since the last write"""
+        if not self.persist_path:
+            return
+        with self._save_lock:
+            with self._lock:
+                if not self._dirty:
+                    return
+                # Entries are replaced, never mutated, so a shallow copy is a consistent snapshot
+                data = {'namespace': self.namespace, 'entries': list(self._entries.items())}
+                self._dirty = False
+            tmp_path = f"{self.persist_path}.tmp"
+            try:
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(data, f)
+                os.replace(tmp_path, self.persist_path)
+            except OSError as e:
+                print(f"Warning: could not write response cache: {e}")
+                with self._lock:
+                    self._dirty = True
+
+    def _run_saver(self):
+        while True:
+            time.sleep(self.save_interval)
+            self.flush()
+
+    def _load(self):
+        if not os.path.exists(self.persist_path):
+            return
+        try:
+            with open(self.persist_path, encoding='utf-8') as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        self.namespace = data.get('namespace', '')
+        now = time.time()
+        for key, entry in data.get('entries', []):
+            if now - entry.get('created', 0) <= self.ttl:
+                self._entries[key] = entry
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
@@ -0,0 +1,189 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+IAM Token Provider Module
+Process-wide IBM Cloud IAM token cache shared by all Streamlit sessions
+"""
+
+import hashlib
+import threading
+import time
+from typing import Dict, Optional
+
+import requests
+
+from deadline import current_deadline
+
+
+IAM_TOKEN_URL = 'https://iam.cloud.ibm.com/identity/token'
+
+# Refresh tokens this many seconds before they expire
+REFRESH_MARGIN = 300
+
+# Delay before retrying a failed background refresh
+RETRY_DELAY = 30
+
+
+class IAMTokenProvider:
+    """
+    Thread-safe IAM access token cache for a single API key
+
+    Only one refresh is in flight at a time: concurrent callers that find the
+    token expired wait for the refresh already running instead of issuing their
+    own request. A background timer renews the token shortly before it expires
+    so callers normally never block on IAM.
+    """
+
+    def __init__(self, apikey: str, iam_url: str = IAM_TOKEN_URL,
+                 refresh_margin: int = REFRESH_MARGIN, background_refresh: bool = True,
+                 timeout: float = 10):
+        """
+        Initialize token provider
+
+        Args:
+            apikey: IBM Cloud API key
+            iam_url: IAM token endpoint
+            refresh_margin: Seconds before expiry at which the token is renewed
+            background_refresh: Renew the token proactively on a timer
+            timeout: Timeout for IAM requests in seconds
+        """
+        if not apikey:
+            raise ValueError("Missing IBM Cloud API key")
+
+        self.apikey = apikey
+        self.iam_url = iam_url
+        self.refresh_margin = refresh_margin
+        self.background_refresh = background_refresh
+        self.timeout = timeout
+
+        self.access_token = ''
+        self.expires_at = 0.0
+        self.refresh_count = 0
+
+        self._session = requests.Session()
+        self._refresh_lock = threading.Lock()
+        self._timer: Optional[threading.Timer] = None
+
+    def _is_fresh(self, now: float) -> bool:
+        return bool(self.access_token) and now < self.expires_at - self.refresh_margin
+
+    def get_token(self, force: bool = False) -> str:
+        """
+        Return a valid access token, refreshing it if needed
+
+        Args:
+            force: Force token refresh even if not expired
+
+        Returns:
+            Access token string
+        """
+        if not force and self._is_fresh(time.time()):
+            return self.access_token
+
+        observed = self.access_token
+        # Within a Deadline, neither waiting for another caller's refresh nor
+        # the IAM request may outlast the time left
+        deadline = current_deadline()
+        if not self._refresh_lock.acquire(timeout=deadline.remaining() if deadline is not None else -1):
+            raise deadline.exceeded()
+        try:
+            # Another caller may have refreshed while we waited for the lock
+            if self.access_token != observed or (not force and self._is_fresh(time.time())):
+                return self.access_token
+            self._refresh()
+        finally:
+            self._refresh_lock.release()
+
+        return self.access_token
+
+    def _refresh(self):
+        """Fetch a new token from IAM; must be called with the refresh lock held"""
+        now = time.time()
+        deadline = current_deadline()
+        timeout = deadline.timeout((self.timeout, self.timeout)) if deadline is not None else self.timeout
+        try:
+            response = self._session.post(
+                self.iam_url,
+                headers={'Content-Type': 'application/x-www-form-urlencoded'},
+                data={
+                    'apikey': self.apikey,
+                    'grant_type': 'urn:ibm:params:oauth:grant-type:apikey'
+                },
+                timeout=timeout
+            )
+        except requests.RequestException as e:
+            if deadline is not None and deadline.expired():
+                raise deadline.exceeded() from e
+            raise
+
+        if response.status_code != 200:
+            raise ValueError(f"Token request failed with status {response.status_code}")
+
+        resp = response.json()
+        if 'access_token' not in resp:
+            raise ValueError("Unexpected token format")
+
+        self.access_token = resp['access_token']
+        if 'expires_in' in resp:
+            self.expires_at = now + resp['expires_in']
+        else:
+            self.expires_at = resp.get('expiration', now + 3600)
+        self.refresh_count += 1
+
+        if self.background_refresh:
+            self._schedule_refresh(self.expires_at - self.refresh_margin - time.time())
+
+    def _schedule_refresh(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = threading.Timer(max(delay, 1.0), self._background_refresh)
+        self._timer.daemon = True
+        self._timer.start()
+
+    def _background_refresh(self):
+        if not self._refresh_lock.acquire(blocking=False):
+            # A foreground refresh is running and will reschedule the timer
+            return
+        try:
+            self._refresh()
+        except Exception:
+            # Keep serving the current token and try again shortly
+            self._schedule_refresh(RETRY_DELAY)
+        finally:
+            self._refresh_lock.release()
+
+    def close(self):
+        """Stop background refresh and close the IAM session"""
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._session.close()
+
+
+_providers: Dict[str, IAMTokenProvider] = {}
+_providers_lock = threading.Lock()
+
+
+def get_token_provider(apikey: str, iam_url: str = IAM_TOKEN_URL) -> IAMTokenProvider:
+    """
+    Return the process-wide token provider for an API key
+
+    Args:
+        apikey: IBM Cloud API key
+        iam_url: IAM token endpoint
+
+    Returns:
+        Shared IAMTokenProvider instance
+    """
+    key = hashlib.sha256(f"{iam_url}|{apikey}".encode()).hexdigest()
+
+    with _providers_lock:
+        provider = _providers.get(key)
+        if provider is None:
+            provider = IAMTokenProvider(apikey, iam_url=iam_url)
+            _providers[key] = provider
+
+    return provider
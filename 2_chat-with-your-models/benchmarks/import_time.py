@@ -0,0 +1,174 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Import Time Benchmark
+Measures the cold start and per-rerun script time of the Streamlit app
+
+Every measurement runs in a fresh interpreter, so module caches do not carry
+over between samples:
+- cold import time of the app's dependencies and local modules (python -X importtime)
+- first run and rerun time of app.py in RAG-only and direct mode (streamlit AppTest),
+  and whether the run loaded the watsonx.ai SDK
+
+No credentials are needed; the app is started without a RAG endpoint and
+no model request is sent.
+
+Usage:
+    uv run python benchmarks/import_time.py [--repeat 5] [--reruns 5] [--json import_time.json]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FRONTEND = os.path.join(ROOT, 'app', 'frontend')
+
+MODULES = [
+    'streamlit',
+    'requests',
+    'pydantic',
+    'dotenv',
+    'ibm_watsonx_ai',
+    'ibm_watsonx_ai.foundation_models',
+    'token_provider',
+    'generation_stream',
+    'model_registry',
+    'history_manager',
+    'response_cache',
+    'rag_service',
+    'log_analysis',
+    'log_preprocess',
+    'log_correlation',
+]
+
+# Environment of the app modes; the RAG URL is a placeholder that is never called
+MODES = {
+    'rag': {'USE_RAG': 'True', 'QNA_RAG_DEPLOYMENT_URL': ''},
+    'direct': {'USE_RAG': 'False', 'WATSONX_API_KEY': 'benchmark', 'WATSONX_PROJECT_ID': 'benchmark'},
+}
+
+
+def import_time(module):
+    """Cumulative cold import time of a module in seconds, or None if it is not installed."""
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=FRONTEND, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=FRONTEND),
+    )
+    if result.returncode != 0:
+        return None
+    # Lines look like "import time:   self [us] | cumulative | imported package";
+    # the top-level module is the last line with no indentation
+    for line in reversed(result.stderr.splitlines()):
+        parts = line.split('|')
+        if len(parts) == 3 and parts[2].strip() == module and not parts[2][1:].startswith(' '):
+            return int(parts[1]) / 1e6
+    return None
+
+
+def run_app(reruns):
+    """Child process: run app.py with AppTest and report timings as JSON."""
+    from streamlit.testing.v1 import AppTest
+
+    started = time.perf_counter()
+    app = AppTest.from_file(os.path.join(FRONTEND, 'app.py'), default_timeout=60)
+    app.run()
+    first_run = time.perf_counter() - started
+
+    rerun_times = []
+    for _ in range(reruns):
+        started = time.perf_counter()
+        app.run()
+        rerun_times.append(time.perf_counter() - started)
+
+    print(json.dumps({
+        'first_run_s': first_run,
+        'rerun_s': statistics.median(rerun_times) if rerun_times else None,
+        'exceptions': [str(e.value) for e in app.exception],
+        'sdk_loaded': 'ibm_watsonx_ai' in sys.modules,
+        'log_modules_loaded': 'log_analysis' in sys.modules,
+    }))
+
+
+def measure_app(mode, reruns):
+    started = time.perf_counter()
+    result = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), '--child', '--reruns', str(reruns)],
+        cwd=FRONTEND, capture_output=True, text=True,
+        env=dict(os.environ, PYTHONPATH=FRONTEND, **MODES[mode]),
+    )
+    if result.returncode != 0:
+        return {'error': result.stderr.strip().splitlines()[-1] if result.stderr.strip() else 'failed'}
+    report = json.loads(result.stdout.strip().splitlines()[-1])
+    # Includes interpreter start-up and the imports of streamlit itself
+    report['process_s'] = time.perf_counter() - started
+    return report
+
+
+def median(values):
+    values = [v for v in values if v is not None]
+    return statistics.median(values) if values else None
+
+
+def fmt(seconds):
+    return 'n/a' if seconds is None else f"{seconds * 1000:8.1f} ms"
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cold start and rerun time of the Streamlit app")
+    parser.add_argument('--repeat', type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument('--reruns', type=int, default=5, help="Script reruns per app measurement")
+    parser.add_argument('--json', help="Also write the results as JSON to this file")
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        run_app(args.reruns)
+        return
+
+    results = {'modules': {}, 'app': {}}
+
+    print("Cold import time (median of fresh interpreters)")
+    for module in MODULES:
+        seconds = median(import_time(module) for _ in range(args.repeat))
+        results['modules'][module] = seconds
+        print(f"  {module:35} {fmt(seconds) if seconds is not None else '  not installed'}")
+
+    print()
+    print("app.py script time (median of fresh interpreters)")
+    for mode in MODES:
+        runs = [measure_app(mode, args.reruns) for _ in range(args.repeat)]
+        errors = [run['error'] for run in runs if 'error' in run]
+        if errors:
+            results['app'][mode] = {'error': errors[0]}
+            print(f"  {mode:8} failed: {errors[0]}")
+            continue
+        summary = {
+            key: median(run[key] for run in runs)
+            for key in ('process_s', 'first_run_s', 'rerun_s')
+        }
+        summary['sdk_loaded'] = any(run['sdk_loaded'] for run in runs)
+        summary['log_modules_loaded'] = any(run['log_modules_loaded'] for run in runs)
+        summary['exceptions'] = runs[0]['exceptions']
+        results['app'][mode] = summary
+        print(f"  {mode:8} process {fmt(summary['process_s'])}  first run {fmt(summary['first_run_s'])}  "
+              f"rerun {fmt(summary['rerun_s'])}  SDK loaded: {'yes' if summary['sdk_loaded'] else 'no'}")
+        for exception in summary['exceptions']:
+            print(f"           script raised: {exception}")
+
+    if args.json:
+        with open(args.json, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nResults written to {args.json}")
+
+
+if __name__ == '__main__':
+    main()
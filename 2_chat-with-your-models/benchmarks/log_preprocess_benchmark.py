@@ -0,0 +1,121 @@
+#Sample Materials, provided under license.
+#Licensed Materials - Property of IBM.
+#© Copyright IBM Corp. 2024,2025. All Rights Reserved.
+#US Government Users Restricted Rights - Use, duplication or disclosure restricted by GSA ADP Schedule Contract with IBM Corp.
+
+"""
+Log Pre-processing Benchmark
+Compares raw log prompts with pre-processed digests for the 8_evaluate-logs scenarios
+
+Reports characters, estimated tokens, compression ratio and pre-processing time
+per scenario. With --model, both prompts are also sent to watsonx.ai to measure
+end-to-end latency (requires WATSONX_API_KEY and WATSONX_PROJECT_ID in .env).
+
+Usage:
+    uv run python benchmarks/log_preprocess_benchmark.py [--model mistralai/mistral-small-3-1-24b-instruct-2503]
+    uv run python benchmarks/log_preprocess_benchmark.py path/to/*.log
+"""
+
+import argparse
+import glob
+import os
+import sys
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT, 'app', 'frontend'))
+
+from history_manager import estimate_tokens  # noqa: E402
+from log_preprocess import LogIndex  # noqa: E402
+
+SCENARIOS_DIR = os.path.join(os.path.dirname(ROOT), '8_evaluate-logs')
+PROMPT = "Analyze these logs. Identify the issues, the root cause, a timeline and recommended fixes.\n\n{logs}"
+
+
+def find_scenarios(paths):
+    if paths:
+        return {'custom': paths}
+    scenarios = {}
+    for name in ('simple-scenario', 'complex-scenario'):
+        files = sorted(glob.glob(os.path.join(SCENARIOS_DIR, name, '*.log')))
+        if files:
+            scenarios[name] = files
+    return scenarios
+
+
+def read_all(paths):
+    contents = []
+    for path in paths:
+        with open(path, encoding='utf-8', errors='replace') as f:
+            contents.append(f.read())
+    return ''.join(contents)
+
+
+def generate(model, prompt):
+    start = time.perf_counter()
+    model.generate_text(prompt=prompt)
+    return time.perf_counter() - start
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark log pre-processing against raw log prompts")
+    parser.add_argument('paths', nargs='*', help="Log files (default: bundled 8_evaluate-logs scenarios)")
+    parser.add_argument('--model', help="Also measure end-to-end latency with this watsonx.ai model")
+    parser.add_argument('--min-level', default='INFO')
+    args = parser.parse_args()
+
+    scenarios = find_scenarios(args.paths)
+    if not scenarios:
+        print(f"No log files found in {SCENARIOS_DIR}/*-scenario/. Pass log files as arguments.")
+        sys.exit(1)
+
+    model = None
+    if args.model:
+        from dotenv import load_dotenv
+        from ibm_watsonx_ai import Credentials
+        from ibm_watsonx_ai.foundation_models import ModelInference
+
+        load_dotenv(os.path.join(ROOT, '.env'))
+        model = ModelInference(
+            model_id=args.model,
+            params={'max_new_tokens': 1000, 'temperature': 0},
+            credentials=Credentials(
+                url=os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com"),
+                api_key=os.getenv("WATSONX_API_KEY")
+            ),
+            project_id=os.getenv("WATSONX_PROJECT_ID")
+        )
+
+    header = f"{'scenario':<18}{'lines':>8}{'raw tok':>10}{'digest tok':>12}{'ratio':>8}{'prep ms':>10}"
+    if model:
+        header += f"{'raw e2e s':>12}{'digest e2e s':>14}"
+    print(header)
+    print('-' * len(header))
+
+    for name, files in scenarios.items():
+        raw = read_all(files)
+
+        start = time.perf_counter()
+        index = LogIndex()
+        for path in files:
+            index.add_file(path)
+        digest = index.digest(min_level=args.min_level)
+        prep_time = time.perf_counter() - start
+
+        raw_prompt = PROMPT.format(logs=raw)
+        digest_prompt = PROMPT.format(logs=digest)
+        raw_tokens = estimate_tokens(raw_prompt)
+        digest_tokens = estimate_tokens(digest_prompt)
+
+        row = (f"{name:<18}{index.lines:>8}{raw_tokens:>10}{digest_tokens:>12}"
+               f"{raw_tokens / digest_tokens:>7.1f}x{prep_time * 1000:>10.1f}")
+        if model:
+            raw_latency = generate(model, raw_prompt)
+            # Pre-processing time is part of the digest path's end-to-end latency
+            digest_latency = prep_time + generate(model, digest_prompt)
+            row += f"{raw_latency:>12.2f}{digest_latency:>14.2f}"
+        print(row)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,193 @@
+"""
+Indexed lookups of task credentials and deployments for the deployment script.
+
+The listings are fetched once per run, or read from an on-disk cache that is
+valid for `ttl` seconds, and indexed by name, ID and serving name. Checking
+whether a credential or serving name already exists is then a dictionary
+lookup instead of a full listing and linear scan. Deployments created during
+the run are added to the index directly.
+"""
+
+import contextlib
+import json
+import os
+import threading
+import time
+
+
+def _resources(details) -> list:
+    """Normalise SDK listing results ({"resources": [...]} or a plain list) to a list of dicts."""
+    if isinstance(details, dict):
+        details = details.get("resources", [])
+    return [item for item in details or [] if isinstance(item, dict)]
+
+
+def _serving_name(deployment: dict) -> str:
+    return deployment.get("entity", {}).get("online", {}).get("parameters", {}).get("serving_name", "")
+
+
+class WatsonxLookup:
+    """
+    Thread-safe, lazily loaded index of task credentials and deployments.
+    """
+
+    def __init__(self, client, cache_file: str = None, ttl: float = 0, scope: str = ""):
+        """
+        Initialize lookup layer.
+
+        Args:
+            client: APIClient with the default project or space set
+            cache_file: Optional JSON file used to share the listings across runs
+            ttl: Seconds the on-disk listings stay valid (0 disables the disk cache)
+            scope: Project or space ID; cached listings of another scope are ignored
+        """
+        self.client = client
+        self.cache_file = cache_file
+        self.ttl = ttl
+        self.scope = scope
+        # One lock per listing so fetching one does not block lookups in the other
+        self._credentials_lock = threading.Lock()
+        self._deployments_lock = threading.Lock()
+        self._file_lock = threading.Lock()
+        self._credentials = None
+        self._deployments = None
+        self.fetches = 0
+
+    def _read_cache(self, kind: str):
+        if not (self.cache_file and self.ttl and os.path.exists(self.cache_file)):
+            return None
+        try:
+            with open(self.cache_file, encoding="utf-8") as f:
+                entry = json.load(f).get(self.scope, {}).get(kind)
+        except (OSError, ValueError):
+            return None
+        if not entry or time.time() - entry.get("fetched", 0) > self.ttl:
+            return None
+        return entry["items"]
+
+    def _write_cache(self, kind: str, items: list):
+        if not (self.cache_file and self.ttl):
+            return
+        def store(data: dict):
+            data.setdefault(self.scope, {})[kind] = {"fetched": time.time(), "items": items}
+
+        with self._file_lock:
+            self._update_cache_file(store)
+
+    def _update_cache_file(self, change):
+        data = {}
+        if os.path.exists(self.cache_file):
+            try:
+                with open(self.cache_file, encoding="utf-8") as f:
+                    data = json.load(f)
+            except (OSError, ValueError):
+                data = {}
+        change(data)
+        tmp_path = f"{self.cache_file}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(tmp_path, self.cache_file)
+
+    def _load(self, kind: str, fetch) -> list:
+        items = self._read_cache(kind)
+        if items is None:
+            items = _resources(fetch())
+            self.fetches += 1
+            self._write_cache(kind, items)
+        return items
+
+    def _credential_index(self) -> dict:
+        with self._credentials_lock:
+            if self._credentials is None:
+                items = self._load("task_credentials", self.client.task_credentials.get_details)
+                index = {}
+                for item in items:
+                    metadata = item.get("metadata", {})
+                    for key in (metadata.get("name"), metadata.get("id")):
+                        if key:
+                            index[key] = item
+                self._credentials = index
+            return self._credentials
+
+    def _deployment_index(self) -> dict:
+        with self._deployments_lock:
+            if self._deployments is None:
+                items = self._load("deployments", lambda: self.client.deployments.get_details(get_all=True))
+                index = {"id": {}, "name": {}, "serving_name": {}}
+                for item in items:
+                    self._index_deployment(index, item)
+                self._deployments = index
+            return self._deployments
+
+    @staticmethod
+    def _index_deployment(index: dict, item: dict):
+        metadata = item.get("metadata", {})
+        if metadata.get("id"):
+            index["id"][metadata["id"]] = item
+        if metadata.get("name"):
+            index["name"].setdefault(metadata["name"], []).append(item)
+        serving_name = _serving_name(item)
+        if serving_name:
+            index["serving_name"][serving_name] = item
+
+    def task_credential(self, name_or_id: str):
+        """Return the task credential with this name or ID, or None."""
+        return self._credential_index().get(name_or_id)
+
+    def deployment(self, deployment_id: str):
+        """Return the deployment with this ID, or None."""
+        return self._deployment_index()["id"].get(deployment_id)
+
+    def deployment_by_serving_name(self, serving_name: str):
+        """Return the deployment that uses this serving name, or None."""
+        return self._deployment_index()["serving_name"].get(serving_name)
+
+    def deployments_by_name(self, name: str) -> list:
+        return list(self._deployment_index()["name"].get(name, []))
+
+    def serving_name_exists(self, serving_name: str) -> bool:
+        return self.deployment_by_serving_name(serving_name) is not None
+
+    def add_task_credential(self, details: dict):
+        """Record a task credential created during the run."""
+        index = self._credential_index()
+        with self._credentials_lock:
+            metadata = details.get("metadata", {}) if isinstance(details, dict) else {}
+            for key in (metadata.get("name"), metadata.get("id")):
+                if key:
+                    index[key] = details
+        self.invalidate_disk_cache("task_credentials")
+
+    def add_deployment(self, details: dict):
+        """Record a deployment created during the run."""
+        index = self._deployment_index()
+        with self._deployments_lock:
+            self._index_deployment(index, details)
+        self.invalidate_disk_cache("deployments")
+
+    def refresh_deployments(self):
+        """Fetch the deployment listing again on the next lookup, e.g. after a failed create."""
+        with self._deployments_lock:
+            self._deployments = None
+        self.invalidate_disk_cache("deployments")
+
+    @contextlib.contextmanager
+    def creating(self, kind: str):
+        """
+        Wrap a create call; if it fails, drop the listing from the on-disk cache.
+
+        A failed create may still have committed on the server, and a later run
+        must not miss the new resource in a cached listing.
+        """
+        try:
+            yield
+        except BaseException:
+            self.invalidate_disk_cache(kind)
+            raise
+
+    def invalidate_disk_cache(self, kind: str):
+        """Drop a listing from the on-disk cache so the next run fetches it again."""
+        if not (self.cache_file and self.ttl and os.path.exists(self.cache_file)):
+            return
+        with self._file_lock:
+            self._update_cache_file(lambda data: data.get(self.scope, {}).pop(kind, None))
@@ -0,0 +1,215 @@
+"""
+In-memory stand-in for the watsonx.ai clients used by the deployment script.
+
+FakePromptTemplateManager and FakeAPIClient mimic the parts of
+PromptTemplateManager, APIClient.deployments and APIClient.task_credentials
+that the script calls. Every call sleeps for a configurable latency and can
+fail with a transient error at a configurable rate, so deployment throughput
+and retry behaviour can be measured without credentials. A share of the
+failures of create calls can happen after the resource was created, like a
+gateway timeout after the server committed, which exposes duplicate
+prompts and deployments caused by blind retries.
+"""
+
+import random
+import threading
+import time
+import types
+import uuid
+
+
+class FakeWMLClientError(Exception):
+    """Mirrors ibm_watsonx_ai.wml_client_error.WMLClientError."""
+
+
+class FakeTransientError(Exception):
+    """Injected failure with a retryable HTTP status code."""
+
+    def __init__(self, operation: str, status_code: int = 503):
+        super().__init__(f"{operation} failed with status {status_code} (injected)")
+        self.status_code = status_code
+
+
+class FakeBackend:
+    """Shared latency and failure injection for all fake endpoints."""
+
+    def __init__(self, latency: float = 0.2, jitter: float = 0.5, failure_rate: float = 0.0, seed: int = 0,
+                 commit_failure_rate: float = 0.0):
+        """
+        Initialize fake backend.
+
+        Args:
+            latency: Mean seconds per API call
+            jitter: Relative latency spread (0.5 means +/-50%)
+            failure_rate: Probability that a call fails with a transient error
+            seed: Random seed, for reproducible runs
+            commit_failure_rate: Share of the failures of create calls that happen after the commit
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+        self.commit_failure_rate = commit_failure_rate
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = {}
+        self.failures = {}
+
+    def call(self, operation: str, creates: bool = False) -> bool:
+        """
+        Simulate the latency of a call and fail it before its side effect.
+
+        Args:
+            operation: Name used in the call and failure counters
+            creates: Whether the call creates a resource
+
+        Returns:
+            True if the caller must raise commit_failure() after creating the resource
+        """
+        with self._lock:
+            delay = self.latency * (1 + self.jitter * (2 * self._random.random() - 1))
+            fail = self._random.random() < self.failure_rate
+            after_commit = fail and creates and self._random.random() < self.commit_failure_rate
+            self.calls[operation] = self.calls.get(operation, 0) + 1
+            if fail:
+                self.failures[operation] = self.failures.get(operation, 0) + 1
+        time.sleep(max(delay, 0))
+        if fail and not after_commit:
+            raise FakeTransientError(operation)
+        return after_commit
+
+    @staticmethod
+    def commit_failure(operation: str) -> FakeTransientError:
+        """Error for a call whose resource was created but whose response was lost."""
+        return FakeTransientError(operation, status_code=504)
+
+
+class FakePromptTemplateManager:
+
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+        self.prompts = {}
+        self._lock = threading.Lock()
+
+    def store_prompt(self, prompt_template):
+        after_commit = self.backend.call("store_prompt", creates=True)
+        prompt_id = str(uuid.uuid4())
+        with self._lock:
+            self.prompts[prompt_id] = {"template": prompt_template, "locked": True, "created": time.time()}
+        if after_commit:
+            raise self.backend.commit_failure("store_prompt")
+        return types.SimpleNamespace(prompt_id=prompt_id)
+
+    def unlock(self, prompt_id: str):
+        self.backend.call("unlock")
+        with self._lock:
+            self.prompts[prompt_id]["locked"] = False
+
+    def load_prompt(self, prompt_id: str, astype=None):
+        self.backend.call("load_prompt")
+        template = self.prompts[prompt_id]["template"]
+        return template.get("input_text", "") if isinstance(template, dict) else str(template)
+
+    def list(self):
+        self.backend.call("list_prompts")
+        rows = [{"ID": prompt_id, "LAST MODIFIED": p["created"]} for prompt_id, p in self.prompts.items()]
+        try:
+            import pandas as pd
+        except ImportError:
+            return _Rows(rows)
+        return pd.DataFrame(rows, columns=["ID", "LAST MODIFIED"])
+
+
+class _Rows(list):
+    """Minimal DataFrame replacement when pandas is not installed."""
+
+    def sort_values(self, column, ascending=True):
+        return _Rows(sorted(self, key=lambda row: row[column], reverse=not ascending))
+
+
+class FakeDeployments:
+    ConfigurationMetaNames = types.SimpleNamespace(
+        NAME="name", ONLINE="online", BASE_MODEL_ID="base_model_id", SERVING_NAME="serving_name"
+    )
+
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+        self.resources = []
+        self._lock = threading.Lock()
+
+    def create(self, artifact_id: str, meta_props: dict) -> dict:
+        after_commit = self.backend.call("create_deployment", creates=True)
+        serving_name = meta_props.get("serving_name", "")
+        with self._lock:
+            if serving_name and any(_serving(r) == serving_name for r in self.resources):
+                raise FakeWMLClientError(f"Serving name '{serving_name}' is already in use")
+            details = {
+                "metadata": {"id": str(uuid.uuid4()), "name": meta_props.get("name", "")},
+                "entity": {
+                    "online": {"parameters": {"serving_name": serving_name}},
+                    "prompt_template": {"id": artifact_id},
+                    "base_model_id": meta_props.get("base_model_id"),
+                },
+            }
+            self.resources.append(details)
+        if after_commit:
+            raise self.backend.commit_failure("create_deployment")
+        return details
+
+    def get_details(self, deployment_id: str = None, get_all: bool = False) -> dict:
+        self.backend.call("get_deployments")
+        with self._lock:
+            if deployment_id:
+                return next(r for r in self.resources if r["metadata"]["id"] == deployment_id)
+            return {"resources": list(self.resources)}
+
+    def list(self):
+        return [(r["metadata"]["id"], r["metadata"]["name"]) for r in self.get_details()["resources"]]
+
+
+class FakeTaskCredentials:
+
+    def __init__(self, backend: FakeBackend):
+        self.backend = backend
+        self.resources = []
+        self._lock = threading.Lock()
+
+    def store(self, name: str) -> dict:
+        self.backend.call("store_task_credential")
+        with self._lock:
+            if self.resources:
+                raise FakeWMLClientError("Task Credentials have already been stored for this user")
+            details = {"metadata": {"id": str(uuid.uuid4()), "name": name}}
+            self.resources.append(details)
+        return details
+
+    def get_details(self) -> dict:
+        self.backend.call("get_task_credentials")
+        with self._lock:
+            return {"resources": list(self.resources)}
+
+    def list(self):
+        return self.get_details()["resources"]
+
+
+class FakeAPIClient:
+
+    def __init__(self, backend: FakeBackend):
+        self.deployments = FakeDeployments(backend)
+        self.task_credentials = FakeTaskCredentials(backend)
+
+
+def _serving(deployment: dict) -> str:
+    return deployment["entity"]["online"]["parameters"]["serving_name"]
+
+
+def create_fake_clients(latency: float = 0.2, failure_rate: float = 0.0, seed: int = 0,
+                        commit_failure_rate: float = 0.0):
+    """
+    Create a fake PromptTemplateManager and APIClient sharing one backend.
+
+    Returns:
+        Tuple of (prompt manager, API client, backend)
+    """
+    backend = FakeBackend(latency=latency, failure_rate=failure_rate, seed=seed,
+                          commit_failure_rate=commit_failure_rate)
+    return FakePromptTemplateManager(backend), FakeAPIClient(backend), backend
@@ -1,140 +1,520 @@
-print("=== Importing Libaries ===")
-from ibm_watsonx_ai.foundation_models.prompts import PromptTemplateManager, PromptTemplate
-from ibm_watsonx_ai.foundation_models.utils.enums import ModelTypes, DecodingMethods, PromptTemplateFormats
-from ibm_watsonx_ai.metanames import GenTextParamsMetaNames as GenParams
+"""
+Deploy the prompt templates listed in a manifest to watsonx.ai.
+
+Each template goes through the steps store -> unlock -> load -> deploy.
+Templates are processed concurrently, and the task credential is resolved
+in parallel with the first steps. Progress is written to a local state file
+after every step, so a failed run resumes where it stopped. Templates whose
+content hash is already deployed are skipped. A per-step timing report is
+printed at the end. Steps failing with a transient error (429, 5xx, connection
+errors) are retried with exponential backoff. Steps that create a resource are
+not retried blindly: a failed deployment is only retried if no deployment with
+its serving name exists yet, and a failed prompt store is left to the next run.
+
+--dry-run and --bench run the same pipeline against the in-memory API
+stand-in of fake_watsonx.py, with configurable latency and failure rate, so
+throughput and retry behaviour can be measured without credentials.
+
+Usage:
+    python python-script-watsonx-prompt-deployment.py [--manifest prompt-templates.json] [--workers 4]
+    python python-script-watsonx-prompt-deployment.py --bench 50 --fake-latency 0.2 --fake-failure-rate 0.05
+"""
+
+import argparse
+import hashlib
+import json
 import os
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from deployment_lookup import WatsonxLookup
 
-print("=== Reading environment variables ===")
-watsonx_apikey = os.getenv("WATSONX_API_KEY")
-watsonx_url = os.getenv("WATSONX_URL")
-project_id = os.getenv("WATSONX_PROJECT_ID")
-watsonx_task_credential = os.getenv("WATSONX_TASK_CREDENTIAL")
-credentials = {
-    "apikey": watsonx_apikey,
-    "url": watsonx_url
-}   
-
-print("=== PreparingPromptTemplateManager ===")
-prompt_mgr = PromptTemplateManager(credentials=credentials,
-                                   project_id=project_id)
-
-print("=== Define prompt template === ")
-#Adjust parameters as needed: https://ibm.github.io/watsonx-ai-python-sdk/v1.4.7/prompt_template_manager.html
-prompt_template = PromptTemplate(name="New Prompt Template created by CICD",
-                                 model_id="ibm/granite-3-3-8b-instruct",
-                                 model_params = {GenParams.DECODING_METHOD: "sample"},
-                                 description="My example",
-                                 task_ids=["generation"],
-                                 input_variables=["object"],
-                                 instruction="Answer on the following question",
-                                 input_prefix="Human",
-                                 output_prefix="Assistant",
-                                 input_text="What is {object} and how does it work?",
-                                 examples=[["What is a loan and how does it work?", 
-                                            "A loan is a debt that is repaid with interest over time."]]
-                                )
-
-print("=== Store Defined prompt template in Project  === ")
-stored_prompt_template = prompt_mgr.store_prompt(prompt_template=prompt_template)
-print(stored_prompt_template)
-
-print("=== Stored prompt template ID === ")
-prompt_id = stored_prompt_template.prompt_id
-print(f"Stored prompt template ID: {prompt_id}")
-
-print("=== Unlock stored prompt template for editing   === ")
-#Unlock stored prompt template for editing 
-prompt_mgr.unlock(prompt_id=stored_prompt_template.prompt_id)
-print(f"promptid {prompt_id} directly unlocked for editing.")
-
-#Update existing prompt template with new name
-# print("=== Update prompt template  === ")
-# updated_prompt_template = PromptTemplate(name="New name")
-# prompt_mgr.update_prompt(prompt_id, updated_prompt_template)
-# print("Prompt template name updated.")
-
-#Initialize API client
-from ibm_watsonx_ai import APIClient
-client = APIClient(wml_credentials=credentials)
-client.set.default_project(project_id)
-
-#Load prompt templates
-prompt_input_text = prompt_mgr.load_prompt(prompt_id=stored_prompt_template.prompt_id, 
-                                           astype=PromptTemplateFormats.STRING)
-
-print("=== List prompt templates in Project  === ")
-df_prompts = prompt_mgr.list()
-df_prompts.sort_values("LAST MODIFIED", ascending=False)
-print(df_prompts)
-
-print("=== User Task Credentails Configuration  === ")
-#Task credentails: https://www.ibm.com/docs/en/watsonx/saas?topic=projects-managing-task-credentials#accessing-task-credentials
-from ibm_watsonx_ai.wml_client_error import WMLClientError
-
-#Create or retrieve task credentials
-TARGET_NAME = "wx task credentials"
-
-# Try to create new task credentials
 try:
-    print("Creating new task credential...")
-    task_credential = client.task_credentials.store(TARGET_NAME)
-
-except WMLClientError as e:
-    # Handle "already exists" case gracefully
-    if "Task Credentials have already been stored" in str(e):
-        print("Task credential already exists, retrieving it instead...")
-
-        # Find existing credentials
-        creds = client.task_credentials.list()
-        existing = None
-        for c in creds:
-            if isinstance(c, dict) and c.get("metadata", {}).get("name") == TARGET_NAME:
-                existing = c
-
-        if existing:
-            task_credential = existing
-        else:
-            # Fallback — list may not return credentials if running in a SPACE
-            print("Warning: credential exists but not visible in this scope.")
-            task_credential = {"name": TARGET_NAME}
+    from requests.exceptions import ChunkedEncodingError, ConnectionError as RequestsConnectionError, Timeout
+    # The SDK talks HTTP through requests; these do not subclass the builtin errors
+    REQUESTS_TRANSIENT_ERRORS = (RequestsConnectionError, Timeout, ChunkedEncodingError)
+except ImportError:
+    # --dry-run / --bench without requests installed
+    REQUESTS_TRANSIENT_ERRORS = ()
 
-    else:
-        # Other errors should not be ignored
+
+SCRIPT_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_MANIFEST = os.path.join(SCRIPT_DIR, "prompt-templates.json")
+DEFAULT_STATE_FILE = os.path.join(SCRIPT_DIR, ".deploy_state.json")
+DEFAULT_LOOKUP_CACHE = os.path.join(SCRIPT_DIR, ".lookup_cache.json")
+STEPS = ("store", "unlock", "load", "deploy")
+TRANSIENT_STATUS_CODES = {429, 500, 502, 503, 504}
+
+
+def template_hash(spec: dict) -> str:
+    """Content hash of a template definition, including its deployment settings."""
+    return hashlib.sha256(json.dumps(spec, sort_keys=True).encode()).hexdigest()
+
+
+class DeploymentState:
+    """
+    Thread-safe record of finished steps, persisted after every update.
+
+    The state of a template is only reused while its content hash is unchanged;
+    an edited template starts over with a new prompt and deployment.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self.templates = {}
+        if os.path.exists(path):
+            try:
+                with open(path, encoding="utf-8") as f:
+                    self.templates = json.load(f).get("templates", {})
+            except (OSError, ValueError):
+                print(f"Warning: ignoring unreadable state file {path}")
+
+    def get(self, name: str, content_hash: str) -> dict:
+        with self._lock:
+            entry = self.templates.get(name)
+            if entry is None or entry.get("hash") != content_hash:
+                entry = self.templates[name] = {"hash": content_hash}
+            return dict(entry)
+
+    def update(self, name: str, **values):
+        with self._lock:
+            self.templates[name].update(values)
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump({"templates": self.templates}, f, indent=2)
+            os.replace(tmp_path, self.path)
+
+
+def is_transient(error: Exception) -> bool:
+    """Whether an API error is worth retrying (rate limiting, server errors, connection problems)."""
+    if isinstance(error, (ConnectionError, TimeoutError) + REQUESTS_TRANSIENT_ERRORS):
+        return True
+    status_code = getattr(error, "status_code", None) or getattr(getattr(error, "response", None), "status_code", None)
+    return status_code in TRANSIENT_STATUS_CODES
+
+
+class StepTimer:
+    """Collects the duration and outcome of every pipeline step, retrying transient failures."""
+
+    def __init__(self, retries: int = 3, backoff: float = 1.0):
+        """
+        Initialize step timer.
+
+        Args:
+            retries: Retries of a step that failed with a transient error
+            backoff: Seconds before the first retry, doubled for every further retry
+        """
+        self.retries = retries
+        self.backoff = backoff
+        self._lock = threading.Lock()
+        self.records = []
+
+    def run(self, template: str, step: str, fn, *args, idempotent: bool = True, recover=None, **kwargs):
+        """
+        Run a step, retrying transient errors.
+
+        A step that creates a resource may have succeeded on the server even
+        though the call failed (e.g. a 504 or a read timeout after the commit).
+        Such steps pass idempotent=False and are only retried if `recover`
+        finds no resource created by the failed attempt; without `recover`
+        they are not retried at all. A transient failure of `recover` itself
+        uses up one more retry, and the last attempt still calls `recover`
+        before giving up.
+
+        Args:
+            template: Template name for the report
+            step: Step name for the report
+            fn: API call
+            idempotent: Whether the call can safely be repeated
+            recover: Callable returning the resource a failed attempt created, or None
+        """
+        attempt = 0
+        while True:
+            start = time.perf_counter()
+            try:
+                result = fn(*args, **kwargs)
+            except Exception as e:
+                if not is_transient(e) or not (idempotent or recover is not None):
+                    self._add(template, step, time.perf_counter() - start, "failed")
+                    raise
+                if not idempotent:
+                    try:
+                        created, attempt = self._recover(recover, attempt)
+                    except Exception:
+                        self._add(template, step, time.perf_counter() - start, "failed")
+                        raise
+                    if created is not None:
+                        self._add(template, step, time.perf_counter() - start, "recovered")
+                        return created
+                if attempt >= self.retries:
+                    self._add(template, step, time.perf_counter() - start, "failed")
+                    raise
+                self._add(template, step, time.perf_counter() - start, "retry")
+                time.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+                continue
+            self._add(template, step, time.perf_counter() - start, "done")
+            return result
+
+    def _recover(self, recover, attempt: int):
+        """Call `recover`, retrying its transient errors; returns (resource or None, attempts used)."""
+        while True:
+            try:
+                return recover(), attempt
+            except Exception as e:
+                if attempt >= self.retries or not is_transient(e):
+                    raise
+                time.sleep(self.backoff * 2 ** attempt)
+                attempt += 1
+
+    @property
+    def retry_count(self) -> int:
+        return sum(1 for record in self.records if record[3] == "retry")
+
+    @property
+    def recovered_count(self) -> int:
+        return sum(1 for record in self.records if record[3] == "recovered")
+
+    def skip(self, template: str, step: str):
+        self._add(template, step, 0.0, "skipped")
+
+    def _add(self, template: str, step: str, seconds: float, status: str):
+        with self._lock:
+            self.records.append((template, step, seconds, status))
+
+    def report(self, total_seconds: float) -> str:
+        lines = [f"{'template':45} {'step':18} {'status':8} {'seconds':>8}"]
+        for template, step, seconds, status in self.records:
+            lines.append(f"{template[:45]:45} {step:18} {status:8} {seconds:8.2f}")
+        busy = sum(seconds for _, _, seconds, _ in self.records)
+        lines.append(f"Total wall time {total_seconds:.2f}s, sum of step times {busy:.2f}s, "
+                     f"{self.retry_count} retried call(s), {self.recovered_count} recovered after a failed call")
+        return "\n".join(lines)
+
+
+def create_clients(credentials: dict, project_id: str):
+    """Create the PromptTemplateManager and APIClient for a project."""
+    from ibm_watsonx_ai import APIClient
+    from ibm_watsonx_ai.foundation_models.prompts import PromptTemplateManager
+
+    prompt_mgr = PromptTemplateManager(credentials=credentials, project_id=project_id)
+    client = APIClient(wml_credentials=credentials)
+    client.set.default_project(project_id)
+    return prompt_mgr, client
+
+
+def resolve_task_credential(client, target_name: str, lookup: WatsonxLookup):
+    """Reuse the task credential if it exists, otherwise create it."""
+    # Task credentials: https://www.ibm.com/docs/en/watsonx/saas?topic=projects-managing-task-credentials#accessing-task-credentials
+    try:
+        from ibm_watsonx_ai.wml_client_error import WMLClientError
+    except ImportError:
+        # --dry-run / --bench without the SDK installed
+        from fake_watsonx import FakeWMLClientError as WMLClientError
+
+    existing = lookup.task_credential(target_name)
+    if existing:
+        print("Task credential already exists, reusing it")
+        return existing
+
+    try:
+        print("Creating new task credential...")
+        with lookup.creating("task_credentials"):
+            task_credential = client.task_credentials.store(target_name)
+    except WMLClientError as e:
+        # Handle "already exists" case gracefully
+        if "Task Credentials have already been stored" in str(e):
+            # The listing may not return credentials if running in a SPACE
+            print("Warning: credential exists but not visible in this scope.")
+            return {"name": target_name}
         print("Unexpected error while creating task credential:")
         print(e)
-        task_credential = None  # or exit if needed
-print("Using task credential:", task_credential)
+        return None
+    lookup.add_task_credential(task_credential)
+    return task_credential
+
+
+def _deployed_artifact_id(deployment: dict) -> str:
+    entity = deployment.get("entity", {})
+    return entity.get("prompt_template", {}).get("id") or entity.get("asset", {}).get("id", "")
+
+
+def build_prompt_template(spec: dict):
+    from ibm_watsonx_ai.foundation_models.prompts import PromptTemplate
+
+    # Adjust parameters as needed: https://ibm.github.io/watsonx-ai-python-sdk/v1.4.7/prompt_template_manager.html
+    return PromptTemplate(
+        name=spec["name"],
+        model_id=spec["model_id"],
+        model_params=spec.get("model_params", {}),
+        description=spec.get("description", ""),
+        task_ids=spec.get("task_ids", ["generation"]),
+        input_variables=spec.get("input_variables", []),
+        instruction=spec.get("instruction", ""),
+        input_prefix=spec.get("input_prefix", ""),
+        output_prefix=spec.get("output_prefix", ""),
+        input_text=spec.get("input_text", ""),
+        examples=spec.get("examples", []),
+    )
+
+
+def load_prompt_text(prompt_mgr, prompt_id: str):
+    from ibm_watsonx_ai.foundation_models.utils.enums import PromptTemplateFormats
+
+    return prompt_mgr.load_prompt(prompt_id=prompt_id, astype=PromptTemplateFormats.STRING)
+
+
+class DeploymentPipeline:
+    """Runs the deployment steps of all templates of a manifest."""
+
+    def __init__(self, prompt_mgr, client, state: DeploymentState, timer: StepTimer, workers: int = 4,
+                 build_template=build_prompt_template, load_prompt=load_prompt_text, lookup: WatsonxLookup = None):
+        self.prompt_mgr = prompt_mgr
+        self.client = client
+        self.lookup = lookup or WatsonxLookup(client)
+        self.state = state
+        self.timer = timer
+        self.workers = workers
+        self.build_template = build_template
+        self.load_prompt = load_prompt
+
+    def deploy_template(self, spec: dict, task_credential_future) -> dict:
+        name = spec["name"]
+        entry = self.state.get(name, template_hash(spec))
+        if entry.get("deployment_id"):
+            for step in STEPS:
+                self.timer.skip(name, step)
+            print(f"[{name}] unchanged, already deployed as {entry['deployment_id']}")
+            return entry
+
+        if entry.get("prompt_id"):
+            self.timer.skip(name, "store")
+        else:
+            # Prompts cannot be matched reliably to a failed attempt, so a failed store is
+            # not retried in this run; the next run stores the template again
+            stored = self.timer.run(name, "store", self.prompt_mgr.store_prompt,
+                                    prompt_template=self.build_template(spec), idempotent=False)
+            entry["prompt_id"] = stored.prompt_id
+            self.state.update(name, prompt_id=stored.prompt_id)
+            print(f"[{name}] stored prompt template {stored.prompt_id}")
+
+        if entry.get("unlocked"):
+            self.timer.skip(name, "unlock")
+        else:
+            self.timer.run(name, "unlock", self.prompt_mgr.unlock, prompt_id=entry["prompt_id"])
+            self.state.update(name, unlocked=True)
+            print(f"[{name}] prompt template {entry['prompt_id']} unlocked for editing")
+
+        if entry.get("loaded"):
+            self.timer.skip(name, "load")
+        else:
+            self.timer.run(name, "load", self.load_prompt, self.prompt_mgr, entry["prompt_id"])
+            self.state.update(name, loaded=True)
+
+        # The deployment needs the task credential; wait for it only now
+        task_credential_future.result()
+
+        deployment = spec.get("deployment", {})
+        # Keep the serving name across resumed runs so a retried deployment does not get a new one
+        serving_name = entry.get("serving_name") or deployment.get("serving_name") \
+            or "prompt_serving_name_" + os.urandom(4).hex()
+
+        existing = self.timer.run(name, "lookup", self.lookup.deployment_by_serving_name, serving_name)
+        if existing is not None:
+            if _deployed_artifact_id(existing) == entry["prompt_id"]:
+                # A previous run created the deployment but stopped before recording it
+                deployment_id = existing["metadata"]["id"]
+                self.timer.skip(name, "deploy")
+                self.state.update(name, serving_name=serving_name, deployment_id=deployment_id)
+                print(f"[{name}] found existing deployment {deployment_id} (serving name {serving_name})")
+                entry.update(serving_name=serving_name, deployment_id=deployment_id)
+                return entry
+            if deployment.get("serving_name"):
+                raise ValueError(f"serving name {serving_name} is already used by another deployment")
+            serving_name = "prompt_serving_name_" + os.urandom(4).hex()
+        self.state.update(name, serving_name=serving_name)
+
+        meta_names = self.client.deployments.ConfigurationMetaNames
+        meta_props = {
+            meta_names.NAME: deployment.get("name", name),
+            meta_names.ONLINE: {},
+            meta_names.BASE_MODEL_ID: deployment.get("base_model_id", spec["model_id"]),
+            meta_names.SERVING_NAME: serving_name,
+        }
+
+        def find_created_deployment():
+            # A failed create may still have committed; the serving name identifies it
+            self.lookup.refresh_deployments()
+            created = self.lookup.deployment_by_serving_name(serving_name)
+            if created is not None and _deployed_artifact_id(created) == entry["prompt_id"]:
+                return created
+            return None
+
+        with self.lookup.creating("deployments"):
+            details = self.timer.run(name, "deploy", self.client.deployments.create,
+                                     artifact_id=entry["prompt_id"], meta_props=meta_props,
+                                     idempotent=False, recover=find_created_deployment)
+        deployment_id = details["metadata"]["id"]
+        self.lookup.add_deployment(details)
+        self.state.update(name, deployment_id=deployment_id)
+        print(f"[{name}] deployed as {deployment_id} (serving name {serving_name})")
+        entry.update(serving_name=serving_name, deployment_id=deployment_id)
+        return entry
 
+    def run(self, manifest: dict) -> dict:
+        """
+        Deploy all templates of a manifest.
 
-print("=== List all deployments before Deployment  === ")
-df_deployments = client.deployments.list()
-print(df_deployments)
+        Returns:
+            Mapping of template name to its state entry, or to the exception it failed with
+        """
+        templates = manifest["templates"]
+        results = {}
+        pending = [spec for spec in templates
+                   if not self.state.get(spec["name"], template_hash(spec)).get("deployment_id")]
+        if not pending:
+            print("All templates are already deployed")
 
-print("=== Define and Print Deployment Meta Data  === ")
+        with ThreadPoolExecutor(max_workers=self.workers + 1) as executor:
+            task_credential_future = None
+            if pending:
+                task_credential_future = executor.submit(
+                    self.timer.run, "(shared)", "task_credential", resolve_task_credential,
+                    self.client, manifest.get("task_credential_name", "wx task credentials"), self.lookup
+                )
+            futures = {
+                spec["name"]: executor.submit(self.deploy_template, spec, task_credential_future)
+                for spec in templates
+            }
+            for name, future in futures.items():
+                try:
+                    results[name] = future.result()
+                except Exception as e:
+                    print(f"[{name}] failed: {e}")
+                    results[name] = e
+            if task_credential_future is not None:
+                try:
+                    print("Using task credential:", task_credential_future.result())
+                except Exception as e:
+                    print("Task credential could not be resolved:", e)
+        return results
+
+
+def bench_manifest(manifest: dict, count: int) -> dict:
+    """Copy the manifest's templates round-robin into `count` templates with distinct names."""
+    templates = []
+    for i in range(count):
+        spec = json.loads(json.dumps(manifest["templates"][i % len(manifest["templates"])]))
+        spec["name"] = f"{spec['name']} #{i + 1}"
+        spec.get("deployment", {}).pop("serving_name", None)
+        templates.append(spec)
+    return dict(manifest, templates=templates)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Deploy watsonx.ai prompt templates from a manifest.")
+    parser.add_argument("--manifest", default=DEFAULT_MANIFEST, help="JSON manifest of prompt templates")
+    parser.add_argument("--state-file", default=DEFAULT_STATE_FILE, help="State file used to resume runs")
+    parser.add_argument("--workers", type=int, default=4, help="Templates processed concurrently")
+    parser.add_argument("--lookup-cache", default=DEFAULT_LOOKUP_CACHE,
+                        help="File caching the credential and deployment listings across runs")
+    parser.add_argument("--lookup-ttl", type=float, default=0,
+                        help="Seconds the cached listings stay valid; 0 fetches them once per run")
+    parser.add_argument("--list", action="store_true", help="Print all prompt templates and deployments at the end")
+    parser.add_argument("--retries", type=int, default=3, help="Retries of a step that failed with a transient error")
+    parser.add_argument("--backoff", type=float, default=1.0, help="Seconds before the first retry, doubled per retry")
+    offline = parser.add_argument_group("offline runs against the in-memory API stand-in (no credentials needed)")
+    offline.add_argument("--dry-run", action="store_true", help="Deploy the manifest to the stand-in")
+    offline.add_argument("--bench", type=int, metavar="N", help="Deploy N copies of the manifest's templates to the stand-in")
+    offline.add_argument("--fake-latency", type=float, default=0.2, help="Mean seconds per stand-in API call")
+    offline.add_argument("--fake-failure-rate", type=float, default=0.0,
+                         help="Probability that a stand-in API call fails with a transient error")
+    offline.add_argument("--fake-commit-failure-rate", type=float, default=0.0,
+                         help="Share of the injected failures of create calls that happen after the resource was created")
+    offline.add_argument("--seed", type=int, default=0, help="Random seed of the stand-in")
+    offline.add_argument("--min-throughput", type=float, default=0,
+                         help="Fail the benchmark below this many templates per second")
+    args = parser.parse_args()
+    offline_run = args.dry_run or args.bench is not None
+
+    print("=== Reading environment variables ===")
+    watsonx_apikey = os.getenv("WATSONX_API_KEY")
+    watsonx_url = os.getenv("WATSONX_URL")
+    project_id = os.getenv("WATSONX_PROJECT_ID")
+    credentials = {
+        "apikey": watsonx_apikey,
+        "url": watsonx_url
+    }
+
+    with open(args.manifest, encoding="utf-8") as f:
+        manifest = json.load(f)
+    if args.bench is not None:
+        manifest = bench_manifest(manifest, args.bench)
+    print(f"=== Deploying {len(manifest['templates'])} prompt template(s) from {args.manifest} ===")
+
+    start = time.perf_counter()
+    timer = StepTimer(args.retries, args.backoff)
+    if offline_run:
+        from fake_watsonx import create_fake_clients
+
+        print(f"=== Offline run: latency {args.fake_latency}s, failure rate {args.fake_failure_rate} ===")
+        prompt_mgr, client, backend = create_fake_clients(args.fake_latency, args.fake_failure_rate, args.seed,
+                                                          args.fake_commit_failure_rate)
+        # Never resume from or write to the real state file unless one is given explicitly
+        state_file = args.state_file if args.state_file != DEFAULT_STATE_FILE \
+            else os.path.join(tempfile.mkdtemp(), "deploy_state.json")
+        pipeline = DeploymentPipeline(prompt_mgr, client, DeploymentState(state_file), timer, args.workers,
+                                      build_template=dict, load_prompt=lambda mgr, prompt_id: mgr.load_prompt(prompt_id))
+    else:
+        prompt_mgr, client = timer.run("(shared)", "client_setup", create_clients, credentials, project_id)
+        lookup = WatsonxLookup(client, args.lookup_cache, args.lookup_ttl, scope=project_id or "")
+        pipeline = DeploymentPipeline(prompt_mgr, client, DeploymentState(args.state_file), timer, args.workers,
+                                      lookup=lookup)
+    results = pipeline.run(manifest)
+    if args.bench is not None and any(isinstance(result, Exception) for result in results.values()):
+        # Failed templates resume on the next run; the benchmark resumes them once in-process
+        print("=== Resuming failed templates ===")
+        results = pipeline.run(manifest)
 
-# define serving_variable for meta_props with a random suffix to avoid name conflicts
-prompt_serving_name_variable = "prompt_serving_name_" + os.urandom(4).hex()
-print(f"Using serving name: {prompt_serving_name_variable}")
+    if args.list:
+        print("=== List prompt templates in Project === ")
+        df_prompts = timer.run("(shared)", "list_prompts", prompt_mgr.list)
+        print(df_prompts.sort_values("LAST MODIFIED", ascending=False))
 
-meta_props = {
-    client.deployments.ConfigurationMetaNames.NAME: "Prompt Template deployed by CICD",
-    client.deployments.ConfigurationMetaNames.ONLINE: {},
-    client.deployments.ConfigurationMetaNames.BASE_MODEL_ID: "ibm/granite-3-8b-instruct",
-    client.deployments.ConfigurationMetaNames.SERVING_NAME: prompt_serving_name_variable,
-}
-print(meta_props)
+        print("=== List all Deployments after Deployment === ")
+        print(timer.run("(shared)", "list_deployments", client.deployments.list))
 
-print("=== Create Deployment with Deployment metadata  === ")
-deployment_details = client.deployments.create(artifact_id=stored_prompt_template.prompt_id, meta_props=meta_props)
-print("=== Deployment details === ")
-print(deployment_details)
-print("=== Deployment ID === ")
-deployment_id = deployment_details['metadata']['id']
-print(f"Deployment ID: {deployment_id}")
+    elapsed = time.perf_counter() - start
+    print("=== Step timings ===")
+    print(timer.report(elapsed))
 
+    failed = [name for name, result in results.items() if isinstance(result, Exception)]
+    if offline_run:
+        throughput = (len(results) - len(failed)) / elapsed if elapsed else 0.0
+        print("=== Offline run summary ===")
+        print(f"Templates deployed {len(results) - len(failed)}/{len(results)} in {elapsed:.2f}s "
+              f"({throughput:.2f}/s) with {args.workers} worker(s)")
+        print(f"API calls {sum(backend.calls.values())}, injected failures {sum(backend.failures.values())}, "
+              f"retried calls {timer.retry_count}, recovered {timer.recovered_count}")
+        deployed = len(results) - len(failed)
+        duplicates = (len(prompt_mgr.prompts) - deployed, len(client.deployments.resources) - deployed)
+        print(f"Prompts stored {len(prompt_mgr.prompts)}, deployments created {len(client.deployments.resources)} "
+              f"for {deployed} deployed template(s)")
+        if any(duplicates):
+            print(f"=== {duplicates[0]} orphaned prompt(s) and {duplicates[1]} duplicate deployment(s) ===")
+        if args.bench is not None and throughput < args.min_throughput:
+            print(f"=== Throughput below --min-throughput {args.min_throughput}/s ===")
+            return 1
+    if failed:
+        print(f"=== {len(failed)} template(s) failed; rerun to resume: {', '.join(failed)} ===")
+        return 1
+    print("=== Done === ")
+    return 0
 
-print("=== List all Deployments after Deployment  === ")
-df_deployments = client.deployments.list()
-print(df_deployments)
 
-print("=== Done === ")
\ No newline at end of file
+if __name__ == "__main__":
+    sys.exit(main())
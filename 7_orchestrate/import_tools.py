@@ -0,0 +1,179 @@
+"""
+Import the support tools and the orchestrator agent into the active
+watsonx Orchestrate environment.
+
+Tools are imported in parallel by a bounded worker pool. A manifest stores
+the content hash of each tool and of the agent after a successful import,
+so unchanged files are skipped on the next run. A tool's hash also covers
+the shared modules it is built from (flow_factory.py, domains.py).
+
+Usage:
+    python import_tools.py [--workers 4] [--force] [--orchestrate "python orchestrate_stub.py"]
+"""
+
+import argparse
+import glob
+import hashlib
+import json
+import os
+import shlex
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.join(BASE_DIR, "tools")
+AGENT_FILE = os.path.join(BASE_DIR, "agents", "orchestrating_agent", "customer_service_orchestrator.yaml")
+MANIFEST_FILE = os.path.join(BASE_DIR, ".import_manifest.json")
+SHARED_MODULES = ("flow_factory.py", "domains.py")
+
+
+@dataclass
+class ImportResult:
+    name: str
+    path: str
+    status: str  # "imported", "unchanged" or "failed"
+    seconds: float = 0.0
+    output: str = ""
+
+
+def content_hash(*paths: str) -> str:
+    digest = hashlib.sha256()
+    for path in paths:
+        digest.update(os.path.basename(path).encode())
+        with open(path, "rb") as f:
+            digest.update(f.read())
+    return digest.hexdigest()
+
+
+def _manifest_key() -> str:
+    # Imports are tracked per orchestrate instance
+    return os.getenv("WO_INSTANCE", "local")
+
+
+def load_manifest(path: str = MANIFEST_FILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(_manifest_key(), {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_manifest(entries: dict, path: str = MANIFEST_FILE):
+    data = {}
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+    data[_manifest_key()] = entries
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+def run_import(orchestrate: list[str], args: list[str], name: str, path: str, timeout: float) -> ImportResult:
+    start = time.perf_counter()
+    try:
+        completed = subprocess.run(orchestrate + args, capture_output=True, text=True, timeout=timeout, cwd=BASE_DIR)
+    except (OSError, subprocess.TimeoutExpired) as e:
+        return ImportResult(name, path, "failed", time.perf_counter() - start, str(e))
+    output = (completed.stdout + completed.stderr).strip()
+    status = "imported" if completed.returncode == 0 else "failed"
+    return ImportResult(name, path, status, time.perf_counter() - start, output)
+
+
+def import_all(orchestrate: list[str], workers: int = 4, force: bool = False, timeout: float = 300,
+               manifest_file: str = MANIFEST_FILE) -> list[ImportResult]:
+    """
+    Import changed tools in parallel, then the agent.
+
+    Args:
+        orchestrate: Command used to call the orchestrate CLI
+        workers: Maximum number of concurrent tool imports
+        force: Import all files even if they are unchanged
+        timeout: Timeout per import in seconds
+        manifest_file: JSON file with the content hashes of the last import
+
+    Returns:
+        One result per tool plus one for the agent
+    """
+    manifest = load_manifest(manifest_file)
+    shared = [os.path.join(TOOLS_DIR, module) for module in SHARED_MODULES
+              if os.path.exists(os.path.join(TOOLS_DIR, module))]
+
+    pending, results, hashes = [], [], {}
+    for path in sorted(glob.glob(os.path.join(TOOLS_DIR, "support_*.py"))):
+        name = os.path.splitext(os.path.basename(path))[0]
+        hashes[name] = content_hash(path, *shared)
+        if not force and manifest.get(name) == hashes[name]:
+            results.append(ImportResult(name, path, "unchanged"))
+        else:
+            pending.append((name, path))
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [
+            executor.submit(run_import, orchestrate, ["tools", "import", "-f", path, "--kind", "flow"], name, path, timeout)
+            for name, path in pending
+        ]
+        results.extend(future.result() for future in futures)
+
+    for result in results:
+        if result.status == "imported":
+            manifest[result.name] = hashes[result.name]
+        elif result.status == "failed":
+            manifest.pop(result.name, None)
+
+    # The agent references the tools by name, so it is imported only once they all exist
+    agent_name = "agent:" + os.path.splitext(os.path.basename(AGENT_FILE))[0]
+    agent_hash = content_hash(AGENT_FILE)
+    if any(result.status == "failed" for result in results):
+        results.append(ImportResult(agent_name, AGENT_FILE, "failed", output="skipped: tool imports failed"))
+    elif not force and manifest.get(agent_name) == agent_hash:
+        results.append(ImportResult(agent_name, AGENT_FILE, "unchanged"))
+    else:
+        agent_result = run_import(orchestrate, ["agents", "import", "-f", AGENT_FILE], agent_name, AGENT_FILE, timeout)
+        results.append(agent_result)
+        if agent_result.status == "imported":
+            manifest[agent_name] = agent_hash
+
+    save_manifest(manifest, manifest_file)
+    return results
+
+
+def print_summary(results: list[ImportResult], total_seconds: float):
+    print(f"{'name':40} {'status':10} {'time':>8}")
+    for result in results:
+        print(f"{result.name:40} {result.status:10} {result.seconds:7.1f}s")
+    failed = [result for result in results if result.status == "failed"]
+    counts = {status: sum(r.status == status for r in results) for status in ("imported", "unchanged", "failed")}
+    print(f"\n{counts['imported']} imported, {counts['unchanged']} unchanged, {counts['failed']} failed "
+          f"in {total_seconds:.1f}s (sum of import times {sum(r.seconds for r in results):.1f}s)")
+    for result in failed:
+        print(f"\n--- {result.name} failed ---\n{result.output}")
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="Import support tools and the orchestrator agent.")
+    parser.add_argument("--workers", type=int, default=4, help="Maximum number of parallel tool imports")
+    parser.add_argument("--force", action="store_true", help="Import unchanged files as well")
+    parser.add_argument("--timeout", type=float, default=300, help="Timeout per import in seconds")
+    parser.add_argument("--orchestrate", default=os.getenv("ORCHESTRATE_CMD", "orchestrate"),
+                        help="orchestrate CLI command, e.g. 'python orchestrate_stub.py' for a dry run")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = import_all(shlex.split(args.orchestrate), args.workers, args.force, args.timeout)
+    print_summary(results, time.perf_counter() - start)
+    return 1 if any(result.status == "failed" for result in results) else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -1,8 +1,5 @@
 #!/bin/bash
 
-for f in ./tools/*.py; do
-  echo "Importing file $f"
-  orchestrate tools import -f "$f" --kind flow
-done
-
-orchestrate agents import -f agents/orchestrating_agent/customer_service_orchestrator.yaml
+# Parallel, incremental import of all tools and the agent; see import_tools.py --help
+cd "$(dirname "$0")" || exit 1
+exec python import_tools.py "$@"
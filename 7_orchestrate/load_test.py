@@ -0,0 +1,228 @@
+"""
+Load harness for the support flows.
+
+Sends the messages of a file to one of the support flows with a fixed
+arrival rate (open loop) and a limit on the number of runs in flight. End of
+run is detected through the flow's on_flow_end / on_flow_error handlers.
+Latency is measured from the scheduled send time, so queueing behind the
+concurrency limit is included. The report covers p50/p95/p99 latency,
+throughput and error rate.
+
+Usage:
+    python load_test.py --flow support_billing --messages router_eval.jsonl --rate 2 --concurrency 8
+    python load_test.py --mock --messages router_eval.jsonl --count 500 --rate 50 --concurrency 32
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import statistics
+import sys
+from dataclasses import dataclass
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.join(BASE_DIR, "tools"))
+
+from domains import SUPPORT_DOMAINS  # noqa: E402
+from response_cache import CachedFlow, FlowResponseCache  # noqa: E402
+
+
+@dataclass
+class RunResult:
+    index: int
+    scheduled: float
+    started: float
+    finished: float
+    ok: bool
+    error: str = ""
+
+    @property
+    def latency(self) -> float:
+        return self.finished - self.scheduled
+
+    @property
+    def queue_delay(self) -> float:
+        return self.started - self.scheduled
+
+
+class MockCompiledFlow:
+    """
+    Offline stand-in for a compiled flow.
+
+    invoke() returns at once and calls the end or error handler later, like the
+    real flow engine. Latencies are drawn from a log-normal distribution.
+    """
+
+    def __init__(self, mean_latency: float = 2.0, sigma: float = 0.4, error_rate: float = 0.02, seed: int = 0):
+        self.mean_latency = mean_latency
+        self.sigma = sigma
+        self.error_rate = error_rate
+        self.random = random.Random(seed)
+
+    async def invoke(self, input_data: dict, on_flow_end_handler=None, on_flow_error_handler=None, **kwargs):
+        latency = self.random.lognormvariate(0, self.sigma) * self.mean_latency
+        failed = self.random.random() < self.error_rate
+        loop = asyncio.get_running_loop()
+        if failed:
+            loop.call_later(latency, on_flow_error_handler, RuntimeError("mock flow error"))
+        else:
+            loop.call_later(latency, on_flow_end_handler, {"text": f"Mock answer to: {input_data['message'][:40]}"})
+
+
+def load_messages(path: str) -> list[str]:
+    """Read messages from a JSONL file with a "message" field or a text file with one message per line."""
+    with open(path, encoding="utf-8") as f:
+        lines = [line.strip() for line in f if line.strip()]
+    if path.endswith(".jsonl"):
+        return [json.loads(line)["message"] for line in lines]
+    return lines
+
+
+def percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    if not ordered:
+        return 0.0
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+async def run_load(compiled_flow, messages: list[str], count: int, rate: float, concurrency: int,
+                   timeout: float = 120, on_flow_end=None, on_flow_error=None) -> tuple[list[RunResult], float]:
+    """
+    Send `count` messages (cycling through `messages`) to a compiled flow.
+
+    Args:
+        compiled_flow: Compiled flow, or MockCompiledFlow
+        messages: Inquiries to send
+        count: Number of runs
+        rate: Arrivals per second (Poisson); 0 sends as fast as the concurrency limit allows
+        concurrency: Maximum number of runs in flight
+        timeout: Seconds after which a run without end event counts as failed
+        on_flow_end: Optional extra handler called with each result, e.g. flow_factory.on_flow_end
+        on_flow_error: Optional extra handler called with each error
+
+    Returns:
+        Tuple of (per-run results, wall-clock duration)
+    """
+    loop = asyncio.get_running_loop()
+    semaphore = asyncio.Semaphore(concurrency)
+    arrivals = random.Random(1)
+
+    async def one_run(index: int, scheduled: float) -> RunResult:
+        delay = scheduled - loop.time()
+        if delay > 0:
+            await asyncio.sleep(delay)
+        async with semaphore:
+            started = loop.time()
+            done = loop.create_future()
+
+            def finish(ok: bool, payload):
+                if not done.done():
+                    done.set_result((ok, payload))
+
+            # Handlers may be called from the flow engine's event thread
+            def handle_end(*args, **kwargs):
+                loop.call_soon_threadsafe(finish, True, args[0] if args else kwargs)
+                if on_flow_end:
+                    on_flow_end(*args, **kwargs)
+
+            def handle_error(*args, **kwargs):
+                loop.call_soon_threadsafe(finish, False, args[0] if args else kwargs)
+                if on_flow_error:
+                    on_flow_error(*args, **kwargs)
+
+            try:
+                await compiled_flow.invoke(
+                    {"message": messages[index % len(messages)]},
+                    on_flow_end_handler=handle_end,
+                    on_flow_error_handler=handle_error,
+                )
+                ok, payload = await asyncio.wait_for(done, timeout)
+            except asyncio.TimeoutError:
+                ok, payload = False, "timeout"
+            except Exception as e:
+                ok, payload = False, e
+            return RunResult(index, scheduled, started, loop.time(), ok, "" if ok else str(payload))
+
+    start = loop.time()
+    tasks, scheduled = [], start
+    for index in range(count):
+        tasks.append(asyncio.create_task(one_run(index, scheduled)))
+        if rate > 0:
+            scheduled += arrivals.expovariate(rate)
+    results = await asyncio.gather(*tasks)
+    return list(results), loop.time() - start
+
+
+def summarize(results: list[RunResult], duration: float) -> dict:
+    latencies = [r.latency for r in results if r.ok]
+    errors = [r for r in results if not r.ok]
+    return {
+        "runs": len(results),
+        "errors": len(errors),
+        "error_rate": len(errors) / len(results) if results else 0.0,
+        "throughput_per_s": len(latencies) / duration if duration else 0.0,
+        "latency_p50_s": percentile(latencies, 0.50),
+        "latency_p95_s": percentile(latencies, 0.95),
+        "latency_p99_s": percentile(latencies, 0.99),
+        "latency_mean_s": statistics.mean(latencies) if latencies else 0.0,
+        "queue_delay_p95_s": percentile([r.queue_delay for r in results], 0.95),
+        "duration_s": duration,
+    }
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Run concurrent load against a support flow.")
+    parser.add_argument("--flow", choices=list(SUPPORT_DOMAINS), default="support_general", help="Flow to invoke")
+    parser.add_argument("--messages", default=os.path.join(BASE_DIR, "router_eval.jsonl"),
+                        help="JSONL file with a 'message' field, or text file with one message per line")
+    parser.add_argument("--count", type=int, help="Number of runs (default: one per message)")
+    parser.add_argument("--rate", type=float, default=1.0, help="Arrivals per second; 0 for closed loop")
+    parser.add_argument("--concurrency", type=int, default=8, help="Maximum runs in flight")
+    parser.add_argument("--timeout", type=float, default=120, help="Seconds before a run counts as failed")
+    parser.add_argument("--mock", action="store_true", help="Use the offline mock flow backend")
+    parser.add_argument("--mock-latency", type=float, default=2.0, help="Mean latency of the mock backend in seconds")
+    parser.add_argument("--mock-error-rate", type=float, default=0.02, help="Error rate of the mock backend")
+    parser.add_argument("--cache", action="store_true", help="Put the PII-normalising response cache in front of the flow")
+    parser.add_argument("--verbose", action="store_true", help="Also call the flows' on_flow_end handler")
+    parser.add_argument("--json", action="store_true", help="Print the report as JSON")
+    args = parser.parse_args()
+
+    messages = load_messages(args.messages)
+    count = args.count or len(messages)
+
+    on_flow_end = None
+    if args.mock:
+        compiled_flow = MockCompiledFlow(args.mock_latency, error_rate=args.mock_error_rate)
+    else:
+        from flow_factory import make_flow, on_flow_end as flow_end_handler
+
+        compiled_flow = await make_flow(SUPPORT_DOMAINS[args.flow])().compile_deploy()
+        on_flow_end = flow_end_handler if args.verbose else None
+
+    cache = None
+    if args.cache:
+        cache = FlowResponseCache()
+        compiled_flow = CachedFlow(compiled_flow, args.flow, cache)
+
+    results, duration = await run_load(
+        compiled_flow, messages, count, args.rate, args.concurrency, args.timeout,
+        on_flow_end=on_flow_end, on_flow_error=on_flow_end,
+    )
+    report = summarize(results, duration)
+    if cache is not None:
+        report.update({f"cache_{name}": value for name, value in cache.metrics().items()})
+
+    if args.json:
+        print(json.dumps(report, indent=2))
+        return
+    target = "mock" if args.mock else args.flow
+    print(f"{target}: {count} runs, rate {args.rate}/s, concurrency {args.concurrency}")
+    for key, value in report.items():
+        print(f"  {key:20} {value:.3f}" if isinstance(value, float) else f"  {key:20} {value}")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,39 @@
+"""
+Local stand-in for the orchestrate CLI, used to test import_tools.py
+without a watsonx Orchestrate environment.
+
+Each call sleeps for ORCHESTRATE_STUB_DELAY seconds (default 1.0) and appends
+its arguments to ORCHESTRATE_STUB_LOG, if set. Imports of files whose path
+contains ORCHESTRATE_STUB_FAIL exit with an error.
+
+Usage:
+    python import_tools.py --orchestrate "python orchestrate_stub.py"
+"""
+
+import os
+import sys
+import time
+
+
+def main() -> int:
+    args = sys.argv[1:]
+    time.sleep(float(os.getenv("ORCHESTRATE_STUB_DELAY", "1.0")))
+
+    log_file = os.getenv("ORCHESTRATE_STUB_LOG")
+    if log_file:
+        with open(log_file, "a", encoding="utf-8") as f:
+            f.write(" ".join(args) + "\n")
+
+    path = args[args.index("-f") + 1] if "-f" in args else ""
+    fail_pattern = os.getenv("ORCHESTRATE_STUB_FAIL")
+    if fail_pattern and fail_pattern in path:
+        print(f"[ERROR] - Failed to import '{path}'", file=sys.stderr)
+        return 1
+
+    kind = "Agent" if args[:1] == ["agents"] else "Tool"
+    print(f"[INFO] - {kind} '{os.path.splitext(os.path.basename(path))[0]}' imported successfully")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
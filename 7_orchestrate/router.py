@@ -0,0 +1,306 @@
+"""
+Deterministic pre-router for the customer_service_orchestrator agent.
+
+Every inquiry normally goes through the react agent just to pick one of the
+six support tools. This module scores an inquiry locally against one TF-IDF
+centroid per support domain, built from the `subject_details` in
+tools/domains.py and the tool descriptions in the agent definition. Confident
+inquiries are sent straight to the matching flow; ambiguous ones fall back
+to the agent.
+
+Usage:
+    python router.py "My last invoice has a charge I don't recognise"
+    python router.py --evaluate router_eval.jsonl [--llm]
+    python router.py --invoke "My router keeps dropping the connection"
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import os
+import re
+import statistics
+import sys
+import time
+from collections import Counter
+from dataclasses import dataclass, field
+
+import yaml
+
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+TOOLS_DIR = os.path.join(BASE_DIR, "tools")
+AGENT_FILE = os.path.join(BASE_DIR, "agents", "orchestrating_agent", "customer_service_orchestrator.yaml")
+
+sys.path.insert(0, TOOLS_DIR)
+from domains import SUPPORT_DOMAINS  # noqa: E402
+
+# Fallback domain for inquiries the router cannot place
+DEFAULT_TOOL = "support_general"
+
+STOP_WORDS = {
+    "a", "about", "and", "are", "as", "at", "be", "but", "by", "can", "dear", "deutsche", "do", "for",
+    "from", "have", "hello", "help", "i", "if", "in", "is", "it", "me", "my", "not", "of", "on", "or",
+    "our", "please", "provide", "regards", "so", "support", "team", "telekom", "that", "the", "this",
+    "to", "was", "we", "what", "when", "with", "would", "you", "your",
+}
+TOKEN_PATTERN = re.compile(r"[a-zäöüß]+")
+
+
+def tokenize(text: str) -> list[str]:
+    """Lower-case word tokens without stop words, with a light plural/suffix stemmer."""
+    tokens = []
+    for word in TOKEN_PATTERN.findall(text.lower()):
+        if word in STOP_WORDS or len(word) < 3:
+            continue
+        for suffix in ("ing", "ies", "es", "s"):
+            if word.endswith(suffix) and len(word) - len(suffix) >= 4:
+                word = word[: -len(suffix)] + ("y" if suffix == "ies" else "")
+                break
+        tokens.append(word)
+    return tokens
+
+
+def load_domains(agent_file: str = AGENT_FILE) -> dict[str, str]:
+    """
+    Build the routing text of each support domain.
+
+    Args:
+        agent_file: Agent definition whose instructions describe the tools
+
+    Returns:
+        Mapping of tool name to the text its centroid is built from
+    """
+    tool_hints = {}
+    if os.path.exists(agent_file):
+        with open(agent_file, encoding="utf-8") as f:
+            agent = yaml.safe_load(f)
+        for line in agent.get("instructions", "").splitlines():
+            match = re.match(r"\s*-\s*(support_\w+):\s*(.+)", line)
+            if match:
+                tool_hints[match.group(1)] = match.group(2)
+
+    return {
+        name: "\n".join(
+            text for text in (domain.use_case, domain.subject_details, domain.description, tool_hints.get(name, ""))
+            if text
+        )
+        for name, domain in SUPPORT_DOMAINS.items()
+    }
+
+
+@dataclass
+class RouteDecision:
+    tool: str
+    confidence: float
+    confident: bool
+    scores: dict[str, float] = field(default_factory=dict)
+    latency_ms: float = 0.0
+
+
+class PreRouter:
+    """
+    Nearest-centroid TF-IDF classifier over the support domains.
+
+    The confidence is the relative margin of the best domain's cosine score
+    over the runner-up. Only inquiries with a confidence of at least
+    `threshold` are routed locally.
+    """
+
+    def __init__(self, domains: dict[str, str] | None = None, threshold: float = 0.5):
+        self.domains = domains if domains is not None else load_domains()
+        self.threshold = threshold
+
+        documents = {name: Counter(tokenize(text)) for name, text in self.domains.items()}
+        document_frequency = Counter(term for counts in documents.values() for term in counts)
+        total = len(documents)
+        self.idf = {term: math.log((1 + total) / (1 + df)) + 1 for term, df in document_frequency.items()}
+        self.centroids = {name: self._vector(counts) for name, counts in documents.items()}
+
+    def _vector(self, counts: Counter) -> dict[str, float]:
+        vector = {term: (1 + math.log(count)) * self.idf[term] for term, count in counts.items() if term in self.idf}
+        norm = math.sqrt(sum(v * v for v in vector.values()))
+        return {term: v / norm for term, v in vector.items()} if norm else {}
+
+    def route(self, message: str) -> RouteDecision:
+        """Score an inquiry against all domains."""
+        start = time.perf_counter()
+        vector = self._vector(Counter(tokenize(message)))
+        scores = {
+            name: sum(weight * centroid.get(term, 0.0) for term, weight in vector.items())
+            for name, centroid in self.centroids.items()
+        }
+        ranked = sorted(scores.items(), key=lambda item: item[1], reverse=True)
+
+        if not ranked or ranked[0][1] <= 0:
+            tool, confidence = DEFAULT_TOOL, 0.0
+        else:
+            tool, best = ranked[0]
+            runner_up = ranked[1][1] if len(ranked) > 1 else 0.0
+            confidence = (best - runner_up) / best
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        return RouteDecision(tool, confidence, confidence >= self.threshold, scores, latency_ms)
+
+
+class LLMRouter:
+    """
+    Reference router that asks the orchestrator model to pick a tool, the
+    same decision the react agent makes in its first step.
+    """
+
+    def __init__(self, agent_file: str = AGENT_FILE):
+        from ibm_watsonx_ai import Credentials
+        from ibm_watsonx_ai.foundation_models import ModelInference
+
+        with open(agent_file, encoding="utf-8") as f:
+            agent = yaml.safe_load(f)
+        self.tools = agent.get("tools", [])
+        self.instructions = agent.get("instructions", "")
+        self.model = ModelInference(
+            model_id=agent["llm"].removeprefix("watsonx/"),
+            credentials=Credentials(
+                url=os.getenv("WATSONX_URL", "https://us-south.ml.cloud.ibm.com"),
+                api_key=os.getenv("WATSONX_API_KEY"),
+            ),
+            project_id=os.getenv("WATSONX_PROJECT_ID"),
+            params={"max_new_tokens": 10, "temperature": 0},
+        )
+
+    def route(self, message: str) -> tuple[str, float]:
+        """Return the tool chosen by the model and the latency in milliseconds."""
+        prompt = (
+            f"{self.instructions}\n\nCustomer inquiry:\n{message}\n\n"
+            f"Answer with exactly one tool name from: {', '.join(self.tools)}\nTool:"
+        )
+        start = time.perf_counter()
+        answer = self.model.generate_text(prompt=prompt)
+        latency_ms = (time.perf_counter() - start) * 1000
+        tool = next((t for t in self.tools if t in answer), DEFAULT_TOOL)
+        return tool, latency_ms
+
+
+async def dispatch(message: str, router: PreRouter, fallback, compiled_flows: dict | None = None, cache=None):
+    """
+    Answer an inquiry through the pre-router.
+
+    Args:
+        message: Customer inquiry
+        router: Pre-router instance
+        fallback: Async callable invoked with the message when the router is not confident,
+            e.g. a call to the customer_service_orchestrator agent
+        compiled_flows: Optional cache of compiled flows keyed by tool name
+        cache: Optional response_cache.FlowResponseCache put in front of the flows
+
+    Returns:
+        Tuple of (route decision, result of the flow or the fallback)
+    """
+    decision = router.route(message)
+    if not decision.confident:
+        return decision, await fallback(message)
+
+    compiled_flows = compiled_flows if compiled_flows is not None else {}
+    compiled = compiled_flows.get(decision.tool)
+    if compiled is None:
+        from flow_factory import make_flow
+
+        compiled = await make_flow(SUPPORT_DOMAINS[decision.tool])().compile_deploy()
+        if cache is not None:
+            from response_cache import CachedFlow
+
+            compiled = CachedFlow(compiled, decision.tool, cache)
+        compiled_flows[decision.tool] = compiled
+    return decision, await compiled.invoke({"message": message})
+
+
+def _percentile(values: list[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(q * (len(ordered) - 1))))]
+
+
+def evaluate(router: PreRouter, samples: list[dict], llm_router: LLMRouter | None = None) -> dict:
+    """
+    Measure routing latency and agreement with the LLM router.
+
+    Args:
+        router: Pre-router instance
+        samples: Dicts with a "message" and, unless an LLM router is given, the
+            "tool" the LLM router picked for it
+        llm_router: Optional live LLM router used to label the samples
+
+    Returns:
+        Summary statistics
+    """
+    local_latencies, llm_latencies = [], []
+    agree = confident = confident_agree = 0
+
+    for sample in samples:
+        decision = router.route(sample["message"])
+        local_latencies.append(decision.latency_ms)
+        if llm_router is not None:
+            expected, latency_ms = llm_router.route(sample["message"])
+            llm_latencies.append(latency_ms)
+        else:
+            expected = sample["tool"]
+
+        agree += decision.tool == expected
+        if decision.confident:
+            confident += 1
+            confident_agree += decision.tool == expected
+
+    total = len(samples)
+    summary = {
+        "samples": total,
+        "agreement": agree / total if total else 0.0,
+        "routed_locally": confident / total if total else 0.0,
+        "agreement_when_routed_locally": confident_agree / confident if confident else 0.0,
+        "local_latency_ms_p50": statistics.median(local_latencies) if local_latencies else 0.0,
+        "local_latency_ms_p95": _percentile(local_latencies, 0.95) if local_latencies else 0.0,
+    }
+    if llm_latencies:
+        summary["llm_latency_ms_p50"] = statistics.median(llm_latencies)
+        summary["llm_latency_ms_p95"] = _percentile(llm_latencies, 0.95)
+    return summary
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Route customer inquiries to a support tool without the LLM.")
+    parser.add_argument("message", nargs="?", help="Customer inquiry to route")
+    parser.add_argument("--threshold", type=float, default=0.5, help="Minimum confidence for local routing")
+    parser.add_argument("--evaluate", metavar="JSONL", help="Evaluate against labelled inquiries")
+    parser.add_argument("--llm", action="store_true", help="Label the evaluation set with the live LLM router")
+    parser.add_argument("--invoke", action="store_true", help="Invoke the routed flow (needs an active orchestrate env)")
+    args = parser.parse_args()
+
+    router = PreRouter(threshold=args.threshold)
+
+    if args.evaluate:
+        with open(args.evaluate, encoding="utf-8") as f:
+            samples = [json.loads(line) for line in f if line.strip()]
+        llm_router = LLMRouter() if args.llm else None
+        for key, value in evaluate(router, samples, llm_router).items():
+            print(f"{key:32} {value:.3f}" if isinstance(value, float) else f"{key:32} {value}")
+        return
+
+    if not args.message:
+        parser.error("a message or --evaluate is required")
+
+    decision = router.route(args.message)
+    print(f"tool={decision.tool} confidence={decision.confidence:.2f} "
+          f"{'local' if decision.confident else 'fallback to agent'} ({decision.latency_ms:.2f} ms)")
+    for name, score in sorted(decision.scores.items(), key=lambda item: item[1], reverse=True):
+        print(f"  {name:24} {score:.3f}")
+
+    if args.invoke:
+        async def fallback(message):
+            print("Low confidence: send this inquiry to the customer_service_orchestrator agent.")
+            return None
+
+        _, result = asyncio.run(dispatch(args.message, router, fallback))
+        if result is not None:
+            print(result)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,351 @@
+"""
+Declarative registry of the customer service support domains.
+
+Each entry holds everything that differs between the support flows: the tool
+name, the texts of its prompt node and a sample inquiry. The flows
+themselves are built by flow_factory.py. This module has no dependencies, so
+the registry can also be read without the ADK installed, e.g. by router.py.
+"""
+
+from dataclasses import dataclass
+
+
+@dataclass(frozen=True)
+class SupportDomain:
+    name: str
+    use_case: str
+    description: str
+    instructions: str
+    subject_details: str
+    test_message: str
+    llm: str = "meta-llama/llama-4-maverick-17b-128e-instruct-fp8"
+    temperature: float = 0.3
+    min_new_tokens: int = 50
+    max_new_tokens: int = 1000
+
+    @property
+    def system_prompt(self) -> str:
+        return f"{self.instructions}\n\n{self.subject_details}\n\n"
+
+
+SUPPORT_DOMAINS = {domain.name: domain for domain in (
+    SupportDomain(
+        name="support_network",
+        use_case="Network Support",
+        description="This tool provides network support responses for Deutsche Telekom customers.",
+        instructions="""You are a helpful network support expert for Deutsche Telekom.
+Provide a direct, friendly, and professional response to the customer's network-related inquiry.
+Be concise but thorough. Offer clear troubleshooting steps when appropriate.
+Show empathy for their issue and provide actionable solutions.""",
+        subject_details="""Provide helpful, professional customer service responses for:
+- Internet connectivity issues and outages
+- WiFi problems and signal strength issues
+- Router and modem troubleshooting
+- Network speed and performance problems
+- Connection drops and instability
+- DNS and IP configuration issues
+- Network security concerns
+- Fiber optic connection problems
+
+Provide clear troubleshooting steps, explanations, and next actions.""",
+        test_message="""Dear Deutsche Telekom Support,
+
+I am experiencing severe internet connectivity issues at my home address. The problem started yesterday evening and has been persistent.
+
+Details of the issue:
+- Internet connection keeps dropping every 10-15 minutes
+- WiFi signal strength appears normal but no internet access
+- Router lights show: Power (green), DSL (red), Internet (red)
+- Speed when connected is much slower than usual (5 Mbps instead of 50 Mbps)
+- Multiple devices affected (laptop, smartphone, smart TV)
+
+I have already tried:
+- Restarting the router multiple times
+- Checking all cable connections
+- Testing with ethernet cable directly
+
+My contract details:
+- Customer number: 123456789
+- Plan: MagentaZuhause M (50 Mbps)
+- Address: Musterstraße 123, 12345 Berlin
+
+Please help resolve this issue as I work from home and need reliable internet.
+
+Best regards,
+Max Mustermann""",
+    ),
+    SupportDomain(
+        name="support_billing",
+        use_case="Billing Support",
+        description="This tool provides billing support responses for Deutsche Telekom customers.",
+        instructions="""You are a helpful billing support expert for Deutsche Telekom.
+Provide a direct, friendly, and professional response to the customer's billing inquiry.
+Be empathetic about billing concerns and provide clear explanations.
+Offer specific next steps and reassurance when appropriate.""",
+        subject_details="""Provide helpful, professional customer service responses for:
+- Billing inquiries and invoice questions
+- Payment issues and failed transactions
+- Account charges and unexpected fees
+- Refund requests and credit adjustments
+- Payment method changes and updates
+- Direct debit and automatic payment issues
+- Billing disputes and corrections
+- Account balance and payment history
+
+Provide clear explanations, next steps, and reassurance.""",
+        test_message="""Dear Deutsche Telekom,
+
+I have received my monthly bill and there are several charges that I don't understand and believe are incorrect.
+
+Issues with my bill:
+- Extra charge of €29.99 for "Premium Services" - I never subscribed to this
+- Roaming charges of €45.50 from last month - I was only in Austria for 2 days
+- My monthly plan fee shows €39.99 but my contract states €34.99
+- There's a "Service Fee" of €4.99 that wasn't mentioned in my contract
+
+My account details:
+- Customer number: 987654321
+- Contract: MagentaMobil S
+- Billing period: October 2024
+- Invoice number: INV-2024-10-987654321
+
+I have been a loyal customer for 5 years and have never had billing issues before. I would like these charges reviewed and corrected.
+
+I have attached a copy of my original contract for reference.
+
+Please investigate and provide a corrected bill.
+
+Best regards,
+Anna Schmidt
+Phone: +49 151 12345678""",
+    ),
+    SupportDomain(
+        name="support_technical",
+        use_case="Technical Support",
+        description="This tool provides technical support responses for Deutsche Telekom customers.",
+        instructions="""You are a helpful technical support expert for Deutsche Telekom.
+Provide a direct, friendly, and professional response to the customer's technical inquiry.
+Offer clear, step-by-step troubleshooting instructions when appropriate.
+Be patient and explain technical concepts in simple terms.""",
+        subject_details="""Provide helpful, professional customer service responses for:
+- Device configuration and setup issues
+- Router and modem technical problems
+- Software and firmware updates
+- Email and app configuration
+- Device compatibility issues
+- Hardware troubleshooting
+- Performance optimization
+- Security settings and configurations
+
+Provide step-by-step instructions and technical guidance.""",
+        test_message="""Hello Deutsche Telekom Support,
+
+I need help configuring my new Speedport Smart 4 router. I received it yesterday but I'm having several technical issues.
+
+Problems I'm experiencing:
+- Cannot access the router admin panel (192.168.1.1 doesn't work)
+- WiFi network is not showing up on my devices
+- The router keeps restarting every few minutes
+- LED indicators: Power (green), DSL (blinking red), WiFi (off)
+- Cannot complete the initial setup wizard
+
+My setup:
+- Router model: Speedport Smart 4
+- Connection type: VDSL
+- Previous router: Speedport W724V (worked fine)
+- Operating system: Windows 11, macOS Monterey
+- Devices: 2 laptops, 3 smartphones, 1 smart TV
+
+What I've tried:
+- Factory reset (holding reset button for 30 seconds)
+- Different ethernet cables
+- Connecting directly to laptop via ethernet
+- Checking all cable connections
+- Waiting 24 hours for line activation
+
+My contract details:
+- Customer ID: 456789123
+- Plan: MagentaZuhause L
+- Installation date: Yesterday (November 19, 2024)
+
+I work from home and urgently need internet access. Please provide step-by-step configuration instructions.
+
+Thank you,
+Thomas Weber
+Phone: +49 30 12345678""",
+    ),
+    SupportDomain(
+        name="support_mobile_plans",
+        use_case="Mobile Plans Support",
+        description="This tool provides mobile plans support responses for Deutsche Telekom customers.",
+        instructions="""You are a helpful mobile plans expert for Deutsche Telekom.
+Provide a direct, friendly, and professional response to the customer's mobile plan inquiry.
+Help them understand their options and make informed decisions.
+Provide clear comparisons and recommendations based on their needs.""",
+        subject_details="""Provide helpful, professional customer service responses for:
+- Mobile plan questions and comparisons
+- Tariff changes and upgrades/downgrades
+- Data allowances and usage monitoring
+- Roaming charges and international plans
+- Plan features and included services
+- Contract terms and conditions
+- Family plans and shared data
+- Prepaid vs postpaid options
+
+Provide clear plan comparisons, pricing information, and recommendations.""",
+        test_message="""Dear Deutsche Telekom,
+
+I would like to upgrade my current mobile plan as my data usage has increased significantly due to working from home.
+
+Current situation:
+- Current plan: MagentaMobil S (6GB data, unlimited calls/SMS)
+- Monthly cost: €29.99
+- Contract started: January 2023
+- Phone number: +49 151 98765432
+- Customer ID: 789123456
+
+My needs:
+- Need at least 15-20GB of data per month
+- Currently using about 12-15GB monthly
+- Frequently travel to EU countries for business
+- Need good network coverage in rural areas
+- Want to keep my current phone number
+
+Questions:
+1. What upgrade options are available for my current contract?
+2. Can I upgrade without extending my contract period?
+3. What are the costs for EU roaming with different plans?
+4. Is there a family plan option? (My wife also needs a new plan)
+5. Do you offer any discounts for long-term customers?
+
+Additional information:
+- I have been a Telekom customer for 8 years
+- Currently using iPhone 13 Pro
+- No issues with current service quality
+- Prefer to keep monthly costs under €50 if possible
+
+Please provide me with suitable plan options and pricing.
+
+Best regards,
+Michael Schneider
+Email: m.schneider@email.com""",
+    ),
+    SupportDomain(
+        name="support_internet_plans",
+        use_case="Internet Plans Support",
+        description="This tool provides internet plans support responses for Deutsche Telekom customers.",
+        instructions="""You are a helpful internet plans expert for Deutsche Telekom.
+Provide a direct, friendly, and professional response to the customer's internet plan inquiry.
+Help them understand their options and make informed decisions about speed and features.
+Provide clear comparisons and recommendations based on their needs.""",
+        subject_details="""Provide helpful, professional customer service responses for:
+- Internet plan questions and comparisons
+- Speed upgrades and downgrades
+- Fiber optic availability and installation
+- DSL vs Cable vs Fiber options
+- Plan features and included services
+- Contract terms and pricing
+- Bundle options (internet + TV + phone)
+- Installation and setup appointments
+
+Provide clear plan comparisons, availability information, and recommendations.""",
+        test_message="""Hello Deutsche Telekom Team,
+
+I am interested in upgrading my home internet connection and would like information about available options in my area.
+
+Current situation:
+- Current plan: MagentaZuhause M (50 Mbps DSL)
+- Monthly cost: €34.99
+- Address: Hauptstraße 45, 10115 Berlin
+- Customer since: 2020
+- Customer ID: 321654987
+
+My requirements:
+- Need faster internet for home office and streaming
+- Family of 4 people, all using internet simultaneously
+- Regular video conferencing for work
+- 4K streaming on multiple devices
+- Online gaming (son plays competitive games)
+- Smart home devices (10+ connected devices)
+
+Questions:
+1. Is fiber optic available at my address?
+2. What are the fastest speeds available for my location?
+3. What is the price difference between 100 Mbps, 250 Mbps, and 500 Mbps plans?
+4. Are there any bundle deals with TV services?
+5. What is the installation process and timeline for fiber?
+6. Can I keep my current phone number if I upgrade?
+7. Are there any promotional offers for existing customers?
+8. What is the minimum contract period for new plans?
+
+Additional preferences:
+- Prefer no long-term contract if possible
+- Need reliable connection with minimal downtime
+- Interested in MagentaTV if available
+- Budget: up to €60/month for internet
+
+Please provide detailed information about available plans and next steps.
+
+Thank you,
+Sarah Müller
+Phone: +49 30 87654321
+Email: s.mueller@email.com""",
+    ),
+    SupportDomain(
+        name="support_general",
+        use_case="General Support",
+        description="This tool provides general support responses for Deutsche Telekom customers.",
+        instructions="""You are a helpful general support expert for Deutsche Telekom.
+Provide a direct, friendly, and professional response to the customer's inquiry.
+Be helpful and guide them through any processes or provide the information they need.
+Offer clear next steps and assistance.""",
+        subject_details="""Provide helpful, professional customer service responses for:
+- General account information and inquiries
+- Contract questions and terms
+- Service availability in specific areas
+- Customer data updates (address, payment method, etc.)
+- SIM card requests and replacements
+- Customer identification and verification
+- General product information
+- Other inquiries not covered by specialized support areas
+
+Provide clear information, next steps, and helpful guidance.""",
+        test_message="""Dear Deutsche Telekom,
+
+I am moving to a new apartment next month and need to update my account information and transfer my services.
+
+Current information:
+- Customer ID: 147258369
+- Current address: Berliner Straße 78, 20095 Hamburg
+- Services: MagentaZuhause L (Internet) + MagentaMobil M
+- Contract valid until: December 2025
+
+New information:
+- New address: Münchener Allee 123, 80331 München
+- Moving date: December 15, 2024
+- New apartment is in a newly built complex
+
+My questions:
+1. How do I transfer my internet service to the new address?
+2. Is Deutsche Telekom service available at the new address?
+3. Will I need a new router or can I use my current Speedport?
+4. Can I keep my current phone number?
+5. Are there any fees for the address change?
+6. How long does the transfer process take?
+7. Will there be any service interruption?
+8. Do I need to schedule a technician visit?
+
+Additional requests:
+- Need to update my billing address
+- Want to change payment method to direct debit
+- Request a new SIM card (current one is damaged)
+- Need confirmation letter for my new landlord
+
+Please let me know the process and what documents I need to provide.
+
+Best regards,
+Julia Fischer
+Current phone: +49 40 12345678
+Email: j.fischer@email.com""",
+    ),
+)}
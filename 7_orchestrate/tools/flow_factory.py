@@ -0,0 +1,233 @@
+"""
+Factory for the customer service support flows.
+
+Builds the flow of every domain in domains.py from one shared
+definition, and compiles and deploys them concurrently. A definition hash per
+flow is stored after each successful deploy, so unchanged flows are skipped
+on the next run.
+
+Usage:
+    python tools/flow_factory.py [--only support_billing ...] [--concurrency 3] [--force] [--test]
+"""
+
+import argparse
+import asyncio
+import hashlib
+import json
+import os
+import time
+from dataclasses import asdict
+
+from pydantic import BaseModel
+from ibm_watsonx_orchestrate.flow_builder.flows import (
+    END,
+    Flow,
+    flow,
+    START,
+    PromptNode,
+)
+
+from domains import SUPPORT_DOMAINS, SupportDomain
+
+
+STATE_FILE = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), ".flow_deploy_state.json")
+
+
+class Response(BaseModel):
+    text: str
+
+
+class Message(BaseModel):
+    """
+    This class represents the content of a customer support request.
+
+    Attributes:
+        message (str): Request text
+    """
+    message: str
+
+
+def build_prompt_node(aflow: Flow, domain: SupportDomain) -> PromptNode:
+    prompt_node = aflow.prompt(
+        name=domain.name,
+        display_name=domain.use_case,
+        description=domain.description,
+        system_prompt=domain.system_prompt,
+        user_prompt="Customer inquiry: {message}",
+        llm=domain.llm,
+        llm_parameters={
+            "temperature": domain.temperature,
+            "min_new_tokens": domain.min_new_tokens,
+            "max_new_tokens": domain.max_new_tokens,
+            "top_k": None,
+            "top_p": None,
+            "stop_sequences": None,
+        },
+        input_schema=Message,
+        output_schema=Response,
+    )
+    return prompt_node
+
+
+def make_flow(domain: SupportDomain):
+    """
+    Create the @flow-decorated builder of a support domain.
+
+    Args:
+        domain (SupportDomain): Domain from the registry.
+
+    Returns:
+        The flow builder; calling it returns the flow definition.
+    """
+
+    def build_analysis_flow(aflow: Flow = None) -> Flow:
+        """
+        Creates a flow that will use the Prompt node to answer a customer inquiry.
+        This flow will rely on the Flow engine to perform automatic data mapping at runtime.
+
+        Args:
+            aflow (Flow, optional): During deployment of the flow model, it will be passed a flow instance.
+
+        Returns:
+            Flow: The created flow.
+        """
+        prompt_node = build_prompt_node(aflow, domain)
+
+        aflow.sequence(START, prompt_node, END)
+
+        return aflow
+
+    build_analysis_flow.__name__ = f"build_{domain.name}_flow"
+    return flow(name=domain.name, input_schema=Message, output_schema=Response)(build_analysis_flow)
+
+
+def definition_hash(domain: SupportDomain) -> str:
+    """Hash of everything the deployed flow depends on: the domain and this factory."""
+    fields = asdict(domain)
+    fields.pop("test_message")
+    with open(__file__, "rb") as f:
+        factory_source = f.read()
+    digest = hashlib.sha256(json.dumps(fields, sort_keys=True).encode())
+    digest.update(factory_source)
+    return digest.hexdigest()
+
+
+def _state_key() -> str:
+    # Deploy state is tracked per orchestrate instance
+    return os.getenv("WO_INSTANCE", "local")
+
+
+def load_state(path: str = STATE_FILE) -> dict:
+    if not os.path.exists(path):
+        return {}
+    try:
+        with open(path, encoding="utf-8") as f:
+            return json.load(f).get(_state_key(), {})
+    except (OSError, ValueError):
+        return {}
+
+
+def save_state(hashes: dict, path: str = STATE_FILE):
+    data = {}
+    if os.path.exists(path):
+        try:
+            with open(path, encoding="utf-8") as f:
+                data = json.load(f)
+        except (OSError, ValueError):
+            data = {}
+    data[_state_key()] = hashes
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(data, f, indent=2)
+    os.replace(tmp_path, path)
+
+
+async def deploy_flows(names: list[str] | None = None, concurrency: int = 3, force: bool = False,
+                       state_file: str = STATE_FILE) -> dict:
+    """
+    Compile and deploy support flows concurrently.
+
+    Args:
+        names (list[str], optional): Flows to deploy; defaults to all registered domains.
+        concurrency (int): Maximum number of flows compiled and deployed at the same time.
+        force (bool): Redeploy flows even if their definition has not changed.
+        state_file (str): JSON file with the definition hashes of the last deploy.
+
+    Returns:
+        dict: Per flow, the status ("deployed", "unchanged" or "failed"), the time taken,
+            the compiled flow and the error, if any.
+    """
+    domains = [SUPPORT_DOMAINS[name] for name in (names or SUPPORT_DOMAINS)]
+    deployed_hashes = load_state(state_file)
+    semaphore = asyncio.Semaphore(concurrency)
+
+    async def deploy(domain: SupportDomain) -> tuple[str, dict]:
+        current_hash = definition_hash(domain)
+        if not force and deployed_hashes.get(domain.name) == current_hash:
+            return domain.name, {"status": "unchanged", "seconds": 0.0}
+
+        async with semaphore:
+            start = time.perf_counter()
+            try:
+                compiled_flow = await make_flow(domain)().compile_deploy()
+            except Exception as e:
+                return domain.name, {"status": "failed", "seconds": time.perf_counter() - start, "error": str(e)}
+            return domain.name, {
+                "status": "deployed",
+                "seconds": time.perf_counter() - start,
+                "hash": current_hash,
+                "compiled_flow": compiled_flow,
+            }
+
+    results = dict(await asyncio.gather(*(deploy(domain) for domain in domains)))
+
+    for name, result in results.items():
+        if result["status"] == "deployed":
+            deployed_hashes[name] = result["hash"]
+    save_state(deployed_hashes, state_file)
+    return results
+
+
+def on_flow_end(*args, **kwargs):
+    print("on_flow_end")
+    print(args)
+    print(kwargs)
+
+
+async def run_test(domain: SupportDomain):
+    """Deploy one flow and invoke it with the domain's sample inquiry."""
+    compiled_flow = await make_flow(domain)().compile_deploy()
+    await compiled_flow.invoke(
+        {"message": domain.test_message},
+        on_flow_end_handler=on_flow_end,
+        on_flow_error_handler=on_flow_end,
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Compile and deploy the support flows.")
+    parser.add_argument("--only", nargs="+", choices=list(SUPPORT_DOMAINS), help="Flows to deploy")
+    parser.add_argument("--concurrency", type=int, default=3, help="Flows compiled and deployed in parallel")
+    parser.add_argument("--force", action="store_true", help="Redeploy unchanged flows")
+    parser.add_argument("--test", action="store_true", help="Invoke each deployed flow with its sample inquiry")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    results = await deploy_flows(args.only, args.concurrency, args.force)
+    for name, result in results.items():
+        line = f"{name:24} {result['status']:10} {result['seconds']:6.1f}s"
+        print(f"{line}  {result['error']}" if "error" in result else line)
+    print(f"Total: {time.perf_counter() - start:.1f}s")
+
+    if args.test:
+        for name, result in results.items():
+            if result["status"] == "deployed":
+                await result["compiled_flow"].invoke(
+                    {"message": SUPPORT_DOMAINS[name].test_message},
+                    on_flow_end_handler=on_flow_end,
+                    on_flow_error_handler=on_flow_end,
+                )
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,252 @@
+"""
+Response cache for the support flows.
+
+The prompt nodes run inside the flow engine, so the cache wraps the compiled
+flow on the client side: `CachedFlow.invoke` has the same signature as
+`CompiledFlow.invoke` and answers repeated inquiries without a flow run.
+
+Before lookup, personal data in the inquiry (customer and invoice numbers,
+phone numbers, e-mail addresses, street addresses and names) is replaced by
+numbered placeholders. Near-identical e-mails from different customers
+therefore share one entry. The same placeholders are applied to the stored
+answer and filled with the new customer's values on a hit.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable
+
+
+# Ordered so that longer, more specific patterns are replaced first
+PII_PATTERNS = (
+    ("EMAIL", re.compile(r"\b[\w.+-]+@[\w-]+(?:\.[\w-]+)+\b")),
+    ("INVOICE_NUMBER", re.compile(r"\bINV-[\w-]+\b")),
+    # A country code or a 0 directly followed by the area code, and at least 7 digits in total:
+    # "+49 171 2345678", "(030) 1234567" and "0221 12 34 56" match, "Order 0 12 34" does not
+    ("PHONE", re.compile(r"(?<![\w+(])(?=\+?\(?(?:[ /()-]{0,2}\d){7})"
+                         r"(?:\+\d{1,3}[ /-]?\(?\d{2,5}\)?|\(?0\d{1,4}\)?)(?:[ /-]?\d{2,}){1,3}\b")),
+    ("ADDRESS", re.compile(r"\b[A-ZÄÖÜ][\wäöüß.-]*(?:straße|strasse|weg|platz|allee|gasse|ring)\s+\d+[a-z]?"
+                           r"(?:,\s*\d{5}\s+[A-ZÄÖÜ][\wäöüß-]+)?")),
+    ("CUSTOMER_NUMBER", re.compile(r"(?<=Customer number: )\d+|(?<=Customer no\. )\d+|\b\d{9,}\b")),
+)
+
+# Names are taken from the sign-off of an e-mail and from "My name is ..."
+NAME_PATTERNS = (
+    re.compile(r"(?:Best regards|Kind regards|Regards|Sincerely|Thanks|Thank you),?\s*\n\s*"
+               r"([A-ZÄÖÜ][\wäöüß-]+(?: [A-ZÄÖÜ][\wäöüß-]+){0,2})\s*$", re.MULTILINE),
+    re.compile(r"\b[Mm]y name is ([A-ZÄÖÜ][\wäöüß-]+(?: [A-ZÄÖÜ][\wäöüß-]+){0,2})"),
+)
+
+PLACEHOLDER_PATTERN = re.compile(r"<([A-Z_]+_\d+)(?:\.(\d+))?>")
+
+
+def mask_pii(text: str) -> tuple[str, dict[str, str]]:
+    """
+    Replace personal data with numbered placeholders.
+
+    Args:
+        text: Customer inquiry
+
+    Returns:
+        Tuple of (masked text, mapping of placeholder to original value)
+    """
+    mapping: dict[str, str] = {}
+    seen: dict[tuple[str, str], str] = {}
+
+    def placeholder(kind: str, value: str) -> str:
+        key = (kind, value)
+        if key not in seen:
+            number = sum(1 for k in seen if k[0] == kind) + 1
+            seen[key] = f"<{kind}_{number}>"
+            mapping[seen[key]] = value
+        return seen[key]
+
+    for pattern in NAME_PATTERNS:
+        for match in pattern.finditer(text):
+            placeholder("NAME", match.group(1))
+    for (kind, value), token in sorted(seen.items(), key=lambda item: -len(item[0][1])):
+        text = text.replace(value, token)
+
+    for kind, pattern in PII_PATTERNS:
+        text = pattern.sub(lambda m, kind=kind: placeholder(kind, m.group(0)), text)
+    return text, mapping
+
+
+def apply_mapping(value: Any, replace: Callable[[str], str]) -> Any:
+    """Apply a string transformation to all strings in a (nested) flow result."""
+    if isinstance(value, str):
+        return replace(value)
+    if isinstance(value, dict):
+        return {k: apply_mapping(v, replace) for k, v in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(apply_mapping(v, replace) for v in value)
+    return value
+
+
+def _mask_answer(text: str, mapping: dict[str, str]) -> str:
+    # The answer often repeats the customer's name or numbers; store them as placeholders too
+    for token, original in sorted(mapping.items(), key=lambda item: -len(item[1])):
+        text = text.replace(original, token)
+    for token, original in mapping.items():
+        if token.startswith("<NAME_"):
+            # Single name parts, e.g. "Dear Ms. Schmidt", become <NAME_1.1>
+            for index, part in enumerate(original.split()):
+                text = re.sub(rf"\b{re.escape(part)}\b", f"{token[:-1]}.{index}>", text)
+    return text
+
+
+def _unmask_answer(text: str, mapping: dict[str, str]) -> str | None:
+    def restore(match: re.Match) -> str:
+        token, part = f"<{match.group(1)}>", match.group(2)
+        original = mapping[token]
+        if part is None:
+            return original
+        return original.split()[int(part)]
+
+    try:
+        return PLACEHOLDER_PATTERN.sub(restore, text)
+    except (KeyError, IndexError):
+        # The cached answer refers to data the new inquiry does not have
+        return None
+
+
+class FlowResponseCache:
+    """
+    Thread-safe LRU/TTL cache of flow results keyed by the PII-masked inquiry.
+    """
+
+    def __init__(self, max_entries: int = 1000, ttl: float = 3600):
+        """
+        Initialize response cache.
+
+        Args:
+            max_entries: Maximum number of cached answers
+            ttl: Seconds after which a cached answer expires
+        """
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self._entries: "OrderedDict[str, tuple[Any, float, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.latency_saved = 0.0
+
+    @staticmethod
+    def key(flow_name: str, masked_message: str) -> str:
+        normalised = " ".join(masked_message.lower().split())
+        return hashlib.sha256(f"{flow_name}\n{normalised}".encode()).hexdigest()
+
+    def get(self, flow_name: str, message: str) -> tuple[Any, dict[str, str], str]:
+        """
+        Look up an inquiry.
+
+        Returns:
+            Tuple of (result with the inquiry's PII re-inserted or None, PII mapping, cache key)
+        """
+        masked, mapping = mask_pii(message)
+        key = self.key(flow_name, masked)
+        now = time.time()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and now - entry[1] > self.ttl:
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None, mapping, key
+            self._entries.move_to_end(key)
+
+        unresolved = []
+
+        def unmask(text: str) -> str:
+            restored = _unmask_answer(text, mapping)
+            if restored is None:
+                unresolved.append(text)
+                return text
+            return restored
+
+        result = apply_mapping(entry[0], unmask)
+        with self._lock:
+            if unresolved:
+                self.misses += 1
+                return None, mapping, key
+            self.hits += 1
+            self.latency_saved += entry[2]
+        return result, mapping, key
+
+    def put(self, key: str, mapping: dict[str, str], result: Any, latency: float):
+        """
+        Store a flow result.
+
+        Args:
+            key: Cache key returned by get()
+            mapping: PII mapping returned by get()
+            result: Flow result passed to the end handler
+            latency: Seconds the flow run took, reported as saved on later hits
+        """
+        masked = apply_mapping(result, lambda text: _mask_answer(text, mapping))
+        with self._lock:
+            self._entries[key] = (masked, time.time(), latency)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def metrics(self) -> dict:
+        """Cache metrics: entries, hits, misses, hit rate and flow time saved."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "entries": len(self._entries),
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+                "latency_saved_seconds": self.latency_saved,
+            }
+
+    def prometheus(self, prefix: str = "support_flow_cache") -> str:
+        """Metrics in the Prometheus text exposition format."""
+        lines = []
+        for name, value in self.metrics().items():
+            lines.append(f"# TYPE {prefix}_{name} {'counter' if name in ('hits', 'misses', 'latency_saved_seconds') else 'gauge'}")
+            lines.append(f"{prefix}_{name} {value}")
+        return "\n".join(lines) + "\n"
+
+
+class CachedFlow:
+    """
+    Compiled flow with a response cache in front.
+
+    On a hit, the end handler is called with the cached result right away;
+    on a miss, the flow runs and its result is stored when it ends.
+    """
+
+    def __init__(self, compiled_flow, flow_name: str, cache: FlowResponseCache):
+        self.compiled_flow = compiled_flow
+        self.flow_name = flow_name
+        self.cache = cache
+
+    async def invoke(self, input_data: dict, on_flow_end_handler=None, on_flow_error_handler=None, **kwargs):
+        message = input_data.get("message", "")
+        result, mapping, key = self.cache.get(self.flow_name, message)
+        if result is not None:
+            if on_flow_end_handler:
+                on_flow_end_handler(result)
+            return None
+
+        started = time.perf_counter()
+
+        def handle_end(*args, **handler_kwargs):
+            if args:
+                self.cache.put(key, mapping, args[0], time.perf_counter() - started)
+            if on_flow_end_handler:
+                on_flow_end_handler(*args, **handler_kwargs)
+
+        return await self.compiled_flow.invoke(
+            input_data,
+            on_flow_end_handler=handle_end,
+            on_flow_error_handler=on_flow_error_handler,
+            **kwargs,
+        )